@@ -9,7 +9,8 @@ from app.core.cache import CACHE_DB_PATH
 import sqlite3
 from app.metrics.aggregates import vendor_performance_summary, vendor_totals
 from app.metrics.kpi_aggregates import compute_kpi_aggregates
-from app.metrics.series import compute_series  # Changed from time_series
+from app.metrics.series import compute_series_batch
+from app.db.sqlite import apply_pragmas
 from app.utils.dates import normalize_to_ist_day_start, normalize_to_ist_day_end, enforce_date_range
 
 log = logging.getLogger("ari.admin.metrics")
@@ -24,6 +25,7 @@ async def runs_summary(days: int = Query(default=7, ge=1, le=90)):
     """
     try:
         conn = sqlite3.connect(CACHE_DB_PATH)
+        apply_pragmas(conn, read=True)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -80,6 +82,7 @@ async def metrics_summary(
     """
     try:
         conn = sqlite3.connect(CACHE_DB_PATH)
+        apply_pragmas(conn, read=True)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -104,8 +107,8 @@ async def metrics_summary(
                 event,
                 provider,
                 COUNT(*) as total_calls,
-                SUM(CASE WHEN ok = 1 THEN 1 ELSE 0 END) as successful_calls,
-                AVG(CASE WHEN ok = 1.0 THEN 1.0 ELSE 0.0 END) * 100 as success_rate,
+                SUM(COALESCE(ok, 0)) as successful_calls,
+                AVG(COALESCE(ok, 0)) * 100.0 as success_rate,
                 AVG(latency_ms) as avg_latency_ms,
                 MIN(latency_ms) as min_latency_ms,
                 MAX(latency_ms) as max_latency_ms
@@ -241,18 +244,13 @@ async def get_time_series(
         
         log.info(f"Fetching time series: {start_iso} to {end_iso}, bucket={bucket}")
         
-        # Use the compute_series function for each metric
-        from app.metrics.series import compute_series
-        
-        send_success = await compute_series("send_success", start_iso, end_iso, bucket)
-        rating = await compute_series("rating", start_iso, end_iso, bucket)
-        cost_per_item = await compute_series("cost_per_item", start_iso, end_iso, bucket)
-        
-        results = {
-            "send_success": send_success,
-            "rating": rating,
-            "cost_per_item": cost_per_item,
-        }
+        # All three metrics concurrently (independent tables)
+        results = await compute_series_batch(
+            ["send_success", "rating", "cost_per_item"], start_iso, end_iso, bucket
+        )
+        send_success = results["send_success"]
+        rating = results["rating"]
+        cost_per_item = results["cost_per_item"]
         
         log.info(f"Time series: {len(send_success)} send_success, {len(rating)} rating, {len(cost_per_item)} cost points")
         
@@ -292,6 +290,7 @@ async def ticker_age(
 
         import sqlite3
         conn = sqlite3.connect(CACHE_DB_PATH, timeout=5)
+        apply_pragmas(conn, read=True)
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
 
@@ -507,6 +506,8 @@ async def sendgrid_metrics(
         log.info(f"Fetching SendGrid metrics from {start_iso} to {end_iso}")
         
         conn = sqlite3.connect(CACHE_DB_PATH)
+        
+        apply_pragmas(conn, read=True)
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
 
@@ -306,7 +306,7 @@ async def cache_get_by_ticker(ticker: str, *, max_age_hours: int = 24) -> Dict[s
     return out
 
 
-async def cache_upsert_summaries(rows: list[dict]) -> int:
+async def cache_upsert_summaries(rows: list[dict], db_path: Optional[str] = None) -> int:
     """
     Upsert summary rows into the summaries table.
     Expects each row to contain keys:
@@ -316,7 +316,7 @@ async def cache_upsert_summaries(rows: list[dict]) -> int:
     if not rows:
         return 0
 
-    db_path = getattr(settings, "CACHE_DB_PATH", "./ari.db")
+    db_path = db_path or getattr(settings, "CACHE_DB_PATH", "./ari.db")
     insert_sql = """
     INSERT INTO summaries
       (item_url_hash, ticker, title, why_it_matters, sentiment, relevance, created_at, url)
@@ -0,0 +1,73 @@
+"""
+Shared keep-alive httpx.AsyncClient for vendor calls (ScrapingDog, Diffbot, ...).
+
+Building a client per request forces a fresh TCP+TLS handshake every time; one
+pooled client amortizes that across tickers. Per-request timeouts are passed to
+`client.get(..., timeout=...)`.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Optional
+
+import httpx
+
+from app.core import settings
+
+# optional C-accelerated JSON decode; stdlib fallback keeps orjson optional
+try:
+    import orjson as _json  # type: ignore
+except Exception:  # pragma: no cover - depends on environment
+    import json as _json
+
+log = logging.getLogger("ari.http")
+
+_CLIENT: Optional[httpx.AsyncClient] = None
+_CLIENT_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_CLIENT_LOCK: Optional[asyncio.Lock] = None
+
+
+async def get_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide AsyncClient, building it lazily.
+    Rebuilt if closed or if called from a different event loop (e.g. asyncio.run in scripts).
+    """
+    global _CLIENT, _CLIENT_LOOP, _CLIENT_LOCK
+    loop = asyncio.get_running_loop()
+    if _CLIENT is not None and not _CLIENT.is_closed and _CLIENT_LOOP is loop:
+        return _CLIENT
+
+    if _CLIENT_LOCK is None or _CLIENT_LOOP is not loop:
+        _CLIENT_LOCK = asyncio.Lock()
+    async with _CLIENT_LOCK:
+        if _CLIENT is None or _CLIENT.is_closed or _CLIENT_LOOP is not loop:
+            _CLIENT = httpx.AsyncClient(
+                timeout=float(getattr(settings, "NEWS_TIMEOUT_S", 8) or 8),
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            )
+            _CLIENT_LOOP = loop
+            log.debug("http: built shared AsyncClient")
+    return _CLIENT
+
+
+async def aclose_client() -> None:
+    """Close the shared client (FastAPI shutdown hook)."""
+    global _CLIENT, _CLIENT_LOOP
+    client, _CLIENT, _CLIENT_LOOP = _CLIENT, None, None
+    if client is not None and not client.is_closed:
+        try:
+            await client.aclose()
+        except Exception:
+            log.exception("http: failed to close shared AsyncClient")
+
+
+def loads_json(content: bytes):
+    """Decode a response body (`r.content`) with orjson when available."""
+    return _json.loads(content)
+
+
+def dumps_json(obj) -> bytes:
+    """Encode a request body (pass as `content=`) with orjson when available."""
+    out = _json.dumps(obj)
+    return out if isinstance(out, bytes) else out.encode("utf-8")
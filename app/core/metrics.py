@@ -1,10 +1,12 @@
 import os
+import asyncio
 import sqlite3
 import json
+from collections import deque
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 log = logging.getLogger("ari.metrics")
 
@@ -13,6 +15,68 @@ log = logging.getLogger("ari.metrics")
 _FALLBACK_CACHE_DB = str(Path(__file__).resolve().parent.parent / "cache.db")
 _METRICS_JSON_SUFFIX = ".metrics.json"
 
+# Write-time rollup of `metrics` per (provider, event); vendor aggregates read this
+# instead of re-scanning the raw table. Created and seeded from existing rows by the
+# writer only, in the same BEGIN IMMEDIATE transaction as its first insert, so no row
+# can land between the backfill and the first upsert.
+# A NULL provider is keyed as '': NULLs never conflict in the primary key, so the
+# upsert could not accumulate them. Readers map '' back to NULL (NULLIF).
+METRICS_AGG_DDL = """
+    CREATE TABLE IF NOT EXISTS metrics_agg (
+        provider TEXT NOT NULL,
+        event TEXT NOT NULL,
+        total_calls INTEGER NOT NULL DEFAULT 0,
+        successes INTEGER NOT NULL DEFAULT 0,
+        sum_latency_ms INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (provider, event)
+    )
+"""
+METRICS_AGG_BACKFILL = """
+    INSERT OR IGNORE INTO metrics_agg(provider, event, total_calls, successes, sum_latency_ms)
+    SELECT COALESCE(provider, ''), event, COUNT(*), COALESCE(SUM(ok), 0), COALESCE(SUM(latency_ms), 0)
+    FROM metrics
+    GROUP BY COALESCE(provider, ''), event
+"""
+METRICS_AGG_UPSERT = """
+    INSERT INTO metrics_agg(provider, event, total_calls, successes, sum_latency_ms)
+    VALUES (?, ?, 1, ?, ?)
+    ON CONFLICT(provider, event) DO UPDATE SET
+        total_calls = total_calls + 1,
+        successes = successes + excluded.successes,
+        sum_latency_ms = sum_latency_ms + excluded.sum_latency_ms
+"""
+
+# db paths whose metrics_agg table is known to exist (skip the sqlite_master probe)
+_AGG_READY: set = set()
+
+# vendor_metrics.created_day = DATE(created_at), filled at write time so the bucketed
+# dashboard series group on a stored, indexed day instead of parsing created_at per row.
+# The trigger covers rows inserted by anything other than record_vendor_event.
+VENDOR_METRICS_DDL = """
+    CREATE TABLE IF NOT EXISTS vendor_metrics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        provider TEXT NOT NULL,
+        event TEXT NOT NULL,
+        ok INTEGER NOT NULL,
+        latency_ms INTEGER,
+        created_at TEXT NOT NULL,
+        created_day TEXT
+    )
+"""
+VENDOR_METRICS_DAY_SETUP = (
+    "UPDATE vendor_metrics SET created_day = DATE(created_at) WHERE created_day IS NULL",
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_vendor_metrics_created_day
+    AFTER INSERT ON vendor_metrics WHEN NEW.created_day IS NULL
+    BEGIN
+        UPDATE vendor_metrics SET created_day = DATE(NEW.created_at) WHERE id = NEW.id;
+    END
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_vm_created_day ON vendor_metrics(created_day, provider)",
+)
+# db paths whose vendor_metrics table is known to have created_day + trigger + index
+_VM_DAY_READY: set = set()
+
 
 def _utc_now_iso() -> str:
     return datetime.now(tz=timezone.utc).replace(microsecond=0).isoformat()
@@ -26,62 +90,187 @@ def _resolve_cache_db_path() -> str:
         return _FALLBACK_CACHE_DB
 
 
-def record_metric(event: str, provider: str, latency_ms: int, ok: bool) -> None:
+def _ensure_metrics_agg(cur, cache_db: str) -> None:
     """
-    Append one metric row (timestamp UTC). Uses sqlite metrics table if the CACHE_DB_PATH file exists,
-    otherwise falls back to appending into a JSON file alongside the cache DB.
+    Create + backfill metrics_agg the first time it is missing. Must run inside the
+    caller's write transaction (BEGIN IMMEDIATE) so the probe, create and backfill are atomic.
     """
-    ts = _utc_now_iso()
-    ok_int = 1 if ok else 0
-    cache_db = _resolve_cache_db_path()
-    metrics_json = cache_db + _METRICS_JSON_SUFFIX
+    if cache_db in _AGG_READY:
+        return
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='metrics_agg'")
+    if cur.fetchone() is None:
+        cur.execute(METRICS_AGG_DDL)
+        cur.execute(METRICS_AGG_BACKFILL)
+        log.info("metrics: created metrics_agg rollup (backfilled from metrics)")
+    _AGG_READY.add(cache_db)
+
+
+def ensure_vendor_metrics_day(cur, cache_db: str) -> None:
+    """Create vendor_metrics with created_day, or add + backfill the column on older tables."""
+    if cache_db in _VM_DAY_READY:
+        return
+    cur.execute(VENDOR_METRICS_DDL)
+    cols = {row[1] for row in cur.execute("PRAGMA table_info(vendor_metrics)")}
+    if "created_day" not in cols:
+        cur.execute("ALTER TABLE vendor_metrics ADD COLUMN created_day TEXT")
+        log.info("metrics: added vendor_metrics.created_day (backfilling)")
+    for stmt in VENDOR_METRICS_DAY_SETUP:
+        cur.execute(stmt)
+    _VM_DAY_READY.add(cache_db)
+
+
+_METRICS_DDL = """
+    CREATE TABLE IF NOT EXISTS metrics (
+        timestamp TEXT NOT NULL,
+        event TEXT NOT NULL,
+        provider TEXT,
+        latency_ms INTEGER,
+        ok INTEGER
+    )
+"""
+
+# Pending metric rows (timestamp, event, provider, latency_ms, ok). While the
+# background flusher runs, record_metric only appends here; the flusher writes
+# them in one transaction per interval instead of one connect+commit per call.
+# Bounded so a stuck writer cannot grow memory without limit; rows evicted by the
+# bound are counted in _DROPPED and reported (then reset) by the next flush.
+_BUFFER: deque = deque(maxlen=10000)
+_DROPPED = 0
+_FLUSHER: Optional[asyncio.Task] = None
+# rows per transaction when flushing the buffer
+_FLUSH_BATCH = 256
+
+# WAL + synchronous=NORMAL: commits append to the WAL without an fsync each time
+_WRITER_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+)
+
 
+def _write_sqlite(cache_db: str, rows: List[tuple]) -> None:
+    conn = sqlite3.connect(cache_db, timeout=5)
     try:
-        if os.path.exists(cache_db):
-            conn = sqlite3.connect(cache_db, timeout=5)
+        cur = conn.cursor()
+        for pragma in _WRITER_PRAGMAS:
+            cur.execute(pragma)
+        # take the write lock up front: the rollup create/backfill and this batch commit together
+        cur.execute("BEGIN IMMEDIATE")
+        cur.execute(_METRICS_DDL)
+        _ensure_metrics_agg(cur, cache_db)
+        cur.executemany(
+            "INSERT INTO metrics(timestamp, event, provider, latency_ms, ok) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        cur.executemany(METRICS_AGG_UPSERT, [(p or "", e, ok, lat) for _, e, p, lat, ok in rows])
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _write_json(metrics_json: str, rows: List[tuple]) -> None:
+    data = []
+    if os.path.exists(metrics_json):
+        with open(metrics_json, "r", encoding="utf-8") as fh:
             try:
-                cur = conn.cursor()
-                cur.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS metrics (
-                        timestamp TEXT NOT NULL,
-                        event TEXT NOT NULL,
-                        provider TEXT,
-                        latency_ms INTEGER,
-                        ok INTEGER
-                    )
-                    """
-                )
-                cur.execute(
-                    "INSERT INTO metrics(timestamp, event, provider, latency_ms, ok) VALUES (?, ?, ?, ?, ?)",
-                    (ts, event, provider, int(latency_ms or 0), ok_int),
-                )
-                conn.commit()
-                log.info("metrics: recorded sqlite event=%s provider=%s ok=%s latency_ms=%s", event, provider, ok, latency_ms)
-            finally:
-                conn.close()
+                data = json.load(fh) or []
+            except Exception:
+                data = []
+    for ts, event, provider, latency_ms, ok_int in rows:
+        data.append({"timestamp": ts, "event": event, "provider": provider, "latency_ms": latency_ms, "ok": ok_int})
+    with open(metrics_json, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, ensure_ascii=False)
+
+
+def _persist(rows: List[tuple]) -> None:
+    """
+    Write metric rows to the sqlite metrics table if the CACHE_DB_PATH file exists,
+    otherwise (or on sqlite failure) append them to the JSON file alongside the cache DB.
+    """
+    cache_db = _resolve_cache_db_path()
+    try:
+        if os.path.exists(cache_db):
+            _write_sqlite(cache_db, rows)
+            if log.isEnabledFor(logging.INFO):
+                log.info("metrics: recorded sqlite rows=%d last=%s", len(rows), rows[-1][1:])
             return
     except Exception:
         log.exception("metrics: sqlite record failed, falling back to json")
 
-    # JSON fallback
     try:
-        data = []
-        if os.path.exists(metrics_json):
-            with open(metrics_json, "r", encoding="utf-8") as fh:
-                try:
-                    data = json.load(fh) or []
-                except Exception:
-                    data = []
-        entry = {"timestamp": ts, "event": event, "provider": provider, "latency_ms": int(latency_ms or 0), "ok": ok_int}
-        data.append(entry)
-        with open(metrics_json, "w", encoding="utf-8") as fh:
-            json.dump(data, fh, ensure_ascii=False)
-        log.info("metrics: recorded json event=%s provider=%s ok=%s latency_ms=%s", event, provider, ok, latency_ms)
+        _write_json(cache_db + _METRICS_JSON_SUFFIX, rows)
+        if log.isEnabledFor(logging.INFO):
+            log.info("metrics: recorded json rows=%d last=%s", len(rows), rows[-1][1:])
     except Exception:
         log.exception("metrics: json record failed")
 
 
+def record_metric(event: str, provider: str, latency_ms: int, ok: bool) -> None:
+    """
+    Append one metric row (timestamp UTC). Buffered when the background flusher is
+    running (see start_metrics_flusher), otherwise written immediately.
+    """
+    global _DROPPED
+    row = (_utc_now_iso(), event, provider, int(latency_ms or 0), 1 if ok else 0)
+    if _FLUSHER is not None and not _FLUSHER.done():
+        if len(_BUFFER) == _BUFFER.maxlen:
+            _DROPPED += 1  # append below evicts the oldest pending row
+        _BUFFER.append(row)
+        return
+    _persist([row])
+
+
+def _drain(limit: int) -> List[tuple]:
+    rows = []
+    while _BUFFER and len(rows) < limit:
+        rows.append(_BUFFER.popleft())
+    return rows
+
+
+async def flush_metrics() -> int:
+    """Write all buffered metric rows, _FLUSH_BATCH per transaction (off the event loop). Returns rows written."""
+    global _DROPPED
+    if _DROPPED:
+        dropped, _DROPPED = _DROPPED, 0
+        log.warning("metrics: buffer full (maxlen=%d), dropped %d oldest rows", _BUFFER.maxlen, dropped)
+    total = 0
+    while True:
+        rows = _drain(_FLUSH_BATCH)
+        if not rows:
+            return total
+        await asyncio.to_thread(_persist, rows)
+        total += len(rows)
+
+
+async def _flush_loop(interval_s: float) -> None:
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            await flush_metrics()
+        except Exception:
+            log.exception("metrics: background flush failed")
+
+
+def start_metrics_flusher(interval_s: float = 1.0) -> None:
+    """Start buffering record_metric calls and flushing them every `interval_s` seconds. Idempotent."""
+    global _FLUSHER
+    if _FLUSHER is not None and not _FLUSHER.done():
+        return
+    _FLUSHER = asyncio.create_task(_flush_loop(interval_s))
+    log.info("metrics: started background flusher interval=%.1fs", interval_s)
+
+
+async def stop_metrics_flusher() -> None:
+    """Stop the flusher and write whatever is still buffered."""
+    global _FLUSHER
+    task, _FLUSHER = _FLUSHER, None
+    if task is not None:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    n = await flush_metrics()
+    log.info("metrics: stopped background flusher (final flush rows=%d)", n)
+
+
 def record_vendor_event(provider: str, event: str, ok: bool, latency_ms: int) -> None:
     """
     Record a vendor API call to the vendor_metrics table.
@@ -103,24 +292,13 @@ def record_vendor_event(provider: str, event: str, ok: bool, latency_ms: int) ->
             conn = sqlite3.connect(cache_db, timeout=5)
             try:
                 cur = conn.cursor()
-                # Create table if not exists
-                cur.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS vendor_metrics (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        provider TEXT NOT NULL,
-                        event TEXT NOT NULL,
-                        ok INTEGER NOT NULL,
-                        latency_ms INTEGER,
-                        created_at TEXT NOT NULL
-                    )
-                    """
-                )
+                # Create table (or add created_day) once per process
+                ensure_vendor_metrics_day(cur, cache_db)
                 # Insert the record
                 cur.execute(
                     """
-                    INSERT INTO vendor_metrics (provider, event, ok, latency_ms, created_at)
-                    VALUES (?, ?, ?, ?, ?)
+                    INSERT INTO vendor_metrics (provider, event, ok, latency_ms, created_at, created_day)
+                    VALUES (?, ?, ?, ?, ?5, DATE(?5))
                     """,
                     (provider, event, ok_int, int(latency_ms or 0), ts),
                 )
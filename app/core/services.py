@@ -8,10 +8,10 @@ from app.core.cache import cache_upsert_items
 async def fetch_news(ticker: str, *, use_mock: bool = False) -> List[Dict]:
     """
     Fetch latest news items for a ticker.
-    Currently delegates to app.ingest.news.fetch_news_for_ticker (sync) and wraps as async.
+    Delegates to the async app.ingest.news.fetch_news_for_ticker.
     """
     from app.ingest.news import fetch_news_for_ticker
-    items = fetch_news_for_ticker(ticker) or []
+    items = await fetch_news_for_ticker(ticker) or []
     return items
 
 async def get_filings_for(ticker: str) -> list[dict]:
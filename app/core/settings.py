@@ -130,6 +130,18 @@ NEWS_DAYS        = _i(os.getenv("NEWS_DAYS", "7"), 7)                     # look
 NEWS_TOPK        = _i(os.getenv("NEWS_TOPK", "10"), 10)                   # keep top-K per ticker (default 10)
 NEWS_TIMEOUT_S   = _i(os.getenv("NEWS_TIMEOUT_S", "8"), 8)                # per-source http timeout (seconds)
 DEBUG_NEWS_LOG   = _b(os.getenv("DEBUG_NEWS_LOG", "1"), True)             # verbose adapter/filter logs
+# Fetch the NewsAPI top-up alongside ScrapingDog instead of only when ScrapingDog falls
+# short of max_items: lower latency, but a paid, rate-limited NewsAPI call per ticker.
+NEWS_NEWSAPI_SPECULATIVE = _b(os.getenv("NEWS_NEWSAPI_SPECULATIVE", "0"), False)
+
+# Tiered background refresh: per-adapter cadence (seconds). When enabled, fusion
+# serves from the in-process per-adapter cache populated by app.ingest.scheduler.
+NEWS_TIER_REFRESH = _b(os.getenv("NEWS_TIER_REFRESH", "0"), False)
+NEWS_TIER_INTERVALS = {
+    "google_rss": _i(os.getenv("NEWS_TIER_GOOGLE_RSS_S", "60"), 60),
+    "newsapi": _i(os.getenv("NEWS_TIER_NEWSAPI_S", "300"), 300),
+    "scrapingdog": _i(os.getenv("NEWS_TIER_SCRAPINGDOG_S", "900"), 900),
+}
 
 # Which sources to query: use validated settings.NEWS_SOURCES (module-level env-derived CSV removed)
 # (module-level NEWS_SOURCES removed to avoid double-parsing by pydantic-settings)
@@ -0,0 +1,42 @@
+"""
+Migration: composite indexes for the KPI aggregates (/admin/metrics/kpi).
+
+The KPI sections filter/group on (provider, event, created_at, ok), (event_type,
+created_at), (created_at, ticker), (sent_at, domain) and probe articles by url for
+news_age; these composite indexes turn those scans into index range scans. ANALYZE
+refreshes planner statistics so the new composites are preferred over older
+single-column indexes.
+"""
+from __future__ import annotations
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+log = logging.getLogger("ari.migrations")
+
+KPI_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_vm_pe_ct_ok ON vendor_metrics(provider, event, created_at, ok)",
+    "CREATE INDEX IF NOT EXISTS idx_ee_evt_created ON email_events(event_type, created_at, rating)",
+    "CREATE INDEX IF NOT EXISTS idx_summaries_created_ticker ON summaries(created_at, ticker)",
+    "CREATE INDEX IF NOT EXISTS idx_email_items_sent_domain ON email_items(sent_at, domain)",
+    # freshness_sent joins summaries -> articles on url and reads only news_age
+    "CREATE INDEX IF NOT EXISTS idx_articles_url_newsage ON articles(url, news_age)",
+]
+
+KPI_TABLES = ["vendor_metrics", "email_events", "summaries", "email_items", "articles"]
+
+
+async def migrate_add_kpi_indexes(engine: AsyncEngine) -> None:
+    """
+    Idempotent migration; each statement runs in its own transaction so a missing
+    table only skips its own index.
+    """
+    for stmt in KPI_INDEXES + [f"ANALYZE {t}" for t in KPI_TABLES]:
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text(stmt))
+        except Exception as e:
+            log.warning("migrate_add_kpi_indexes: skipped %r (%s)", stmt, e)
+
+    log.info("migrate_add_kpi_indexes: KPI indexes ensured and statistics refreshed")
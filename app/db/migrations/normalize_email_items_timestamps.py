@@ -0,0 +1,34 @@
+"""
+Migration: rewrite email_items.published_at to canonical UTC ISO text.
+
+Vendor hints arrive in several formats ('YYYY-MM-DD HH:MM:SS', offsets, fractional
+seconds). The KPI average-age query casts the column in SQL; normalizing once at
+startup keeps every row castable and lexically ordered, so no Python re-parsing
+fallback is needed on the read path.
+"""
+from __future__ import annotations
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+log = logging.getLogger("ari.migrations")
+
+NORMALIZE_PUBLISHED_AT = r"""
+    UPDATE email_items
+    SET published_at = to_char(published_at::timestamptz AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS"Z"')
+    WHERE published_at IS NOT NULL
+      AND published_at <> ''
+      AND published_at !~ '^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$'
+"""
+
+
+async def migrate_normalize_email_items_timestamps(engine: AsyncEngine) -> None:
+    """Idempotent: only rows not already in 'YYYY-MM-DDTHH:MM:SSZ' form are touched."""
+    try:
+        async with engine.begin() as conn:
+            result = await conn.execute(text(NORMALIZE_PUBLISHED_AT))
+        if result.rowcount:
+            log.info("migrate_normalize_email_items_timestamps: normalized %d published_at values", result.rowcount)
+    except Exception as e:
+        log.warning("migrate_normalize_email_items_timestamps: skipped (%s)", e)
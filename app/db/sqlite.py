@@ -0,0 +1,183 @@
+"""
+Long-lived aiosqlite connections, one per database path.
+
+`async with aiosqlite.connect(...)` per call spawns a worker thread and re-reads the
+SQLite header every time. Hot paths call get_shared_db(path) instead; the connection
+is opened once with WAL + tuned pragmas and closed by close_shared_dbs() on shutdown.
+
+Note: the connection is shared, so callers must not close it. aiosqlite serializes
+statements on one thread but not transactions: with the per-ticker fan-outs running
+concurrently, two callers' writes would land in the same implicit transaction and one
+caller's commit (or a failure mid-batch) would leak into the other's. Writes therefore
+go through shared_write(path), which holds a per-connection lock from the first
+statement to the commit or rollback. The connection belongs to the event loop that
+opened it; a different loop (asyncio.run in scripts/tests) gets a fresh one.
+
+Read-heavy aggregates use get_read_pool(path) instead: a few long-lived connections
+handed out under a semaphore, so concurrent readers (WAL) do not share one thread.
+
+Blocking sqlite3 call sites apply the same pragmas with apply_pragmas(conn).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+import aiosqlite
+
+log = logging.getLogger("ari.db")
+
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+)
+
+# read pools add a large page cache + mmap on top of the base pragmas
+_READ_PRAGMAS = _PRAGMAS + (
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+_CONNS: Dict[str, aiosqlite.Connection] = {}
+_CONNS_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOCK: Optional[asyncio.Lock] = None
+_WRITE_LOCKS: Dict[str, asyncio.Lock] = {}
+_POOLS: Dict[str, "ReadPool"] = {}
+
+
+def apply_pragmas(conn: sqlite3.Connection, read: bool = False) -> None:
+    """Apply the base (or read-pool) pragmas to a plain sqlite3 connection; best-effort."""
+    for pragma in _READ_PRAGMAS if read else _PRAGMAS:
+        try:
+            conn.execute(pragma)
+        except sqlite3.Error:
+            log.debug("sqlite: %s failed", pragma, exc_info=False)
+
+
+async def _open(db_path: str, pragmas) -> aiosqlite.Connection:
+    pending = aiosqlite.connect(db_path)
+    # never block interpreter exit if shutdown hook did not run (scripts/tests)
+    pending.daemon = True
+    conn = await pending
+    for pragma in pragmas:
+        try:
+            await conn.execute(pragma)
+        except Exception:
+            log.debug("sqlite: %s failed for %s", pragma, db_path, exc_info=False)
+    return conn
+
+
+async def get_shared_db(db_path: str) -> aiosqlite.Connection:
+    """
+    Return the shared connection for `db_path`, opening it lazily.
+    Reopened if called from a different event loop than the one that opened it.
+    """
+    global _LOCK, _CONNS_LOOP
+    loop = asyncio.get_running_loop()
+    if _CONNS_LOOP is not loop:
+        # connections, lock and write locks from a finished loop are not reusable here
+        stale = list(_CONNS.items())
+        _CONNS.clear()
+        _WRITE_LOCKS.clear()
+        _LOCK = asyncio.Lock()
+        _CONNS_LOOP = loop
+        for path, old in stale:
+            try:
+                await old.close()
+            except Exception:
+                log.debug("sqlite: failed to close stale connection db=%s", path, exc_info=False)
+
+    conn = _CONNS.get(db_path)
+    if conn is not None:
+        return conn
+
+    async with _LOCK:
+        conn = _CONNS.get(db_path)
+        if conn is None:
+            conn = await _open(db_path, _PRAGMAS)
+            _CONNS[db_path] = conn
+            log.info("sqlite: opened shared connection db=%s", db_path)
+    return conn
+
+
+@asynccontextmanager
+async def shared_write(db_path: str) -> AsyncIterator[aiosqlite.Connection]:
+    """
+    Yield the shared connection for one write transaction: commits on success, rolls
+    back on error, and keeps other writers out until then.
+    """
+    conn = await get_shared_db(db_path)
+    lock = _WRITE_LOCKS.setdefault(db_path, asyncio.Lock())
+    async with lock:
+        try:
+            yield conn
+        except BaseException:
+            await conn.rollback()
+            raise
+        await conn.commit()
+
+
+class ReadPool:
+    """
+    Up to `size` long-lived read connections for one database. Connections are
+    opened on first demand and reused; acquire() waits when all are in use.
+    """
+
+    def __init__(self, db_path: str, size: int) -> None:
+        self.db_path = db_path
+        self.size = size
+        self.loop = asyncio.get_running_loop()
+        self._sem = asyncio.Semaphore(size)
+        self._idle: List[aiosqlite.Connection] = []
+        self._all: List[aiosqlite.Connection] = []
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosqlite.Connection]:
+        async with self._sem:
+            if self._idle:
+                conn = self._idle.pop()
+            else:
+                conn = await _open(self.db_path, _READ_PRAGMAS)
+                self._all.append(conn)
+            try:
+                yield conn
+            finally:
+                self._idle.append(conn)
+
+    async def close(self) -> None:
+        conns, self._all, self._idle = self._all, [], []
+        for conn in conns:
+            try:
+                await conn.close()
+            except Exception:
+                log.exception("sqlite: failed to close pooled connection db=%s", self.db_path)
+
+
+def get_read_pool(db_path: str, size: int = 4) -> ReadPool:
+    """Return the read pool for `db_path`, creating it for the running event loop."""
+    pool = _POOLS.get(db_path)
+    if pool is None or pool.loop is not asyncio.get_running_loop():
+        pool = _POOLS[db_path] = ReadPool(db_path, size)
+        log.info("sqlite: created read pool db=%s size=%d", db_path, size)
+    return pool
+
+
+async def close_shared_dbs() -> None:
+    """Close every shared connection and read pool (FastAPI shutdown hook)."""
+    pools = list(_POOLS.values())
+    _POOLS.clear()
+    for pool in pools:
+        await pool.close()
+    conns = list(_CONNS.items())
+    _CONNS.clear()
+    _WRITE_LOCKS.clear()
+    for db_path, conn in conns:
+        try:
+            await conn.close()
+        except Exception:
+            log.exception("sqlite: failed to close shared connection db=%s", db_path)
@@ -1,4 +1,5 @@
 from __future__ import annotations
+from functools import lru_cache
 from typing import TypedDict, List, Optional, Dict, Protocol
 from urllib.parse import urlparse
 
@@ -55,9 +56,11 @@ def normalize_item(raw: Dict) -> NewsItem:
     return item
 
 
+@lru_cache(maxsize=4096)
 def domain_from_url(url: str) -> str:
     """
     Return the hostname portion of a URL lowercased (no port).
+    Memoized: the same article URLs are resolved by fusion, news row building and scoring.
     """
     try:
         p = urlparse((url or "").strip())
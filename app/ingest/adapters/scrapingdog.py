@@ -0,0 +1,42 @@
+from __future__ import annotations
+import logging
+from typing import List
+
+from app.ingest.adapters.base import NewsItem, normalize_item
+from app.ingest.google_rss_scrapingdog import search_google_news_scrapingdog
+
+log = logging.getLogger("ari.ingest.scrapingdog")
+
+
+async def fetch(ticker: str, *, days: int, topk: int, timeout_s: int) -> List[NewsItem]:
+    """
+    Adapter shim for the catalog-driven ScrapingDog search: queries the company name
+    plus aliases (instead of the raw symbol google_rss uses) and returns List[NewsItem].
+    """
+    # local import: fusion imports the adapters, and owns the catalog lookup
+    from app.ingest.fusion import build_search_terms_for_ticker
+
+    company, aliases = build_search_terms_for_ticker(ticker)
+    log.info("scrapingdog.fetch: start ticker=%s company='%s' top_k=%d", ticker, company, topk)
+
+    try:
+        raw = await search_google_news_scrapingdog(
+            company, aliases=aliases, topk=topk, country="in", timeout_s=timeout_s
+        )
+    except Exception:
+        log.exception("scrapingdog.fetch: error fetching for %s", ticker)
+        return []
+
+    items: List[NewsItem] = []
+    for r in (raw or [])[:topk]:
+        items.append(normalize_item({
+            "title": r.get("title", "") or "",
+            "url": r.get("url", "") or "",
+            "source": (r.get("source") or "").strip(),
+            "published_at": r.get("published_hint") or "",
+            "lang": "en",
+            "content": r.get("snippet") or "",
+        }))
+
+    log.info("scrapingdog.fetch: kept=%d for %s", len(items), ticker)
+    return items
@@ -1,11 +1,11 @@
 from __future__ import annotations
 import logging
 from typing import Optional, Dict
-import httpx
 import time
 from app.observability.metrics import record_metric
 
 from app.core import settings
+from app.core.http import get_client, loads_json
 
 log = logging.getLogger("ari.news")
 
@@ -54,12 +54,12 @@ async def _call_diffbot_api(url: str, timeout_s: Optional[int] = None) -> Option
     params = {"token": token, "url": url}
 
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            r = await client.get(endpoint, params=params)
-            if r.status_code != 200:
-                log.info("diffbot: non-200 for %s status=%d", url, r.status_code)
-                return None
-            data = r.json()
+        client = await get_client()
+        r = await client.get(endpoint, params=params, timeout=timeout)
+        if r.status_code != 200:
+            log.info("diffbot: non-200 for %s status=%d", url, r.status_code)
+            return None
+        data = loads_json(r.content)
     except Exception as e:
         log.info("diffbot: request failed for %s: %s", url, e)
         return None
@@ -2,10 +2,12 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import re
 import httpx
 import time
 from typing import Optional, Tuple, List, Dict, Any
 from app.observability.metrics import record_metric
+from app.core.http import get_client, loads_json
 from app.core.metrics import record_vendor_event
 from app.core.retry_utils import rate_limited_retry  # ADD THIS
 
@@ -15,6 +17,13 @@ from app.core import settings
 
 log = logging.getLogger("ari.extract")
 
+# default per-request timeout (settings snapshot, read once)
+_NEWS_TIMEOUT_S = int(getattr(settings, "NEWS_TIMEOUT_S", 8) or 8)
+
+# fallback extractor patterns, compiled once
+_TAG_RE = re.compile(r"<[^>]+>")
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", flags=re.I | re.S)
+
 # Transient error used to indicate retryable HTTP statuses (e.g. 429, 5xx)
 class _TransientError(Exception):
     def __init__(self, status: int):
@@ -88,35 +97,35 @@ async def extract_with_diffbot(url: str, timeout_s: Optional[int] = None) -> Tup
         log.info("diffbot.extract: no token, skipping for %s", url)
         return False, "", ""
 
-    timeout = float(timeout_s) if timeout_s is not None else float(getattr(settings, "NEWS_TIMEOUT_S", 8) or 8)
+    timeout = float(timeout_s) if timeout_s is not None else float(_NEWS_TIMEOUT_S)
     endpoint = "https://api.diffbot.com/v3/analyze"
     params = {"token": token, "url": url}
 
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        r = await client.get(endpoint, params=params)
-        status = r.status_code
-        
-        if status == 200:
-            data = r.json()
-            objs = data.get("objects") or []
-            if not objs:
-                log.info("diffbot.extract: no objects for %s", url)
-                return False, "", ""
-            obj = objs[0] or {}
-            text = obj.get("text") or ""
-            if not text:
-                log.info("diffbot.extract: empty text for %s", url)
-                return False, "", ""
-            title = obj.get("title") or obj.get("pageTitle") or ""
-            return True, text, title or ""
-        
-        # Let retry decorator handle 429 and 5xx
-        if status == 429 or 500 <= status < 600:
-            r.raise_for_status()  # Will be caught and retried
-        
-        # Non-retryable failure
-        log.info("diffbot.extract: non-200 %d for %s", status, url)
-        return False, "", ""
+    client = await get_client()
+    r = await client.get(endpoint, params=params, timeout=timeout)
+    status = r.status_code
+    
+    if status == 200:
+        data = loads_json(r.content)
+        objs = data.get("objects") or []
+        if not objs:
+            log.info("diffbot.extract: no objects for %s", url)
+            return False, "", ""
+        obj = objs[0] or {}
+        text = obj.get("text") or ""
+        if not text:
+            log.info("diffbot.extract: empty text for %s", url)
+            return False, "", ""
+        title = obj.get("title") or obj.get("pageTitle") or ""
+        return True, text, title or ""
+    
+    # Let retry decorator handle 429 and 5xx
+    if status == 429 or 500 <= status < 600:
+        r.raise_for_status()  # Will be caught and retried
+    
+    # Non-retryable failure
+    log.info("diffbot.extract: non-200 %d for %s", status, url)
+    return False, "", ""
 
 
 async def extract_with_fallback(url: str, timeout_s: Optional[int] = None) -> Tuple[bool, str, str]:
@@ -126,7 +135,7 @@ async def extract_with_fallback(url: str, timeout_s: Optional[int] = None) -> Tu
     if not url:
         return False, "", ""
 
-    timeout = float(timeout_s) if timeout_s is not None else float(getattr(settings, "NEWS_TIMEOUT_S", 8) or 8)
+    timeout = float(timeout_s) if timeout_s is not None else float(_NEWS_TIMEOUT_S)
     headers = {"User-Agent": "ARI-NewsFetcher/1.0"}
     try:
         async with httpx.AsyncClient(timeout=timeout, follow_redirects=True, headers=headers) as client:
@@ -170,8 +179,7 @@ async def extract_with_fallback(url: str, timeout_s: Optional[int] = None) -> Tu
 
     if not text:
         # crude fallback: strip tags
-        import re
-        text = re.sub(r"<[^>]+>", " ", html)
+        text = _TAG_RE.sub(" ", html)
         text = " ".join(text.split())
 
     if not text:
@@ -181,8 +189,7 @@ async def extract_with_fallback(url: str, timeout_s: Optional[int] = None) -> Tu
     title = ""
     try:
         # attempt a simple <title> parse
-        import re
-        m = re.search(r"<title[^>]*>(.*?)</title>", html, flags=re.I | re.S)
+        m = _TITLE_RE.search(html)
         if m:
             title = m.group(1).strip()
     except Exception:
@@ -245,7 +252,7 @@ async def extract_bodies(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     - No DB writes here; return rows with 'content' set (or None on failure) and optional extract metadata.
     """
     out: List[Dict[str, Any]] = []
-    timeout_s = getattr(settings, "NEWS_TIMEOUT_S", 8)
+    timeout_s = _NEWS_TIMEOUT_S
 
     for r in (rows or []):
         url = (r.get("url") or "").strip()
@@ -81,7 +81,7 @@ def dedupe_by_url_or_title(items: List[Dict]) -> List[Dict]:
 
 async def fetch_bse_announcements(ticker: str) -> List[Dict]:
     info = resolve(ticker)
-    bse_code = info.get("bse_code", "")
+    bse_code = info.bse_code
     if not bse_code:
         print("BSE: missing bse_code for", ticker)
         return []
@@ -140,8 +140,8 @@ async def fetch_bse_announcements(ticker: str) -> List[Dict]:
 
 async def fetch_nse_announcements(ticker: str) -> List[Dict]:
     meta = resolve(ticker)
-    wanted = meta.get("nse_symbol", "").upper()
-    aliases = [meta.get("company_name", "")] + meta.get("aliases", [])
+    wanted = meta.nse_symbol.upper()
+    aliases = [meta.company_name, *meta.aliases]
     tries = 3
     rows = []
     async with httpx.AsyncClient(timeout=20, headers=NSE_HEADERS, cookies=httpx.Cookies(), follow_redirects=True) as client:
@@ -19,7 +19,7 @@ async def _with_browser(run):
 
 async def fetch_nse_announcements_browser(ticker: str) -> List[Dict]:
     meta = resolve(ticker)
-    wanted = (meta["nse_symbol"] or ticker).upper()
+    wanted = (meta.nse_symbol or ticker).upper()
     async def run(page):
         # Warm homepage to set cookies
         await page.goto("https://www.nseindia.com/", wait_until="domcontentloaded")
@@ -54,7 +54,7 @@ async def fetch_nse_announcements_browser(ticker: str) -> List[Dict]:
 
 async def fetch_bse_announcements_browser(ticker: str) -> List[Dict]:
     meta = resolve(ticker)
-    aliases = [meta["company_name"]] + meta["aliases"]
+    aliases = [meta.company_name, *meta.aliases]
 
     def _matches(company: str) -> bool:
         c = (company or "").upper()
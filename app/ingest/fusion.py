@@ -3,24 +3,33 @@ import logging
 import json
 import sqlite3
 import time
+from functools import lru_cache
 from typing import List, Dict, Any, Tuple, Set, Optional
 from datetime import datetime
 
 from app.core import settings
 from app.core.cache import CACHE_DB_PATH
 from app.core.metrics import record_metric
-from app.ingest.adapters import newsapi, google_rss
+from app.ingest.adapters import newsapi, google_rss, scrapingdog
 from app.ingest.adapters.base import NewsItem, domain_from_url
 from app.ingest.google_rss_scrapingdog import search_google_news_scrapingdog
+from app.ingest.scheduler import get_cached_items
 
 log = logging.getLogger("ari.fusion")
 # module import-time log of configured news sources (short, non-secret)
 # log.info("fusion: NEWS_SOURCES=%s", settings.NEWS_SOURCES)
 
+# filter sets/keyword tuples are built once at import (settings are module-level constants)
+_ALLOW_DOMAINS = frozenset(d.lower() for d in (settings.ALLOWLIST_DOMAINS or []))
+_BLOCK_DOMAINS = frozenset(d.lower() for d in (settings.BLOCKLIST_DOMAINS or []))
+_BLOCK_KEYWORDS = tuple(k.lower() for k in (settings.BLOCKLIST_KEYWORDS or []) if k)
+_HARD_KEYWORDS = tuple(k.lower() for k in (getattr(settings, "HARD_BLOCK_KEYWORDS", []) or []) if k)
+
 # map available adapters
 source_map = {
     "google_rss": google_rss,
     "newsapi": newsapi,
+    "scrapingdog": scrapingdog,
 }
 
 
@@ -32,14 +41,18 @@ async def _call_adapter(adapter_module, ticker: str, days: int, topk: int, timeo
         return []
 
 
+@lru_cache(maxsize=8192)
 def _parse_published_at(v: Optional[str]) -> float:
     if not v:
         return 0.0
+    s = v.strip()
+    # relative hints ("2 hours ago") are common; skip the exception path for them
+    if not s[:4].isdigit():
+        return 0.0
     try:
         # accept ISO with trailing Z
-        s = v.strip()
         if s.endswith("Z"):
-            s = s.replace("Z", "+00:00")
+            s = s[:-1] + "+00:00"
         dt = datetime.fromisoformat(s)
         return dt.timestamp()
     except Exception:
@@ -188,12 +201,13 @@ async def fetch_fused_news(ticker: str, top_k: int = 10, days: int = 7) -> list[
         DAYS = settings.NEWS_DAYS
         TOPK = settings.NEWS_TOPK
         TIMEOUT = settings.NEWS_TIMEOUT_S
-        ALLOW = {d.lower() for d in (settings.ALLOWLIST_DOMAINS or [])}
-        BLOCK = {d.lower() for d in (settings.BLOCKLIST_DOMAINS or [])}
-        KEYWORDS = [k.lower() for k in (settings.BLOCKLIST_KEYWORDS or [])]
-        HARD_KEYWORDS = [k.lower() for k in (getattr(settings, "HARD_BLOCK_KEYWORDS", []) or [])]
+        ALLOW = _ALLOW_DOMAINS
+        BLOCK = _BLOCK_DOMAINS
+        KEYWORDS = _BLOCK_KEYWORDS
+        HARD_KEYWORDS = _HARD_KEYWORDS
         LANG = (settings.NEWS_LANGUAGE or "en").lower()
-        DEBUG = bool(settings.DEBUG_NEWS_LOG)
+        # verbose filter logs only when enabled AND the logger would emit them
+        DEBUG = bool(settings.DEBUG_NEWS_LOG) and log.isEnabledFor(logging.INFO)
 
         if DEBUG:
             log.info(
@@ -221,16 +235,15 @@ async def fetch_fused_news(ticker: str, top_k: int = 10, days: int = 7) -> list[
                 title_lc = (it.get("title") or "").lower()
 
                 # HARD block: always drop if any hard phrase matches (case-insensitive substring)
-                if any(hk and hk in title_lc for hk in HARD_KEYWORDS):
-                    for hk in HARD_KEYWORDS:
-                        if hk and hk in title_lc:
-                            log.info("drop:hard_kw title=%r kw=%r", it.get("title"), hk)
+                matched = next((hk for hk in HARD_KEYWORDS if hk in title_lc), None)
+                if matched:
+                    log.info("drop:hard_kw title=%r kw=%r", it.get("title"), matched)
                     continue
 
                 # normal domain/title filters below
                 url = (it.get("url") or "").strip()
-                dom = domain_from_url(url)
-                dom_l = dom.lower()
+                # domain_from_url already returns the lowercased host
+                dom_l = domain_from_url(url)
 
                 if ALLOW:
                     if dom_l not in ALLOW:
@@ -247,10 +260,10 @@ async def fetch_fused_news(ticker: str, top_k: int = 10, days: int = 7) -> list[
                     domain_boost = 0
 
                 # BLOCKLIST_KEYWORDS: case-insensitive substring match — always drop (no ticker exception)
-                if any(kw and kw in title_lc for kw in KEYWORDS):
-                    for kw in KEYWORDS:
-                        if kw and kw in title_lc and DEBUG:
-                            log.info("drop:keyword title=%r kw=%r", it.get("title"), kw)
+                matched = next((kw for kw in KEYWORDS if kw in title_lc), None)
+                if matched:
+                    if DEBUG:
+                        log.info("drop:keyword title=%r kw=%r", it.get("title"), matched)
                     continue
 
                 score_time = _parse_published_at(it.get("published_at") or it.get("publishedAt"))
@@ -280,8 +293,13 @@ async def fetch_fused_news(ticker: str, top_k: int = 10, days: int = 7) -> list[
             if not mod:
                 log.debug("unknown news source '%s' skipped", src)
                 continue
-            items = await _call_adapter(mod, ticker, days=DAYS, topk=TOPK * 2, timeout_s=TIMEOUT)
-            log.info("fusion: source=%s returned=%d for %s", src, len(items), ticker)
+            # serve from the tiered refresh cache when warm; live fetch otherwise
+            items = get_cached_items(src, ticker) if settings.NEWS_TIER_REFRESH else None
+            if items is not None:
+                log.info("fusion: source=%s cache_hit=%d for %s", src, len(items), ticker)
+            else:
+                items = await _call_adapter(mod, ticker, days=DAYS, topk=TOPK * 2, timeout_s=TIMEOUT)
+                log.info("fusion: source=%s returned=%d for %s", src, len(items), ticker)
             # append raw items (duplicates removed later)
             for it in items:
                 url = (it.get("url") or "").strip()
@@ -7,6 +7,7 @@ import asyncio
 from typing import List, Dict, Any
 
 from app.core import settings
+from app.core.http import get_client, loads_json
 from app.core.metrics import record_vendor_event
 from app.core.retry_utils import rate_limited_retry  # ADD THIS
 
@@ -50,27 +51,25 @@ async def search_google_news_scrapingdog(
     success = False
 
     try:
-        async with httpx.AsyncClient(timeout=timeout_s) as client:
-            log.info(f"scrapingdog: fetching for query={q}")
-            
-            r = await client.get(url, params=params)
-            r.raise_for_status()
-            data = r.json() or {}
-            items = data if isinstance(data, list) else data.get("news_results") or []
-            
-            for it in items:
-                obj = {
-                    "title": it.get("title") or "",
-                    "url": it.get("url") or "",
-                    "source": it.get("source") or "",
-                    "published_hint": it.get("lastUpdated") or it.get("publishedAt") or it.get("published_at") or "",
-                    "snippet": it.get("snippet") or "",
-                }
-                out.append(obj)
-                if len(out) >= int(topk or 0):
-                    break
-            
-            success = True
+        client = await get_client()
+        log.info(f"scrapingdog: fetching for query={q}")
+        
+        r = await client.get(url, params=params, timeout=timeout_s)
+        r.raise_for_status()
+        data = loads_json(r.content) or {}
+        items = data if isinstance(data, list) else data.get("news_results") or []
+        
+        for it in items[: int(topk or 0)]:
+            obj = {
+                "title": it.get("title") or "",
+                "url": it.get("url") or "",
+                "source": it.get("source") or "",
+                "published_hint": it.get("lastUpdated") or it.get("publishedAt") or it.get("published_at") or "",
+                "snippet": it.get("snippet") or "",
+            }
+            out.append(obj)
+        
+        success = True
     
     finally:
         latency_ms = int((time.time() - start_time) * 1000)
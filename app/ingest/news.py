@@ -1,14 +1,17 @@
 from __future__ import annotations
 import os
+import re
+import asyncio
 import logging
-from typing import List, Dict, Any
-import aiosqlite
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 import time
 from datetime import datetime, timedelta, timezone
 import httpx
 from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
 from app.core.cache import url_hash
 from app.core.dates import now_iso as _now_iso
+from app.db.sqlite import get_shared_db, shared_write
 from app.ingest.adapters.base import domain_from_url
 from app.core import settings
 from app.ingest.extract import extract_bodies, extract_via_diffbot  # diffbot single-URL extractor
@@ -18,20 +21,116 @@ from app.observability.metrics import record_metric
 
 log = logging.getLogger("ari.news")
 
+# max in-flight Diffbot extractions per select_top_news_for_summary call
+_EXTRACT_CONCURRENCY = 4
+
+# settings snapshot (module-level constants in app.core.settings; read once, not per call/item)
+_NEWS_TIMEOUT_S = int(getattr(settings, "NEWS_TIMEOUT_S", 8) or 8)
+_DB_PATH = getattr(settings, "CACHE_DB_PATH", "./ari.db")
+_FRESH_WINDOW_HOURS = int(getattr(settings, "FRESH_WINDOW_HOURS", 24) or 24)
+_EXTRACT_LIMIT = int(getattr(settings, "NEWS_TOPK", 5) or 5)
+_NEWS_SOURCES = frozenset(getattr(settings, "NEWS_SOURCES", None) or ())
+_NEWSAPI_SPECULATIVE = bool(getattr(settings, "NEWS_NEWSAPI_SPECULATIVE", False))
+# block phrases (extend configured keywords)
+_BLOCK_KWS = tuple((k or "").lower() for k in (settings.BLOCKLIST_KEYWORDS or ()) if k) + (
+    "call options", "outlook for the week", "marathon", "outlook for the day",
+)
+# all block phrases as one literal alternation: a single C-level scan per title
+_BLOCK_RE = re.compile("|".join(map(re.escape, _BLOCK_KWS))) if _BLOCK_KWS else None
+
+
+# resolve helper (optional lookup module; resolved once at import, not per fetch)
+try:
+    from app.core.lookup import resolve  # type: ignore
+except Exception:
+    def resolve(t: str) -> Dict[str, List[str]]:
+        return {"name": t, "aliases": [], "nse": t}
+
+
+@lru_cache(maxsize=2048)
+def _aliases_for(ticker: str) -> Tuple[str, ...]:
+    """Deduped aliases for `ticker` (ALIAS_MAP override, else resolve()), memoized per ticker."""
+    info = resolve(ticker) or {}
+    aliases = (getattr(settings, "ALIAS_MAP", {}) or {}).get(ticker, []) or info.get("aliases") or []
+    return tuple(dict.fromkeys(a for a in aliases if a))
+
+
+# tracking params scrubbed from article URLs (utm_*, fbclid, gclid, icn)
+_TRACK_KEYS = frozenset(("fbclid", "gclid", "icn"))
+# anything urlparse/urlunparse could rewrite: query, fragment, params, stripped whitespace
+_NEEDS_PARSE_RE = re.compile(r"[?#;\s]")
+
 
 def _dequery_url(u: str) -> str:
+    """
+    Drop tracking params from `u`. The result is the url_hash input, so it must stay
+    byte-identical to what earlier releases produced for already-cached rows.
+    """
+    u = u or ""
+    # fast path: a plain http(s) URL with no query/fragment/params round-trips unchanged
+    if u.startswith(("https://", "http://")) and not _NEEDS_PARSE_RE.search(u):
+        return u
     try:
-        p = urlparse((u or "").strip())
+        p = urlparse(u.strip())
         if not p.scheme:
             return u
         # remove common tracking params
         q = parse_qsl(p.query, keep_blank_values=True)
-        filtered = [(k, v) for k, v in q if not k.lower().startswith("utm_") and k.lower() not in ("fbclid", "gclid", "icn")]
+        filtered = [(k, v) for k, v in q if not k.lower().startswith("utm_") and k.lower() not in _TRACK_KEYS]
         new_q = urlencode(filtered, doseq=True)
         return urlunparse((p.scheme, p.netloc, p.path or "", p.params or "", new_q, p.fragment or ""))
     except Exception:
         return u
 
+
+def _extract_source(raw: Dict[str, Any], url_norm: str) -> str:
+    """Publisher name from a vendor item (NewsAPI nests it as {"name": ...}), else the URL domain."""
+    src = raw.get("source") or raw.get("source_name") or raw.get("publisher")
+    if isinstance(src, dict):
+        src = src.get("name")
+    return (src or "").strip() or domain_from_url(url_norm) or ""
+
+
+def _make_row(ticker: str, raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Build the canonical article row for a ScrapingDog or NewsAPI item. URL dequery,
+    url_hash and source resolution happen exactly once. Returns None without a usable URL.
+    """
+    url_raw = (raw.get("url") or raw.get("link") or "").strip()
+    url_norm = _dequery_url(url_raw) if url_raw else ""
+    if not url_norm:
+        return None
+
+    published_at = (
+        raw.get("publishedAt") or raw.get("published_at") or raw.get("published_hint")
+        or raw.get("published") or raw.get("pubDate") or ""
+    ).strip()
+
+    return {
+        "ticker": ticker or "",
+        "title": (raw.get("title") or raw.get("headline") or "").strip(),
+        "url": url_norm,
+        "url_hash": url_hash(url_norm),
+        "source": _extract_source(raw, url_norm),
+        "published_at": published_at,
+        "lang": raw.get("lang") or "en",
+        "content": "",               # stub for fetch phase
+        "created_at": _now_iso(),
+    }
+
+
+@lru_cache(maxsize=16)
+def _news_window_at(days: int, minute: int) -> Tuple[str, str]:
+    now = datetime.fromtimestamp(minute * 60, tz=timezone.utc)
+    fmt = "%Y-%m-%dT%H:%M:%SZ"
+    return (now - timedelta(days=days)).strftime(fmt), now.strftime(fmt)
+
+
+def _news_window(days: int) -> Tuple[str, str]:
+    """(from_iso, to_iso) for the lookback window; shared per minute across a fan-out burst."""
+    return _news_window_at(int(days), int(time.time()) // 60)
+
+
 async def fetch_newsapi_everything(q: str, from_iso: str, to_iso: str, page_size: int = 10, api_key: str = "", timeout_s: int = 8):
     raise NotImplementedError
 
@@ -43,15 +142,7 @@ async def fetch_news_for_ticker(ticker: str, max_items: int = 10, days: int = 7,
     return metadata rows (content may be empty) up to `max_items`.
     """
     key = os.getenv("NEWS_API_KEY", "") or getattr(settings, "NEWS_API_KEY", "")
-    # resolve helper
-    try:
-        from app.core.lookup import resolve  # type: ignore
-    except Exception:
-        def resolve(t: str) -> Dict[str, List[str]]:
-            return {"name": t, "aliases": [], "nse": t}
-
-    info = resolve(ticker) or {}
-    aliases = (getattr(settings, "ALIAS_MAP", {}) or {}).get(ticker, []) or info.get("aliases") or []
+    aliases = list(_aliases_for(ticker))
 
     # build query terms for ScrapingDog: ticker + aliases, quoting multi-word terms
     terms = [ticker] + [a for a in (aliases or []) if a]
@@ -61,220 +152,118 @@ async def fetch_news_for_ticker(ticker: str, max_items: int = 10, days: int = 7,
     # parts used for NewsAPI q construction (reuse quoted terms)
     parts: List[str] = query_terms.copy()
 
-    # block phrases (extend existing keywords)
-    extra_block_phrases = ["call options", "outlook for the week", "marathon", "outlook for the day"]
-    blocked_keywords = [(k or "").lower() for k in (settings.BLOCKLIST_KEYWORDS or [])] + extra_block_phrases
+    # lowered once per call; title checks below are plain substring membership
+    ticker_l = (ticker or "").lower()
 
-    out: List[Dict] = []
     seen_hashes = set()
-    # ensure we only log keep/drop once per unique URL (by url_hash)
-    seen_logged: set[str] = set()
 
-    # collect stub rows (no content/extraction) to return to caller
+    # canonical stub rows (no content/extraction) returned to caller
     rows: List[Dict[str, Any]] = []
 
-    # ScrapingDog / google_rss path (if configured)
-    if "google_rss" in (settings.NEWS_SOURCES or []):
+    def _accept(row: Optional[Dict[str, Any]]) -> bool:
+        # dedupe by url_hash + basic title/keyword block check
+        if row is None or row["url_hash"] in seen_hashes:
+            return False
+        tl = row["title"].lower()
+        if _BLOCK_RE is not None and ticker_l and ticker_l not in tl and _BLOCK_RE.search(tl):
+            return False
+        seen_hashes.add(row["url_hash"])
+        return True
+
+    async def _fetch_scrapingdog() -> List[Dict[str, Any]]:
+        log.info("news.fetch: ticker=%s aliases=%s max_items=%d", ticker, aliases, max_items)
+        t0 = time.time()
+        sd_items = []
         try:
-            log.info("news.fetch: ticker=%s aliases=%s max_items=%d", ticker, aliases, max_items)
-            t0 = time.time()
-            sd_items = []
+            sd_items = await search_google_news_scrapingdog(
+                ticker,
+                aliases=aliases,
+                topk=max_items,
+                country="in",
+                timeout_s=_NEWS_TIMEOUT_S,
+            )
+        finally:
+            lat_ms = int((time.time() - t0) * 1000)
             try:
-                sd_items = await search_google_news_scrapingdog(
-                    ticker,
-                    aliases=aliases,
-                    topk=max_items,
-                    country="in",
-                    timeout_s=getattr(settings, "NEWS_TIMEOUT_S", 8),
-                )
-            finally:
-                lat_ms = int((time.time() - t0) * 1000)
-                try:
-                    record_metric("fetch", "scrapingdog", lat_ms, ok=bool(sd_items))
-                except Exception:
-                    log.exception("metrics: failed to record scrapingdog metric")
-            log.info("news: scrapingdog returned=%d for %s", len(sd_items), ticker)
-
-            for r in (sd_items or [])[:max_items]:
-                title = (r.get("title") or "").strip()
-                url = (r.get("url") or "").strip()
-                if not url:
-                    continue
-                url_norm = _dequery_url(url)
-                h = url_hash(url_norm)
-                if h in seen_hashes:
-                    continue
-                # basic title/keyword block check
-                tl = title.lower()
-                if ticker and ticker.lower() not in tl:
-                    bad = False
-                    for kw in blocked_keywords:
-                        if kw and kw in tl:
-                            bad = True
-                            break
-                    if bad:
-                        continue
-                seen_hashes.add(h)
-                rows.append(
-                    {
-                        "ticker": ticker,
-                        "title": title,
-                        "url": url_norm,
-                        "url_hash": h,
-                        "source": (r.get("source") or domain_from_url(url_norm) or "").strip(),
-                        "published_at": (r.get("published_hint") or "").strip(),
-                        "lang": "en",
-                        "content": "",
-                        "created_at": _now_iso(),
-                    }
-                )
-            # also prepare a simple out payload for immediate consumption
-            out = [
-                {
-                    "title": (r.get("title") or "").strip(),
-                    "url": (r.get("url") or "").strip(),
-                    "published_at": (r.get("published_hint") or "").strip(),
-                    "source": (r.get("source") or "") .strip(),
-                    "lang": "en",
-                    "snippet": (r.get("snippet") or "") if isinstance(r, dict) else "",
-                }
-                for r in (sd_items or [])[:max_items]
-            ]
-        except Exception:
-            log.exception("news: scrapingdog fetch failed for %s", ticker)
+                record_metric("fetch", "scrapingdog", lat_ms, ok=bool(sd_items))
+            except Exception:
+                log.exception("metrics: failed to record scrapingdog metric")
+        log.info("news: scrapingdog returned=%d for %s", len(sd_items), ticker)
+        return sd_items or []
 
-    # If still lacking results, use NewsAPI as before to top-up — but only if configured
-    if len(out) < max_items:
-        # Only use NewsAPI if it's explicitly enabled in settings.NEWS_SOURCES
-        if "newsapi" not in (getattr(settings, "NEWS_SOURCES", []) or []):
-            log.info("news.fetch: skipping newsapi (disabled in NEWS_SOURCES)")
-            na_items = []
-        else:
-            # NewsAPI enabled — ensure API key present
-            if not key:
-                log.info("news.fetch_news_for_ticker: NEWS_API_KEY missing, skipping NewsAPI top-up for %s", ticker)
-                na_items = []
-            else:
-                q = " OR ".join(parts) if parts else ticker
-                now = datetime.utcnow()
-                to_iso = now.replace(microsecond=0).isoformat() + "Z"
-                from_iso = (now - timedelta(days=days)).replace(microsecond=0).isoformat() + "Z"
-
-                na_items = []
-                try:
-                    t0_na = time.time()
-                    r_articles = []
-                    try:
-                        # call NewsAPI to top-up results (no DB writes here)
-                        r_articles = await fetch_newsapi_everything(
-                            q,
-                            from_iso,
-                            to_iso,
-                            page_size=max_items,
-                            api_key=key,
-                            timeout_s=getattr(settings, "NEWS_TIMEOUT_S", 8),
-                        )
-                        na_items = r_articles or []
-                    finally:
-                        lat_ms_na = int((time.time() - t0_na) * 1000)
-                        try:
-                            record_metric("fetch", "newsapi", lat_ms_na, ok=bool(r_articles))
-                        except Exception:
-                            log.exception("metrics: failed to record newsapi metric")
-                    log.info("news: newsapi returned=%d for %s", len(na_items), ticker)
-
-                    for a in na_items:
-                        if len(out) >= max_items:
-                            break
-                        url = (a.get("url") or "").strip()
-                        if not url:
-                            continue
-                        url_norm = _dequery_url(url)
-                        h = url_hash(url_norm)
-                        if h in seen_hashes:
-                            continue
-                        title = (a.get("title") or "").strip()
-                        tl = title.lower()
-                        if ticker and ticker.lower() not in tl:
-                            bad = False
-                            for kw in blocked_keywords:
-                                if kw and kw in tl:
-                                    bad = True
-                                    break
-                            if bad:
-                                continue
-                        seen_hashes.add(h)
-                        row = {
-                            "ticker": ticker,
-                            "title": title,
-                            "url": url_norm,
-                            "url_hash": h,
-                            "source": (a.get("source") or {}).get("name") if isinstance(a.get("source"), dict) else a.get("source") or domain_from_url(url_norm) or "",
-                            "published_at": a.get("publishedAt") or a.get("published_at") or "",
-                            "lang": "en",
-                            "content": "",
-                            "created_at": _now_iso(),
-                        }
-                        rows.append(row)
-                        item = {
-                            "title": title,
-                            "url": url_norm,
-                            "published_at": a.get("publishedAt") or a.get("published_at") or "",
-                            "source": (a.get("source") or {}).get("name") if isinstance(a.get("source"), dict) else a.get("source") or "",
-                            "lang": "en",
-                        }
-                        _key = (item.get("url") or "").strip() or (item.get("title") or "").strip()
-                        if not _key or _key in seen_logged:
-                            continue
-                        out.append(item)
-                        seen_logged.add(_key)
-                except Exception:
-                    log.exception("news.fetch_news_for_ticker: NewsAPI request failed for %s", ticker)
-
-    # Normalize/ensure required fields for every returned row and compute stable hash
-    rows: List[Dict[str, Any]] = []
-    for item in (out or []):
-        # ensure url canonical form
-        url_raw = (item.get("url") or item.get("link") or "").strip()
-        url_norm = _dequery_url(url_raw) if url_raw else ""
-        if not url_norm:
-            # skip items without a usable URL
-            continue
+    async def _fetch_newsapi() -> List[Dict[str, Any]]:
+        q = " OR ".join(parts) if parts else ticker
+        from_iso, to_iso = _news_window(days)
 
-        title = (item.get("title") or item.get("headline") or "").strip()
-        # compute full-hex URL hash
+        t0_na = time.time()
+        r_articles = []
         try:
-            h = url_hash(url_norm)
-        except Exception:
-            h = ""
-
-        # source detection
-        src = ""
-        sfield = item.get("source") or item.get("source_name") or item.get("publisher")
-        if isinstance(sfield, dict):
-            src = (sfield.get("name") or "").strip()
-        else:
-            src = (sfield or "").strip()
-        if not src:
+            # call NewsAPI to top-up results (no DB writes here)
+            r_articles = await fetch_newsapi_everything(
+                q,
+                from_iso,
+                to_iso,
+                page_size=max_items,
+                api_key=key,
+                timeout_s=_NEWS_TIMEOUT_S,
+            )
+        finally:
+            lat_ms_na = int((time.time() - t0_na) * 1000)
             try:
-                src = domain_from_url(url_norm) or ""
+                record_metric("fetch", "newsapi", lat_ms_na, ok=bool(r_articles))
             except Exception:
-                src = ""
-
-        published_at = (item.get("publishedAt") or item.get("published_at") or item.get("published") or item.get("pubDate") or "").strip() or ""
-        lang = (item.get("lang") or "en") or "en"
-
-        rows.append({
-            "ticker": ticker or "",
-            "title": title,
-            "url": url_norm,
-            "url_hash": h,
-            "source": src,
-            "published_at": published_at,
-            "lang": lang,
-            "content": "",               # stub for fetch phase
-            "created_at": _now_iso(),
-        })
+                log.exception("metrics: failed to record newsapi metric")
+        log.info("news: newsapi returned=%d for %s", len(r_articles or []), ticker)
+        return r_articles or []
+
+    # Only use NewsAPI if it's explicitly enabled in settings.NEWS_SOURCES
+    use_newsapi = False
+    if "newsapi" not in _NEWS_SOURCES:
+        log.info("news.fetch: skipping newsapi (disabled in NEWS_SOURCES)")
+    # NewsAPI enabled — ensure API key present
+    elif not key:
+        log.info("news.fetch_news_for_ticker: NEWS_API_KEY missing, skipping NewsAPI top-up for %s", ticker)
+    else:
+        use_newsapi = True
+
+    sd_items: Any = []
+    na_items: Any = None
+    if "google_rss" in _NEWS_SOURCES:
+        if use_newsapi and _NEWSAPI_SPECULATIVE:
+            # opt-in: both hosts concurrently, even when ScrapingDog alone would fill max_items
+            sd_items, na_items = await asyncio.gather(
+                _fetch_scrapingdog(), _fetch_newsapi(), return_exceptions=True
+            )
+        else:
+            try:
+                sd_items = await _fetch_scrapingdog()
+            except Exception as e:
+                sd_items = e
+
+    if isinstance(sd_items, BaseException):
+        log.error("news: scrapingdog fetch failed for %s", ticker, exc_info=sd_items)
+        sd_items = []
+    for r in sd_items[:max_items]:
+        row = _make_row(ticker, r)
+        if _accept(row):
+            rows.append(row)
+
+    # If still lacking results, use NewsAPI to top-up (called only now unless speculative)
+    if use_newsapi and len(rows) < max_items:
+        if na_items is None:
+            try:
+                na_items = await _fetch_newsapi()
+            except Exception as e:
+                na_items = e
+        if isinstance(na_items, BaseException):
+            log.error("news.fetch_news_for_ticker: NewsAPI request failed for %s", ticker, exc_info=na_items)
+            na_items = []
+        for a in na_items:
+            if len(rows) >= max_items:
+                break
+            row = _make_row(ticker, a)
+            if _accept(row):
+                rows.append(row)
 
     # log one sample row for debugging
     log.info("news.fetch_news_for_ticker: sample=%s", rows[0] if rows else {})
@@ -288,24 +277,48 @@ async def select_top_news_for_summary(ticker: str, max_items: int = 5, days: int
     try:
         items = await fetch_news_for_ticker(ticker, max_items=max_items, days=days)
         selected = items[:max_items]
-        # Ensure each candidate has English text; extract via Diffbot when missing
-        for item in selected:
+        # Ensure each candidate has English text; extract via Diffbot when missing (bounded concurrency)
+        timeout_s = _NEWS_TIMEOUT_S
+        sem = asyncio.Semaphore(_EXTRACT_CONCURRENCY)
+
+        async def _extract(item: Dict[str, Any]) -> None:
             try:
-                cur_text = (item.get("translated_text") or item.get("content") or "") or ""
-                if not cur_text:
-                    timeout_s = int(getattr(settings, "NEWS_TIMEOUT_S", 8) or 8)
+                async with sem:
                     text = await extract_via_diffbot(item.get("url") or "", timeout_s=timeout_s)
-                    item["content"] = text or ""
-                    item["translated_text"] = text or ""
-                    log.info("news: extracted chars=%d for url=%s", len(text or ""), item.get("url") or "")
+                item["content"] = text or ""
+                item["translated_text"] = text or ""
+                log.info("news: extracted chars=%d for url=%s", len(text or ""), item.get("url") or "")
             except Exception:
                 log.exception("news: extract_via_diffbot failed for url=%s", item.get("url") or "")
+
+        pending = [it for it in selected if not (it.get("translated_text") or it.get("content"))]
+        if pending:
+            await asyncio.gather(*(_extract(it) for it in pending))
         return selected
     except Exception:
         log.exception("select_top_news_for_summary failed for %s", ticker)
         return []
 
 
+_ARTICLES_INDEX_ENSURED = False
+
+
+async def _ensure_articles_index() -> None:
+    """
+    One-time (per process) guard so the freshness select below is an index range
+    scan on (ticker, created_at) rather than a table scan.
+    """
+    global _ARTICLES_INDEX_ENSURED
+    if _ARTICLES_INDEX_ENSURED:
+        return
+    try:
+        async with shared_write(_DB_PATH) as db:
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_articles_ticker_created ON articles(ticker, created_at)")
+    except Exception:
+        log.debug("extract_and_cache_bodies: index ensure failed (ignored)", exc_info=False)
+    _ARTICLES_INDEX_ENSURED = True
+
+
 async def extract_and_cache_bodies(ticker: str) -> int:
     """
     Find fresh articles for ticker with empty content, run extraction (Diffbot->fallback)
@@ -315,11 +328,9 @@ async def extract_and_cache_bodies(ticker: str) -> int:
     if not ticker:
         return 0
 
-    hours = int(getattr(settings, "FRESH_WINDOW_HOURS", 24) or 24)
-    window_expr = f"datetime('now', '-{hours} hours')"
-    limit = int(getattr(settings, "NEWS_TOPK", 5) or 5)
+    window_expr = f"datetime('now', '-{_FRESH_WINDOW_HOURS} hours')"
+    limit = _EXTRACT_LIMIT
 
-    rows: List[Dict[str, Any]] = []
     q = f"""
     SELECT url, url_hash, title
     FROM articles
@@ -328,16 +339,17 @@ async def extract_and_cache_bodies(ticker: str) -> int:
     LIMIT ?
     """
 
-    async with aiosqlite.connect(getattr(settings, "CACHE_DB_PATH", "./ari.db")) as db:
-        try:
-            async with db.execute(q, (ticker, limit)) as cur:
-                fetched = await cur.fetchall()
-        except Exception:
-            log.exception("extract_and_cache_bodies: DB select failed for %s", ticker)
-            return 0
+    # one long-lived connection serves both the select and the batched update
+    await _ensure_articles_index()
+    db = await get_shared_db(_DB_PATH)
+    try:
+        async with db.execute(q, (ticker, limit)) as cur:
+            fetched = await cur.fetchall()
+    except Exception:
+        log.exception("extract_and_cache_bodies: DB select failed for %s", ticker)
+        return 0
 
-        for url, url_h, cur_title in (fetched or []):
-            rows.append({"url": url or "", "url_hash": url_h or "", "title": cur_title or ""})
+    rows = [{"url": u or "", "url_hash": h or "", "title": t or ""} for u, h, t in (fetched or [])]
 
     if not rows:
         return 0
@@ -349,35 +361,34 @@ async def extract_and_cache_bodies(ticker: str) -> int:
         log.exception("extract_and_cache_bodies: extract_bodies failed for %s", ticker)
         return 0
 
+    # persist results: update articles with extracted content (limit size), one batched statement
+    now = _now_iso()
+    params = []
+    for r in (extracted_rows or []):
+        url_h = (r.get("url_hash") or "").strip()
+        content = r.get("content")
+        if not url_h or not content:
+            continue
+        if len(content) < 200:  # skip very short extracts
+            continue
+        params.append((content[:15000], r.get("title") or "", "en", now, url_h))
+
     updated = 0
-    # persist results: update articles with extracted content (limit size)
-    db_path = getattr(settings, "CACHE_DB_PATH", "./ari.db")
-    async with aiosqlite.connect(db_path) as db:
-        await db.execute("PRAGMA journal_mode=WAL")
+    if params:
         try:
-            for r in (extracted_rows or []):
-                url_h = (r.get("url_hash") or "").strip()
-                content = r.get("content")
-                title = r.get("title") or ""
-                if not url_h or not content:
-                    continue
-                if len(content) < 200:  # skip very short extracts
-                    continue
-                try:
-                    await db.execute(
-                        """
-                        UPDATE articles
-                        SET content = ?, title = ?, lang = ?, created_at = ?
-                        WHERE url_hash = ?
-                        """,
-                        (content[:15000], title or "", "en", _now_iso(), url_h),
-                    )
-                    updated += 1
-                except Exception:
-                    log.exception("extract_and_cache_bodies: update failed for url_hash=%s", url_h)
-            await db.commit()
+            # concurrent tickers share this connection: keep each batch its own transaction
+            async with shared_write(_DB_PATH) as wdb:
+                await wdb.executemany(
+                    """
+                    UPDATE articles
+                    SET content = ?, title = ?, lang = ?, created_at = ?
+                    WHERE url_hash = ?
+                    """,
+                    params,
+                )
+            updated = len(params)
         except Exception:
-            log.exception("extract_and_cache_bodies: DB update loop failed for %s", ticker)
+            log.exception("extract_and_cache_bodies: DB update failed for %s", ticker)
 
     log.info("extract_and_cache_bodies: ticker=%s updated=%d", ticker, updated)
     return updated
\ No newline at end of file
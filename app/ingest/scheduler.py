@@ -0,0 +1,91 @@
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core import settings
+from app.ingest.adapters.base import NewsItem
+
+log = logging.getLogger("ari.ingest.scheduler")
+
+# adapter -> ticker -> (fetched_at monotonic, items)
+per_adapter_cache: Dict[str, Dict[str, Tuple[float, List[NewsItem]]]] = {}
+
+_tasks: Dict[str, asyncio.Task] = {}
+
+
+def get_cached_items(adapter: str, ticker: str) -> Optional[List[NewsItem]]:
+    """
+    Return a copy of the cached items for (adapter, ticker), or None when there is
+    no entry or it is older than two refresh intervals (refresh loop stalled).
+    """
+    # the refresh loop keys tickers upper-cased; callers pass whatever case they have
+    entry = per_adapter_cache.get(adapter, {}).get((ticker or "").strip().upper())
+    if not entry:
+        return None
+    fetched_at, items = entry
+    interval = (settings.NEWS_TIER_INTERVALS or {}).get(adapter)
+    if not interval or time.monotonic() - fetched_at > 2 * interval:
+        return None
+    # shallow copies: fusion tags items in place (e.g. source)
+    return [dict(it) for it in items]
+
+
+async def _refresh_loop(adapter: str, interval: int, tickers: List[str]) -> None:
+    """
+    Refresh the per-adapter cache for every ticker, then sleep `interval` seconds.
+    Each tier runs in its own task so slow vendors never delay the fast tier.
+    """
+    # local import to avoid circular import (fusion reads this module's cache)
+    from app.ingest.fusion import _call_adapter, source_map
+
+    mod = source_map.get(adapter)
+    if not mod:
+        log.warning("tier_refresh: unknown adapter '%s', loop not started", adapter)
+        return
+
+    bucket = per_adapter_cache.setdefault(adapter, {})
+    while True:
+        for ticker in tickers:
+            items = await _call_adapter(
+                mod,
+                ticker,
+                days=settings.NEWS_DAYS,
+                topk=settings.NEWS_TOPK * 2,
+                timeout_s=settings.NEWS_TIMEOUT_S,
+            )
+            bucket[ticker] = (time.monotonic(), items)
+            log.debug("tier_refresh: adapter=%s ticker=%s items=%d", adapter, ticker, len(items))
+        await asyncio.sleep(interval)
+
+
+def start_tier_refresh(tickers: Optional[List[str]] = None) -> List[str]:
+    """
+    Start one background refresh task per configured news source that has a tier
+    interval. Idempotent; returns the adapters with a running loop.
+    """
+    tk = [t.strip().upper() for t in (tickers or settings.SCHEDULE_TICKERS or []) if t and t.strip()]
+    if not tk:
+        log.info("tier_refresh: no tickers configured; skipping")
+        return []
+
+    intervals = settings.NEWS_TIER_INTERVALS or {}
+    for src in settings.NEWS_SOURCES or []:
+        interval = intervals.get(src)
+        if not interval or src in _tasks:
+            continue
+        _tasks[src] = asyncio.create_task(_refresh_loop(src, interval, tk))
+        log.info("tier_refresh: started adapter=%s interval=%ds tickers=%s", src, interval, tk)
+    return list(_tasks)
+
+
+async def stop_tier_refresh() -> None:
+    """Cancel all refresh tasks and wait for them to finish."""
+    tasks = list(_tasks.values())
+    _tasks.clear()
+    for t in tasks:
+        t.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    log.info("tier_refresh: stopped %d task(s)", len(tasks))
@@ -1,27 +1,46 @@
 # app/ingest/tickers.py
-from typing import Dict
+import sys
+from functools import lru_cache
+from typing import Dict, NamedTuple, Tuple
+
+
+class Ticker(NamedTuple):
+    nse_symbol: str
+    bse_code: str
+    company_name: str
+    aliases: Tuple[str, ...]
+
 
 # Minimal starter directory; expand as you go
-TICKER_DIR: Dict[str, dict] = {
-    "TCS": {
-        "nse_symbol": "TCS",
-        "bse_code": "532540",
-        "company_name": "Tata Consultancy Services Limited",
-        "aliases": ["Tata Consultancy Services", "TCS"],
-    }
+TICKER_DIR: Dict[str, Ticker] = {
+    "TCS": Ticker(
+        nse_symbol="TCS",
+        bse_code="532540",
+        company_name="Tata Consultancy Services Limited",
+        aliases=("Tata Consultancy Services", "TCS"),
+    )
     # Add more tickers as needed...
 }
 
-def resolve(symbol: str) -> dict:
+# every uppercased symbol and alias -> its TICKER_DIR entry, built once at import
+_ALIAS_INDEX: Dict[str, Ticker] = {}
+for _sym, _entry in TICKER_DIR.items():
+    for _alias in _entry.aliases:
+        _ALIAS_INDEX.setdefault(sys.intern(_alias.upper()), _entry)
+    # primary symbols win over aliases of other tickers
+    _ALIAS_INDEX[sys.intern(_sym.upper())] = _entry
+
+
+def _default(symbol: str) -> Ticker:
     key = symbol.upper()
-    if key in TICKER_DIR:
-        return TICKER_DIR[key]
-    return {
-        "nse_symbol": key,
-        "bse_code": "",
-        "company_name": key,
-        "aliases": [symbol],
-    }
+    return Ticker(nse_symbol=key, bse_code="", company_name=key, aliases=(symbol,))
+
+
+@lru_cache(maxsize=1024)
+def resolve(symbol: str) -> Ticker:
+    # memoized per symbol (repeated misses share one fallback Ticker); entries are immutable
+    # interned keys: a hit on the index compares by identity before falling back to ==
+    return _ALIAS_INDEX.get(sys.intern(symbol.upper())) or _default(symbol)
 
 def get_bse_code(symbol: str) -> str:
-    return resolve(symbol).get("bse_code", "")
\ No newline at end of file
+    return resolve(symbol).bse_code
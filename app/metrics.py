@@ -31,6 +31,10 @@ def record_metric(category: str, provider: str, latency_ms: int, success: bool)
 
     """
 
+    if not log.isEnabledFor(logging.INFO):
+
+        return
+
     log.info(
 
         "metric: category=%s provider=%s latency_ms=%d success=%s",
@@ -3,11 +3,12 @@ Vendor performance and cost aggregation.
 Computes KPIs: success rate, total calls, avg latency, total cost.
 """
 from __future__ import annotations
+import asyncio
 import logging
-from typing import List, Dict, Any
-import aiosqlite
+from typing import List, Dict, Any, Optional, Set, Tuple
 
 from app.core.cache import CACHE_DB_PATH
+from app.db.sqlite import get_read_pool
 
 log = logging.getLogger("ari.metrics.aggregates")
 
@@ -25,6 +26,132 @@ except ImportError:
     }
 
 
+# output-ready per-call costs and the vendor event filter
+_VENDOR_COSTS_ROUNDED = {k: round(v, 6) for k, v in VENDOR_COSTS.items()}
+_EVENTS_TUPLE = ("fetch", "extract", "summarize", "email")
+# inlined as literals (constants, not input): SQLite can only match the partial index
+# below when the query's WHERE provably implies the index's WHERE, which bound ? cannot
+_EVENTS_SQL = ", ".join(f"'{e}'" for e in _EVENTS_TUPLE)
+
+# VENDOR_COSTS as an inline (provider, cpc) relation so SQLite does the cost arithmetic
+if VENDOR_COSTS:
+    _COSTS_CTE = "costs(provider, cpc) AS (VALUES " + ", ".join(["(?, ?)"] * len(VENDOR_COSTS)) + ")"
+    _COSTS_PARAMS = tuple(x for p, c in VENDOR_COSTS.items() for x in (p, float(c or 0)))
+else:
+    _COSTS_CTE = "costs(provider, cpc) AS (SELECT NULL, 0 WHERE 0)"
+    _COSTS_PARAMS = ()
+
+# db_path -> (MAX(rowid) of metrics when computed, vendor_performance_summary result)
+_SUMMARY_CACHE: Dict[str, Tuple[Optional[int], List[Dict[str, Any]]]] = {}
+# rows per fetchmany() when streaming the summary
+_FETCH_CHUNK = 500
+
+# db paths whose metrics indexes were already ensured by this process
+_INDEX_ENSURED: Set[str] = set()
+# db paths whose metrics_agg rollup is known to exist
+_AGG_SEEN: Set[str] = set()
+
+
+async def _ensure_metrics_indexes(db, db_path: str) -> None:
+    """
+    One-time (per process, per db) guard for the covering partial index used by the
+    vendor aggregates: it holds only vendor-event rows, already ordered by provider,
+    so WHERE event IN (...) GROUP BY provider streams from it with no temp b-tree.
+    Supersedes the full (event, provider, ok, latency_ms) index, which is dropped.
+    """
+    if db_path in _INDEX_ENSURED:
+        return
+    try:
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_metrics_agg_partial "
+            f"ON metrics(provider, event, ok, latency_ms) WHERE event IN ({_EVENTS_SQL})"
+        )
+        await db.execute("DROP INDEX IF EXISTS idx_metrics_event_provider_ok_latency")
+        await db.commit()
+    except Exception:
+        log.debug("aggregates: metrics index ensure failed (ignored)", exc_info=False)
+    _INDEX_ENSURED.add(db_path)
+
+
+async def _has_metrics_agg(db, db_path: str) -> bool:
+    """
+    Whether the metrics_agg rollup exists yet. Read-only: the writer creates and seeds it
+    (app.core.metrics). Memoized once seen, since the table is never dropped.
+    """
+    if db_path in _AGG_SEEN:
+        return True
+    cursor = await db.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='metrics_agg'")
+    if await cursor.fetchone() is None:
+        return False
+    _AGG_SEEN.add(db_path)
+    return True
+
+
+async def _fetchall(db_path: str, query: str, params: tuple = (), ensure_indexes: bool = False) -> list:
+    """Run one read query on its own connection."""
+    async with get_read_pool(db_path).acquire() as db:
+        if ensure_indexes:
+            await _ensure_metrics_indexes(db, db_path)
+        cursor = await db.execute(query, params)
+        return await cursor.fetchall()
+
+
+def _summary_rows(rows) -> List[Dict[str, Any]]:
+    # every derived field is computed by SQLite; rows only need naming
+    return [
+        {
+            "provider": provider,
+            "event": event,
+            "total_calls": total_calls,
+            "successes": successes,
+            "failures": failures,
+            "success_pct": success_pct,
+            "avg_latency_ms": avg_latency_ms,
+            "cost_per_call": _VENDOR_COSTS_ROUNDED.get(provider, 0.0),
+            "total_cost": total_cost,
+        }
+        for provider, event, total_calls, successes, failures, success_pct, avg_latency_ms, total_cost in rows
+    ]
+
+
+def _summary_sql(source: str) -> str:
+    """
+    vendor_performance_summary over `metrics_agg` ("rollup") or, before the writer has
+    created it, over the same per-(provider, event) sums computed from `metrics` ("raw").
+    """
+    if source == "rollup":
+        # '' is the rollup's key for a NULL provider (see app.core.metrics)
+        groups = "SELECT NULLIF(provider, '') AS provider, event, total_calls, successes, sum_latency_ms FROM metrics_agg"
+    else:
+        groups = f"""
+            SELECT provider, event, COUNT(*) AS total_calls,
+                   SUM(CASE WHEN ok = 1 THEN 1 ELSE 0 END) AS successes,
+                   COALESCE(SUM(latency_ms), 0) AS sum_latency_ms
+            FROM metrics
+            WHERE event IN ({_EVENTS_SQL})
+            GROUP BY provider, event
+        """
+    return f"""
+        WITH {_COSTS_CTE}, m AS ({groups})
+        SELECT
+            m.provider,
+            m.event,
+            m.total_calls,
+            m.successes,
+            m.total_calls - m.successes AS failures,
+            ROUND(m.successes * 100.0 / m.total_calls, 2) AS success_pct,
+            ROUND(CAST(m.sum_latency_ms AS REAL) / m.total_calls, 1) AS avg_latency_ms,
+            ROUND(COALESCE(c.cpc, 0) * m.total_calls, 2) AS total_cost
+        FROM m
+        LEFT JOIN costs c ON c.provider = m.provider
+        WHERE m.event IN ({_EVENTS_SQL}) AND m.total_calls > 0
+        ORDER BY m.provider, m.event
+    """
+
+
+_SUMMARY_SQL = {source: _summary_sql(source) for source in ("rollup", "raw")}
+
+
 async def vendor_performance_summary(db_path: str | None = None) -> List[Dict[str, Any]]:
     """
     Returns success%, total calls, avg latency, and total cost per provider.
@@ -48,54 +175,27 @@ async def vendor_performance_summary(db_path: str | None = None) -> List[Dict[st
     
     log.info("vendor_performance_summary: querying metrics from %s", db_path)
     
-    query = """
-        SELECT 
-            provider,
-            event,
-            COUNT(*) AS total_calls,
-            SUM(CASE WHEN ok=1 THEN 1 ELSE 0 END) AS successes,
-            AVG(latency_ms) AS avg_latency
-        FROM metrics
-        WHERE event IN ('fetch', 'extract', 'summarize', 'email')
-        GROUP BY provider, event
-        ORDER BY provider, event
-    """
-    
     try:
-        async with aiosqlite.connect(db_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute(query)
-            rows = await cursor.fetchall()
-        
-        result = []
-        for r in rows:
-            provider = r["provider"]
-            event = r["event"]
-            total_calls = r["total_calls"]
-            successes = r["successes"]
-            avg_latency = r["avg_latency"]
-            
-            # Get cost per call from config
-            cost_per_call = VENDOR_COSTS.get(provider, 0)
-            
-            # Calculate total cost
-            total_cost = cost_per_call * total_calls
-            
-            # Calculate success percentage
-            success_pct = (successes / total_calls * 100) if total_calls > 0 else 0
-            
-            result.append({
-                "provider": provider,
-                "event": event,
-                "total_calls": total_calls,
-                "successes": successes,
-                "failures": total_calls - successes,
-                "success_pct": round(success_pct, 2),
-                "avg_latency_ms": round(avg_latency or 0, 1),
-                "cost_per_call": round(cost_per_call, 6),
-                "total_cost": round(total_cost, 2),
-            })
+        async with get_read_pool(db_path).acquire() as db:
+            # O(groups) read from the write-time rollup; raw scan until the writer creates it
+            source = "rollup" if await _has_metrics_agg(db, db_path) else "raw"
+            # MAX(rowid) reads the rightmost b-tree leaf: a cheap "anything written since?" probe
+            cursor = await db.execute("SELECT MAX(rowid) FROM metrics")
+            (latest,) = await cursor.fetchone()
+            cached = _SUMMARY_CACHE.get(db_path)
+            if cached is not None and cached[0] == latest:
+                log.info("vendor_performance_summary: cache hit (max_rowid=%s)", latest)
+                return [dict(r) for r in cached[1]]
+            cursor = await db.execute(_SUMMARY_SQL[source], _COSTS_PARAMS)
+            # stream in chunks: only one chunk of raw tuples is alive next to the result dicts
+            result: List[Dict[str, Any]] = []
+            while True:
+                chunk = await cursor.fetchmany(_FETCH_CHUNK)
+                if not chunk:
+                    break
+                result.extend(_summary_rows(chunk))
         
+        _SUMMARY_CACHE[db_path] = (latest, [dict(r) for r in result])
         log.info("vendor_performance_summary: returned %d provider/event combinations", len(result))
         return result
         
@@ -114,46 +214,53 @@ async def vendor_totals(db_path: str | None = None) -> Dict[str, Any]:
     if not db_path:
         db_path = CACHE_DB_PATH
     
-    summary = await vendor_performance_summary(db_path)
-    
-    total_calls = sum(s["total_calls"] for s in summary)
-    total_successes = sum(s["successes"] for s in summary)
-    total_cost = sum(s["total_cost"] for s in summary)
-    
-    overall_success_pct = (total_successes / total_calls * 100) if total_calls > 0 else 0
-    
-    # Group by provider for provider-level totals
-    by_provider: Dict[str, Dict[str, float]] = {}
-    for s in summary:
-        provider = s["provider"]
-        if provider not in by_provider:
-            by_provider[provider] = {
-                "total_calls": 0,
-                "total_cost": 0,
-                "successes": 0,
-            }
-        by_provider[provider]["total_calls"] += s["total_calls"]
-        by_provider[provider]["total_cost"] += s["total_cost"]
-        by_provider[provider]["successes"] += s["successes"]
-    
-    # Calculate provider-level success rates
+    # one GROUP BY provider pass in SQLite; no per-event intermediate list to re-fold
+    by_provider_q = f"""
+        SELECT provider, COUNT(*) AS total_calls, SUM(ok) AS successes
+        FROM metrics
+        WHERE event IN ({_EVENTS_SQL})
+        GROUP BY provider
+    """
+    grand_q = f"""
+        SELECT COUNT(*), SUM(ok)
+        FROM metrics
+        WHERE event IN ({_EVENTS_SQL})
+    """
+
+    # independent reads: run them on two pooled connections concurrently (WAL allows parallel readers)
+    rows, grand_rows = await asyncio.gather(
+        _fetchall(db_path, by_provider_q, ensure_indexes=True),
+        _fetchall(db_path, grand_q),
+    )
+    grand = grand_rows[0] if grand_rows else None
+
+    total_calls = int((grand and grand[0]) or 0)
+    total_successes = int((grand and grand[1]) or 0)
+
     provider_stats = []
-    for provider, stats in by_provider.items():
-        success_pct = (stats["successes"] / stats["total_calls"] * 100) if stats["total_calls"] > 0 else 0
+    total_cost = 0.0
+    for provider, calls, successes in rows:
+        calls = int(calls or 0)
+        successes = int(successes or 0)
+        cost = VENDOR_COSTS.get(provider, 0) * calls
+        total_cost += cost
+        success_pct = (successes / calls * 100) if calls > 0 else 0
         provider_stats.append({
             "provider": provider,
-            "total_calls": int(stats["total_calls"]),
-            "total_cost": round(stats["total_cost"], 2),
+            "total_calls": calls,
+            "total_cost": round(cost, 2),
             "success_pct": round(success_pct, 2),
         })
-    
+
+    overall_success_pct = (total_successes / total_calls * 100) if total_calls > 0 else 0
+
     # Sort by cost descending
     provider_stats.sort(key=lambda x: x["total_cost"], reverse=True)
-    
+
     return {
         "total_calls": total_calls,
         "total_successes": total_successes,
         "total_cost": round(total_cost, 2),
         "overall_success_pct": round(overall_success_pct, 2),
         "by_provider": provider_stats,
-    }
\ No newline at end of file
+    }
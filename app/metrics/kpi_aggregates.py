@@ -3,25 +3,437 @@ from __future__ import annotations
 Compute KPI aggregates for delivery, relevance, freshness, coverage, quality, and vendor performance.
 Called by /admin/metrics/kpi route.
 """
+import asyncio
 import logging
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List
 import time
 
 from sqlalchemy import text
+from app.core.settings import MTTD_MAX_GAP_MINUTES, QUALITY_SOURCES
 from app.db.pg import engine
 
 log = logging.getLogger("ari.metrics.kpi_aggregates")
 
 
+def _minutes_between(start_col: str, end_col: str) -> str:
+    """SQL expression: minutes from ISO-text column `start_col` to `end_col` (NULL-propagating)."""
+    return f"EXTRACT(EPOCH FROM ({end_col}::timestamptz - {start_col}::timestamptz)) / 60.0"
+
+
+async def _fetch_one(conn, statement, params):
+    """Execute and return the first row as a plain tuple-like Row (or None), releasing the cursor."""
+    return (await conn.execute(statement, params)).first()
+
+
+# Quality allowlist, normalized once (lowercase, "www." stripped) and baked into the
+# SQL with named placeholders; only the date bounds change per call. The row side
+# mirrors the same normalization: one LOWER + one REPLACE per email_items row.
+_QUALITY_NORM = sorted(frozenset(d.lower().strip().replace("www.", "") for d in QUALITY_SOURCES))
+_QUALITY_PARAMS = {f"q{i}": v for i, v in enumerate(_QUALITY_NORM)}
+if _QUALITY_NORM:
+    _QUALITY_SQL = text(f"""
+    SELECT 
+        COUNT(*) AS total_items,
+        SUM(
+            CASE 
+                WHEN REPLACE(LOWER(domain), 'www.', '') IN ({",".join(f":{k}" for k in _QUALITY_PARAMS)})
+                THEN 1 
+                ELSE 0 
+            END
+        ) AS quality_items
+    FROM email_items
+    WHERE sent_at >= :start AND sent_at < :end
+    """)
+else:
+    _QUALITY_SQL = text("""
+    SELECT 
+        COUNT(*) AS total_items,
+        0 AS quality_items
+    FROM email_items
+    WHERE sent_at >= :start AND sent_at < :end
+    """)
+
+
+async def _delivery(conn, start: str, end: str) -> Dict[str, Any]:
+    log.debug("Computing delivery KPIs")
+    delivery_row = await _fetch_one(
+        conn,
+        text("""
+        SELECT 
+            CAST(SUM(ok) AS REAL) / COUNT(*) AS send_success_rate,
+            AVG(latency_ms) AS avg_latency_ms,
+            MAX(latency_ms) AS max_latency_ms
+        FROM metrics 
+        WHERE event='email' AND timestamp >= :start AND timestamp < :end
+        """),
+        {"start": start, "end": end},
+    )
+    
+    if delivery_row:
+        return {
+            "send_success_rate": round((delivery_row[0] or 0) * 100, 2),
+            "avg_latency_ms": round(delivery_row[1] or 0, 1),
+            "max_latency_ms": delivery_row[2] or 0,
+        }
+    return {
+        "send_success_rate": None,
+        "avg_latency_ms": None,
+        "max_latency_ms": None,
+    }
+
+
+async def _relevance(conn, start: str, end: str) -> Dict[str, Any]:
+    log.debug("Computing relevance KPIs (rating-based)")
+    
+    # Reduce in SQL: one row out instead of every rating (1-5 stars)
+    total, avg_rating, positive = await _fetch_one(
+        conn,
+        text("""
+        SELECT
+            COUNT(*) AS total,
+            AVG(rating * 1.0) AS avg_rating,
+            SUM(CASE WHEN rating >= 4 THEN 1 ELSE 0 END) AS positive
+        FROM email_events
+        WHERE event_type='feedback' 
+          AND created_at >= :start AND created_at < :end
+          AND rating IS NOT NULL
+        """),
+        {"start": start, "end": end},
+    )
+    total = int(total or 0)
+    
+    if total:
+        # Positive feedback = ratings >= 4 (4 or 5 stars)
+        positive_feedback_pct = round((int(positive or 0) / total) * 100, 2)
+        avg_rating = round(float(avg_rating), 2)
+        
+        log.info("Relevance: total_feedback=%d, avg_rating=%.2f, positive_pct=%.2f", 
+                total, avg_rating, positive_feedback_pct)
+        
+        return {
+            "total_feedback": total,
+            "avg_rating": avg_rating,
+            "positive_feedback_pct": positive_feedback_pct,
+        }
+    log.warning("Relevance: no feedback data found")
+    return {
+        "total_feedback": 0,
+        "avg_rating": None,
+        "positive_feedback_pct": None,
+    }
+
+
+async def _freshness(conn, start: str, end: str) -> Dict[str, Any]:
+    log.debug("Computing freshness KPIs (using news_age at fetch time)")
+    
+    row = await _fetch_one(
+        conn,
+        text("""
+        SELECT 
+            COUNT(*) as total_articles,
+            AVG(news_age) as avg_age_hours,
+            SUM(CASE WHEN news_age IS NOT NULL AND news_age <= 12 THEN 1 ELSE 0 END) as fresh_count
+        FROM articles
+        WHERE content IS NOT NULL
+          AND LENGTH(content) > 0
+          AND created_at >= :start AND created_at < :end
+          AND news_age IS NOT NULL
+        """),
+        {"start": start, "end": end},
+    )
+    
+    # positional: total_articles, avg_age_hours, fresh_count
+    if row and (row[0] or 0) > 0:
+        total_articles = int(row[0] or 0)
+        avg_age_hours = float(row[1]) if row[1] is not None else None
+        fresh_count = int(row[2] or 0)
+        fresh_pct = round((fresh_count / total_articles) * 100.0, 2) if total_articles > 0 else None
+
+        log.info(
+            "Freshness: %d/%d articles within 12h (avg age=%.2fh at fetch time)",
+            fresh_count, total_articles, avg_age_hours,
+        )
+        return {
+            "source": "articles_news_age",
+            "total_articles": total_articles,
+            "fresh_count": fresh_count,
+            "fresh_pct": fresh_pct,
+            "avg_age_hours": round(avg_age_hours, 2) if avg_age_hours is not None else None,
+        }
+    return {
+        "source": "articles_news_age",
+        "total_articles": 0,
+        "fresh_count": 0,
+        "fresh_pct": None,
+        "avg_age_hours": None,
+    }
+
+
+async def _freshness_sent(conn, start: str, end: str) -> Dict[str, Any]:
+    log.debug("Computing sent articles freshness (articles actually delivered to users)")
+    
+    sent_row = await _fetch_one(
+        conn,
+        text("""
+        WITH s AS (
+            -- narrow summaries to the window (and the three columns used) before the join
+            SELECT item_url_hash, url, relevance
+            FROM summaries
+            WHERE created_at >= :start AND created_at < :end
+        )
+        SELECT 
+            COUNT(DISTINCT s.item_url_hash) as total_sent,
+            AVG(a.news_age) as avg_age_hours_sent,
+            SUM(CASE WHEN a.news_age <= 12 THEN 1 ELSE 0 END) as fresh_sent_count,
+            AVG(s.relevance) as avg_relevance_sent
+        FROM s
+        INNER JOIN articles a ON a.url = s.url
+        WHERE a.news_age IS NOT NULL
+        """),
+        {"start": start, "end": end},
+    )
+    
+    # positional: total_sent, avg_age_hours_sent, fresh_sent_count, avg_relevance_sent
+    if sent_row and (sent_row[0] or 0) > 0:
+        total_sent = int(sent_row[0] or 0)
+        avg_age_sent = float(sent_row[1]) if sent_row[1] is not None else None
+        fresh_sent = int(sent_row[2] or 0)
+        fresh_sent_pct = round((fresh_sent / total_sent) * 100.0, 2) if total_sent > 0 else None
+        avg_relevance_sent = float(sent_row[3]) if sent_row[3] is not None else None
+
+        log.info(
+            "Freshness (Sent): %d/%d sent articles within 12h (avg age=%.2fh, avg relevance=%s)",
+            fresh_sent, total_sent, avg_age_sent,
+            round(avg_relevance_sent, 2) if avg_relevance_sent is not None else None,
+        )
+        return {
+            "source": "sent_articles",
+            "total_sent": total_sent,
+            "fresh_sent_count": fresh_sent,
+            "fresh_sent_pct": fresh_sent_pct,
+            "avg_age_hours_sent": round(avg_age_sent, 2) if avg_age_sent is not None else None,
+            "avg_relevance_sent": round(avg_relevance_sent, 2) if avg_relevance_sent is not None else None,
+        }
+    log.warning("Freshness (Sent): no sent articles with news_age found")
+    return {
+        "source": "sent_articles",
+        "total_sent": 0,
+        "fresh_sent_count": 0,
+        "fresh_sent_pct": None,
+        "avg_age_hours_sent": None,
+        "avg_relevance_sent": None,
+    }
+
+
+async def _summaries(conn, start: str, end: str) -> Dict[str, Any]:
+    log.debug("Computing total summaries created")
+    
+    summary_row = await _fetch_one(
+        conn,
+        text("""
+        SELECT COUNT(*) as total_summaries
+        FROM summaries
+        WHERE created_at >= :start AND created_at < :end
+        """),
+        {"start": start, "end": end},
+    )
+    total_summaries = int(summary_row[0] or 0) if summary_row else 0
+    
+    log.info("Summaries: %d created in date range", total_summaries)
+    return {
+        "total_summaries": total_summaries
+    }
+
+
+async def _quality(conn, start: str, end: str) -> Dict[str, Any]:
+    log.debug("Computing quality source KPIs")
+    
+    params = dict(_QUALITY_PARAMS, start=start, end=end)
+    quality_row = await _fetch_one(conn, _QUALITY_SQL, params)
+    
+    total_items = quality_row[0] or 0
+    quality_items = quality_row[1] or 0
+    allowlist_pct = (quality_items * 100.0 / total_items) if total_items > 0 else 0.0
+    
+    log.info("Quality: %d/%d items from quality sources (%.1f%%)", quality_items, total_items, allowlist_pct)
+    
+    return {
+        "total_items": total_items,
+        "quality_items": quality_items,
+        "allowlist_pct": round(allowlist_pct, 2)
+    }
+
+
+async def _coverage(conn, start: str, end: str) -> Dict[str, Any]:
+    """Coverage (show unique tickers that had articles, not all active tickers)."""
+    log.debug("Computing coverage KPIs")
+    
+    # Both distinct counts in one round trip; no ticker lists shipped back to Python
+    total_unique_tickers, covered_count = await _fetch_one(
+        conn,
+        text("""
+        SELECT
+            (SELECT COUNT(*) FROM (
+                SELECT DISTINCT ticker FROM email_items WHERE sent_at >= :start AND sent_at < :end
+            ) e) AS total_tickers,
+            (SELECT COUNT(*) FROM (
+                SELECT DISTINCT ticker FROM summaries WHERE created_at >= :start AND created_at < :end
+            ) s) AS covered_tickers
+        """),
+        {"start": start, "end": end},
+    )
+    
+    # Calculate percentage (covered / unique tickers with articles)
+    coverage_pct = (covered_count / total_unique_tickers * 100.0) if total_unique_tickers > 0 else 0.0
+    
+    log.info("Coverage: %d/%d unique tickers covered (%.1f%%)", covered_count, total_unique_tickers, coverage_pct)
+    if log.isEnabledFor(logging.DEBUG):
+        # ticker lists are only materialized for debugging uncovered tickers
+        result = await conn.execute(
+            text("""
+            SELECT ticker FROM email_items WHERE sent_at >= :start AND sent_at < :end
+            EXCEPT
+            SELECT ticker FROM summaries WHERE created_at >= :start AND created_at < :end
+            """),
+            {"start": start, "end": end},
+        )
+        log.debug("Coverage: uncovered tickers=%s", sorted(str(row[0]) for row in result.fetchall()))
+    
+    return {
+        "total_tickers": total_unique_tickers,  # Unique tickers with articles
+        "covered_tickers": covered_count,        # Tickers with summaries
+        "coverage_pct": round(coverage_pct, 1)
+    }
+
+
+async def _vendor(conn, start: str, end: str) -> List[Dict[str, Any]]:
+    log.debug("Computing vendor performance KPIs")
+    
+    result = await conn.execute(
+        text("""
+        SELECT 
+            provider,
+            event,
+            COUNT(*) as total,
+            SUM(CASE WHEN ok = 1 THEN 1 ELSE 0 END) as successes,
+            CAST(SUM(CASE WHEN ok = 1 THEN 1 ELSE 0 END) AS FLOAT) * 100.0 / COUNT(*) as success_pct,
+            AVG(latency_ms) as avg_latency_ms
+        FROM vendor_metrics
+        WHERE created_at >= :start AND created_at < :end
+        GROUP BY provider, event
+        ORDER BY provider, event
+        """),
+        {"start": start, "end": end}
+    )
+    vendor_rows = result.fetchall()
+    if log.isEnabledFor(logging.INFO):
+        # every in-range row lands in exactly one group, so no separate COUNT(*) query
+        total_vendor_rows = sum(int(row[2]) for row in vendor_rows)
+        log.info(
+            "compute_kpi_aggregates: found %d vendor metrics (from %d total rows)",
+            len(vendor_rows), total_vendor_rows,
+        )
+    
+    vendor_agg = []
+    for row in vendor_rows:
+        provider, event, total, successes, success_pct, avg_lat = row
+        vendor_agg.append({
+            "provider": provider,
+            "event": event,
+            "total": int(total),
+            "successes": int(successes),
+            "success_pct": round(float(success_pct), 2),  # ← Changed to 2 decimals
+            "avg_latency_ms": round(float(avg_lat), 2) if avg_lat else 0  # ← Changed to 2 decimals
+        })
+    return vendor_agg
+
+
+# Transaction-local Postgres settings for the KPI reads: enough work_mem for the
+# DISTINCT/GROUP BY hash aggregates to stay in memory instead of spilling to temp files.
+_KPI_SESSION_SETTINGS = {"work_mem": "64MB"}
+
+
+async def _on_connection(*sections):
+    """
+    Run (fn, *args) sections back-to-back on one pooled engine connection and
+    return their results in order.
+    """
+    async with engine.connect() as conn:
+        for name, value in _KPI_SESSION_SETTINGS.items():
+            # is_local=true: reverts when the connection's transaction ends, so the
+            # pooled connection is handed back with server defaults
+            await conn.execute(text("SELECT set_config(:name, :value, true)"), {"name": name, "value": value})
+        return [await fn(conn, *args) for fn, *args in sections]
+
+
+# (start, end, db_path) -> (computed_at, result); windows that already ended cannot
+# change, so they are kept much longer than ones that still include "now".
+_KPI_CACHE: Dict[tuple, tuple] = {}
+_KPI_TTL = 120.0
+_KPI_TTL_HISTORICAL = 6 * 3600.0
+_KPI_CACHE_MAX = 64
+_KPI_LOCKS: Dict[tuple, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+def _kpi_ttl(end: str) -> float:
+    try:
+        end_dt = datetime.fromisoformat(end.replace('Z', '+00:00'))
+    except ValueError:
+        return _KPI_TTL
+    if end_dt.tzinfo is None:
+        end_dt = end_dt.replace(tzinfo=timezone.utc)
+    return _KPI_TTL_HISTORICAL if end_dt < datetime.now(timezone.utc) else _KPI_TTL
+
+
 async def compute_kpi_aggregates(
-    start: str, 
-    end: str, 
+    start: str,
+    end: str,
     db_path: str | None = None
 ) -> Dict[str, Any]:
+    """
+    Cached entry point: concurrent callers for the same window share one
+    computation (single-flight) and reuse its result until the TTL expires.
+    """
+    key = (start, end, db_path)
+    hit = _KPI_CACHE.get(key)
+    if hit and time.time() - hit[0] < _kpi_ttl(end):
+        return hit[1]
+
+    async with _KPI_LOCKS[key]:
+        hit = _KPI_CACHE.get(key)
+        if hit and time.time() - hit[0] < _kpi_ttl(end):
+            return hit[1]
+        result = await _compute_kpi_aggregates(start, end)
+        if len(_KPI_CACHE) >= _KPI_CACHE_MAX:
+            # drop the oldest entry; insertion order tracks computed_at
+            _KPI_CACHE.pop(next(iter(_KPI_CACHE)), None)
+        _KPI_CACHE.pop(key, None)
+        _KPI_CACHE[key] = (time.time(), result)
+    _KPI_LOCKS.pop(key, None)
+    return result
+
+
+def _utc_bound(dt: datetime, ceil: bool = False) -> str:
+    """
+    Format a window bound as UTC 'YYYY-MM-DDTHH:MM:SS' so ISO-text columns compare
+    lexically in time order; naive datetimes are taken as UTC.
+    No suffix on purpose: rows carry 'Z' (cache, email) or '+00:00' (vendor_metrics), and
+    '+' sorts before 'Z'. A bare-second prefix sorts before every row of that second
+    whatever its suffix, so '>= start' keeps them and '< end' drops them.
+    `ceil` rounds sub-second ends up, keeping '< end' inclusive of the last whole second.
+    """
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    if ceil and dt.microsecond:
+        dt = dt.replace(microsecond=0) + timedelta(seconds=1)
+    return dt.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+async def _compute_kpi_aggregates(start: str, end: str) -> Dict[str, Any]:
     log.info("compute_kpi_aggregates: computing KPIs for %s to %s", start, end)
-    log.info(f"kpi_aggregates: START for {start} to {end}")
-    t_start = time.time()
+    t_start = time.perf_counter_ns()
     
     try:
         start_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
@@ -30,432 +442,70 @@ async def compute_kpi_aggregates(
         log.error("compute_kpi_aggregates: invalid datetime format - %s", e)
         raise ValueError(f"Invalid datetime format. Use ISO format (e.g., '2025-11-01T00:00:00')")
     
-    results = {
-        "delivery": {},
-        "relevance": {},
-        "freshness": {},
-        "coverage": {},
-        "quality": {},
-        "vendor": [],
-    }
+    # Bind the window in the stored UTC text form so plain string range predicates are exact
+    lo, hi = _utc_bound(start_dt), _utc_bound(end_dt, ceil=True)
+    # Use last 14 days for MTTD/MTTR calculation
+    mttd_lo = _utc_bound(end_dt - timedelta(days=14))
 
     try:
-        async with engine.connect() as conn:
-
-            # --- Delivery KPIs ---
-            log.debug("Computing delivery KPIs")
-            result = await conn.execute(
-                text("""
-                SELECT 
-                    CAST(SUM(ok) AS REAL) / COUNT(*) AS send_success_rate,
-                    AVG(latency_ms) AS avg_latency_ms,
-                    MAX(latency_ms) AS max_latency_ms
-                FROM metrics 
-                WHERE event='email' AND timestamp BETWEEN :start AND :end
-                """),
-                {"start": start, "end": end}
-            )
-            delivery_row = result.fetchone()
-            
-            if delivery_row:
-                results["delivery"] = {
-                    "send_success_rate": round((delivery_row[0] or 0) * 100, 2),
-                    "avg_latency_ms": round(delivery_row[1] or 0, 1),
-                    "max_latency_ms": delivery_row[2] or 0,
-                }
-            else:
-                results["delivery"] = {
-                    "send_success_rate": None,
-                    "avg_latency_ms": None,
-                    "max_latency_ms": None,
-                }
-
-            # --- Relevance KPIs (rating-based) ---
-            log.debug("Computing relevance KPIs (rating-based)")
-            
-            # Fetch all feedback events with ratings (1-5 stars)
-            result = await conn.execute(
-                text("""
-                SELECT rating
-                FROM email_events
-                WHERE event_type='feedback' 
-                  AND created_at BETWEEN :start AND :end
-                  AND rating IS NOT NULL
-                """),
-                {"start": start, "end": end}
-            )
-            feedback_rows = result.fetchall()
-            
-            # Extract ratings from rows
-            ratings = [row[0] for row in feedback_rows if row[0] is not None]
-            
-            if ratings:
-                total = len(ratings)
-                # Positive feedback = ratings >= 4 (4 or 5 stars)
-                positive = sum(1 for r in ratings if r >= 4)
-                positive_feedback_pct = round((positive / total) * 100, 2)
-                avg_rating = round(sum(ratings) / total, 2)
-                
-                log.info("Relevance: total_feedback=%d, avg_rating=%.2f, positive_pct=%.2f", 
-                        total, avg_rating, positive_feedback_pct)
-                
-                results["relevance"] = {
-                    "total_feedback": total,
-                    "avg_rating": avg_rating,
-                    "positive_feedback_pct": positive_feedback_pct,
-                }
-            else:
-                log.warning("Relevance: no feedback data found")
-                results["relevance"] = {
-                    "total_feedback": 0,
-                    "avg_rating": None,
-                    "positive_feedback_pct": None,
-                }
-            
-            # --- Freshness KPIs (existing) ---
-            log.debug("Computing freshness KPIs (using news_age at fetch time)")
-            
-            result = await conn.execute(
-                text("""
-                SELECT 
-                    COUNT(*) as total_articles,
-                    AVG(news_age) as avg_age_hours,
-                    SUM(CASE WHEN news_age IS NOT NULL AND news_age <= 12 THEN 1 ELSE 0 END) as fresh_count
-                FROM articles
-                WHERE content IS NOT NULL
-                  AND LENGTH(content) > 0
-                  AND created_at BETWEEN :start AND :end
-                  AND news_age IS NOT NULL
-                """),
-                {"start": start, "end": end}
-            )
-            row = result.mappings().fetchone()
-            
-            if row and (row["total_articles"] or 0) > 0:
-                total_articles = int(row["total_articles"] or 0)
-                avg_age_hours = float(row["avg_age_hours"]) if row["avg_age_hours"] is not None else None
-                fresh_count = int(row["fresh_count"] or 0)
-                fresh_pct = round((fresh_count / total_articles) * 100.0, 2) if total_articles > 0 else None
-
-                results["freshness"] = {
-                    "source": "articles_news_age",
-                    "total_articles": total_articles,
-                    "fresh_count": fresh_count,
-                    "fresh_pct": fresh_pct,
-                    "avg_age_hours": round(avg_age_hours, 2) if avg_age_hours is not None else None,
-                }
-                
-                log.info(
-                    f"Freshness: {fresh_count}/{total_articles} articles within 12h "
-                    f"(avg age={avg_age_hours:.2f}h at fetch time)"
-                )
-            else:
-                results["freshness"] = {
-                    "source": "articles_news_age",
-                    "total_articles": 0,
-                    "fresh_count": 0,
-                    "fresh_pct": None,
-                    "avg_age_hours": None,
-                }
-
-            # --- NEW: Sent Articles Freshness ---
-            log.debug("Computing sent articles freshness (articles actually delivered to users)")
-            
-            result = await conn.execute(
-                text("""
-                SELECT 
-                    COUNT(DISTINCT s.item_url_hash) as total_sent,
-                    AVG(a.news_age) as avg_age_hours_sent,
-                    SUM(CASE WHEN a.news_age IS NOT NULL AND a.news_age <= 12 THEN 1 ELSE 0 END) as fresh_sent_count,
-                    AVG(s.relevance) as avg_relevance_sent
-                FROM summaries s
-                INNER JOIN articles a ON s.url = a.url
-                WHERE s.created_at BETWEEN :start AND :end
-                  AND a.news_age IS NOT NULL
-                """),
-                {"start": start, "end": end}
-            )
-            sent_row = result.mappings().fetchone()
-            
-            if sent_row and (sent_row["total_sent"] or 0) > 0:
-                total_sent = int(sent_row["total_sent"] or 0)
-                avg_age_sent = float(sent_row["avg_age_hours_sent"]) if sent_row["avg_age_hours_sent"] is not None else None
-                fresh_sent = int(sent_row["fresh_sent_count"] or 0)
-                fresh_sent_pct = round((fresh_sent / total_sent) * 100.0, 2) if total_sent > 0 else None
-                avg_relevance_sent = float(sent_row["avg_relevance_sent"]) if sent_row["avg_relevance_sent"] is not None else None
-
-                results["freshness_sent"] = {
-                    "source": "sent_articles",
-                    "total_sent": total_sent,
-                    "fresh_sent_count": fresh_sent,
-                    "fresh_sent_pct": fresh_sent_pct,
-                    "avg_age_hours_sent": round(avg_age_sent, 2) if avg_age_sent is not None else None,
-                    "avg_relevance_sent": round(avg_relevance_sent, 2) if avg_relevance_sent is not None else None,
-                }
-                
-                log.info(
-                    f"Freshness (Sent): {fresh_sent}/{total_sent} sent articles within 12h "
-                    f"(avg age={avg_age_sent:.2f}h, avg relevance={avg_relevance_sent:.2f})"
-                )
-            else:
-                log.warning("Freshness (Sent): no sent articles with news_age found")
-                results["freshness_sent"] = {
-                    "source": "sent_articles",
-                    "total_sent": 0,
-                    "fresh_sent_count": 0,
-                    "fresh_sent_pct": None,
-                    "avg_age_hours_sent": None,
-                    "avg_relevance_sent": None,
-                }
-
-            # --- NEW: Total Summaries Created ---
-            log.debug("Computing total summaries created")
-            
-            result = await conn.execute(
-                text("""
-                SELECT COUNT(*) as total_summaries
-                FROM summaries
-                WHERE created_at BETWEEN :start AND :end
-                """),
-                {"start": start, "end": end}
-            )
-            summary_row = result.mappings().fetchone()
-            total_summaries = int(summary_row["total_summaries"] or 0) if summary_row else 0
-            
-            results["summaries"] = {
-                "total_summaries": total_summaries
-            }
-            
-            log.info(f"Summaries: {total_summaries} created in date range")
-
-            # --- Coverage (unique tickers with summaries vs unique tickers with articles) ---
-            log.debug("Computing coverage KPIs")
-            
-            # Get unique tickers that have articles (no date filter since published_at is NULL)
-            result = await conn.execute(
-                text("""
-                SELECT DISTINCT ticker
-                FROM articles
-                WHERE ticker IS NOT NULL
-                  AND ticker != ''
-                """)
-            )
-            unique_tickers_with_articles = [row[0] for row in result.fetchall()]
-            total_unique_tickers = len(unique_tickers_with_articles)
-            
-            log.debug(f"Found {total_unique_tickers} unique tickers with articles: {unique_tickers_with_articles}")
-            
-            # Get tickers that have summaries in the date range
-            result = await conn.execute(
-                text("""
-                SELECT DISTINCT ticker
-                FROM summaries
-                WHERE created_at BETWEEN :start AND :end
-                  AND ticker IS NOT NULL
-                  AND ticker != ''
-                """),
-                {"start": start, "end": end}
-            )
-            covered_tickers = [row[0] for row in result.fetchall()]
-            covered_count = len(covered_tickers)
-            
-            log.debug(f"Found {covered_count} tickers with summaries in range: {covered_tickers}")
-            
-            # Calculate percentage
-            coverage_pct = (covered_count / total_unique_tickers * 100.0) if total_unique_tickers > 0 else 0.0
-            
-            log.info(f"Coverage: {covered_count}/{total_unique_tickers} unique tickers covered ({coverage_pct:.1f}%)")
-            
-            results["coverage"] = {
-                "total_tickers": total_unique_tickers,
-                "covered_tickers": covered_count,
-                "coverage_pct": round(coverage_pct, 1)
-            }
-
-            # --- Quality Sources ---
-            log.debug("Computing quality source KPIs")
-            
-            from app.core.settings import QUALITY_SOURCES
-            
-            # Normalize quality sources - strip www. prefix and lowercase
-            normalized_quality = set()
-            for domain in QUALITY_SOURCES:
-                d = domain.lower().strip()
-                # Add both with and without www.
-                normalized_quality.add(d)
-                if d.startswith('www.'):
-                    normalized_quality.add(d[4:])  # without www.
-                else:
-                    normalized_quality.add(f'www.{d}')  # with www.
-            
-            log.debug(f"Normalized quality sources: {sorted(normalized_quality)}")
-            
-            # Query with domain normalization in SQL - build named placeholders
-            nq = [d.replace('www.', '').lower() for d in normalized_quality]
-            if nq:
-                placeholders = ",".join(f":q{i}" for i in range(len(nq)))
-                sql = f"""
-                SELECT 
-                    COUNT(*) AS total_items,
-                    SUM(
-                        CASE 
-                            WHEN LOWER(REPLACE(REPLACE(domain, 'www.', ''), 'WWW.', '')) IN ({placeholders})
-                            THEN 1 
-                            ELSE 0 
-                        END
-                    ) AS quality_items
-                FROM email_items
-                WHERE sent_at BETWEEN :start AND :end
-                """
-                params = {f"q{i}": v for i, v in enumerate(nq)}
-                params.update({"start": start, "end": end})
-                result = await conn.execute(text(sql), params)
-            else:
-                result = await conn.execute(
-                    text("""
-                    SELECT 
-                        COUNT(*) AS total_items,
-                        0 AS quality_items
-                    FROM email_items
-                    WHERE sent_at BETWEEN :start AND :end
-                    """),
-                    {"start": start, "end": end}
-                )
-            quality_row = result.fetchone()
-            
-            total_items = quality_row[0] or 0
-            quality_items = quality_row[1] or 0
-            allowlist_pct = (quality_items * 100.0 / total_items) if total_items > 0 else 0.0
-            
-            log.info(f"Quality: {quality_items}/{total_items} items from quality sources ({allowlist_pct:.1f}%)")
-            
-            results["quality"] = {
-                "total_items": total_items,
-                "quality_items": quality_items,
-                "allowlist_pct": round(allowlist_pct, 2)
-            }
-
-            # --- Coverage (show unique tickers that had articles, not all active tickers) ---
-            log.debug("Computing coverage KPIs")
-            
-            # Get unique tickers that had articles in the date range
-            result = await conn.execute(
-                text("""
-                SELECT DISTINCT ticker
-                FROM email_items
-                WHERE sent_at BETWEEN :start AND :end
-                """),
-                {"start": start, "end": end}
-            )
-            unique_tickers_with_articles = [row[0] for row in result.fetchall()]
-            total_unique_tickers = len(unique_tickers_with_articles)
-            
-            # Get tickers that have summaries in the date range
-            result = await conn.execute(
-                text("""
-                SELECT DISTINCT ticker
-                FROM summaries
-                WHERE created_at BETWEEN :start AND :end
-                """),
-                {"start": start, "end": end}
-            )
-            covered_tickers = [row[0] for row in result.fetchall()]
-            covered_count = len(covered_tickers)
-            
-            # Calculate percentage (covered / unique tickers with articles)
-            coverage_pct = (covered_count / total_unique_tickers * 100.0) if total_unique_tickers > 0 else 0.0
-            
-            log.info(f"Coverage: {covered_count}/{total_unique_tickers} unique tickers covered ({coverage_pct:.1f}%)")
-            
-            results["coverage"] = {
-                "total_tickers": total_unique_tickers,  # Unique tickers with articles
-                "covered_tickers": covered_count,        # Tickers with summaries
-                "coverage_pct": round(coverage_pct, 1)
-            }
+        # Sections are independent reads. The cheap single-row ones are issued back-to-back
+        # on one connection and the heavier ones get their own, so the fan-out stays within
+        # the engine's default pool (5) instead of opening overflow connections per call.
+        (
+            (delivery, relevance, summaries, quality),
+            (freshness, coverage),
+            (freshness_sent,),
+            (vendor, mttr_result),
+            (mttd_result,),
+        ) = await asyncio.gather(
+            _on_connection(
+                (_delivery, lo, hi),
+                (_relevance, lo, hi),
+                (_summaries, lo, hi),
+                (_quality, lo, hi),
+            ),
+            _on_connection((_freshness, lo, hi), (_coverage, lo, hi)),
+            _on_connection((_freshness_sent, lo, hi)),
+            _on_connection((_vendor, lo, hi), (_compute_mttr, mttd_lo, hi)),
+            _on_connection((_compute_mttd, mttd_lo, hi)),
+        )
 
-            # --- Vendor Performance ---
-            log.debug("Computing vendor performance KPIs")
-            
-            # Add debug query to check total vendor_metrics count
-            result = await conn.execute(
-                text("SELECT COUNT(*) FROM vendor_metrics WHERE created_at BETWEEN :start AND :end"),
-                {"start": start, "end": end}
-            )
-            total_vendor_rows = (result.fetchone())[0]
-            log.debug(f"Total vendor_metrics rows in range: {total_vendor_rows}")
-            
-            result = await conn.execute(
-                text("""
-                SELECT 
-                    provider,
-                    event,
-                    COUNT(*) as total,
-                    SUM(CASE WHEN ok = 1 THEN 1 ELSE 0 END) as successes,
-                    CAST(SUM(CASE WHEN ok = 1 THEN 1 ELSE 0 END) AS FLOAT) * 100.0 / COUNT(*) as success_pct,
-                    AVG(latency_ms) as avg_latency_ms
-                FROM vendor_metrics
-                WHERE created_at BETWEEN :start AND :end
-                GROUP BY provider, event
-                ORDER BY provider, event
-                """),
-                {"start": start, "end": end}
-            )
-            vendor_rows = result.fetchall()
-            
-            log.info(f"compute_kpi_aggregates: found {len(vendor_rows)} vendor metrics (from {total_vendor_rows} total rows)")
-            
-            vendor_agg = []
-            for row in vendor_rows:
-                provider, event, total, successes, success_pct, avg_lat = row
-                vendor_agg.append({
-                    "provider": provider,
-                    "event": event,
-                    "total": int(total),
-                    "successes": int(successes),
-                    "success_pct": round(float(success_pct), 2),  # ← Changed to 2 decimals
-                    "avg_latency_ms": round(float(avg_lat), 2) if avg_lat else 0  # ← Changed to 2 decimals
-                })
-            
-            results["vendor"] = vendor_agg
+        results = {
+            "delivery": delivery,
+            "relevance": relevance,
+            "freshness": freshness,
+            "coverage": coverage,
+            "quality": quality,
+            "vendor": vendor,
+            "freshness_sent": freshness_sent,
+            "summaries": summaries,
+        }
 
-            # --- MTTD (Mean Time To Detect) ---
-            log.debug("Computing MTTD KPIs")
-            
-            # Use last 14 days for MTTD calculation — ensure ISO Z suffix
-            end_dt = datetime.fromisoformat(end.replace('Z', '+00:00'))
-            mttd_start_dt = end_dt - timedelta(days=14)
-            mttd_start = mttd_start_dt.replace(tzinfo=None).isoformat() + "Z"
-            mttd_result = await _compute_mttd(conn, mttd_start, end)
-            
-            results["mttd"] = mttd_result
-            
-            log.info(f"MTTD: {mttd_result.get('avg_minutes')} min avg detection time ({mttd_result.get('failures')} failures, {mttd_result.get('recovered')} recovered)")
+        results["mttd"] = mttd_result
+        log.info(
+            "MTTD: %s min avg detection time (%s failures, %s recovered)",
+            mttd_result.get("avg_minutes"), mttd_result.get("failures"), mttd_result.get("recovered"),
+        )
 
-            # --- MTTR (Mean Time To Resolve) - NEW ---
-            log.debug("Computing MTTR KPIs")
-            
-            # Use same 14-day window for MTTR — ensure ISO Z suffix
-            mttr_start = mttd_start
-            mttr_result = await _compute_mttr(conn, mttr_start, end)
-            
-            # Map mttr_result to the requested JSON shape (avg/minor/major)
-            results["mttr"] = {
-                "avg_minutes": mttr_result.get("avg_minutes"),
-                "minor": mttr_result.get("minor", 0),
-                "major": mttr_result.get("major", 0),
-                "unresolved": mttr_result.get("unresolved", 0),
-                "total_incidents": mttr_result.get("total_incidents", 0),
-            }
-            
-            log.info(
-                f"MTTR: {results['mttr'].get('avg_minutes')} min avg resolution time "
-                f"(minor={results['mttr'].get('minor')}, major={results['mttr'].get('major')}, "
-                f"unresolved={results['mttr'].get('unresolved')})"
-            )
+        # Map mttr_result to the requested JSON shape (avg/minor/major)
+        results["mttr"] = {
+            "avg_minutes": mttr_result.get("avg_minutes"),
+            "minor": mttr_result.get("minor", 0),
+            "major": mttr_result.get("major", 0),
+            "unresolved": mttr_result.get("unresolved", 0),
+            "total_incidents": mttr_result.get("total_incidents", 0),
+        }
+        
+        mttr = results["mttr"]
+        log.info(
+            "MTTR: %s min avg resolution time (minor=%s, major=%s, unresolved=%s)",
+            mttr["avg_minutes"], mttr["minor"], mttr["major"], mttr["unresolved"],
+        )
 
-        total_time = (time.time() - t_start) * 1000
-        log.info(f"kpi_aggregates: TOTAL time {total_time:.0f}ms")
-        log.info("compute_kpi_aggregates: completed successfully with %d vendor metrics", len(results["vendor"]))
+        log.info(
+            "compute_kpi_aggregates: completed in %.0fms with %d vendor metrics",
+            (time.perf_counter_ns() - t_start) / 1e6, len(results["vendor"]),
+        )
         return {
             "ok": True,
             "start": start,
@@ -464,86 +514,40 @@ async def compute_kpi_aggregates(
         }
         
     except Exception as e:
-        log.error(f"kpi_aggregates: ERROR after {(time.time() - t_start)*1000:.0f}ms: {e}", exc_info=True)
-        log.exception("compute_kpi_aggregates: failed")
+        log.exception(
+            "compute_kpi_aggregates: failed after %.0fms: %s", (time.perf_counter_ns() - t_start) / 1e6, e
+        )
         raise
 
 
 async def _compute_avg_age_hours(conn, start: str, end: str) -> float | None:
     """
-    Compute average age of articles in hours (sent_at - published_at).
-    Fallback: if DB returns 0 or None, sample recent rows and compute in Python (handles date formats).
+    Compute average age of articles in hours (sent_at - published_at), entirely in SQL.
+    Returns None when there are no rows or the average is not positive.
     """
-    def _parse_iso(s: str) -> datetime | None:
-        if not s:
-            return None
-        try:
-            return datetime.fromisoformat(s.replace('Z', '+00:00'))
-        except Exception:
-            for fmt in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%d %H:%M:%S"):
-                try:
-                    return datetime.strptime(s, fmt)
-                except Exception:
-                    continue
-        return None
-
     try:
-        result = await conn.execute(
-            text("""
-            SELECT AVG(
-                EXTRACT(EPOCH FROM (sent_at::timestamptz - published_at::timestamptz)) / 3600.0
-            ) AS avg_hours,
+        row = await _fetch_one(
+            conn,
+            text(f"""
+            SELECT AVG({_minutes_between("published_at", "sent_at")} / 60.0) AS avg_hours,
                    COUNT(*) as cnt
             FROM email_items
-            WHERE sent_at BETWEEN :start AND :end 
+            WHERE sent_at >= :start AND sent_at < :end 
               AND published_at IS NOT NULL
             """),
-            {"start": start, "end": end}
+            {"start": start, "end": end},
         )
-        row = result.fetchone()
         db_avg = row[0] if row else None
         db_cnt = row[1] if row else 0
 
-        # If DB produced a positive avg and there are rows, accept it.
         if db_avg is not None and float(db_avg) > 0 and db_cnt > 0:
             return round(float(db_avg), 2)
-
-        # Fallback: sample up to 200 rows and compute in Python to avoid DB date-format edge cases
-        result = await conn.execute(
-            text("""
-            SELECT sent_at, published_at
-            FROM email_items
-            WHERE sent_at BETWEEN :start AND :end
-              AND published_at IS NOT NULL
-            ORDER BY sent_at DESC
-            LIMIT 200
-            """),
-            {"start": start, "end": end}
-        )
-        rows = result.mappings().fetchall()
-        if not rows:
-            return None
-
-        diffs = []
-        for r in rows:
-            sent = r["sent_at"]
-            pub = r["published_at"]
-            sdt = _parse_iso(sent)
-            pdt = _parse_iso(pub)
-            if not sdt or not pdt:
-                continue
-            # compute positive difference in hours (sent - published)
-            diff_h = (sdt - pdt).total_seconds() / 3600.0
-            if diff_h >= 0:
-                diffs.append(diff_h)
-
-        if not diffs:
-            log.debug("_compute_avg_age_hours: sampled rows but no valid diffs found")
-            return None
-
-        avg_h = sum(diffs) / len(diffs)
-        log.debug("_compute_avg_age_hours: fallback computed avg_hours=%.2f from %d samples", avg_h, len(diffs))
-        return round(avg_h, 2)
+        if db_cnt:
+            log.warning(
+                "_compute_avg_age_hours: %d rows but no positive average; bad timestamp formats in "
+                "email_items? (see migrate_normalize_email_items_timestamps)", db_cnt,
+            )
+        return None
 
     except Exception as e:
         log.warning("_compute_avg_age_hours: failed - %s", e)
@@ -565,21 +569,44 @@ async def _compute_mttd(conn, start: str, end: str) -> dict:
     Returns:
         Dictionary with avg_minutes, failures, recovered, and excluded_count
     """
-    from app.core.settings import MTTD_MAX_GAP_MINUTES
+    # One pass over vendor_metrics: a reverse running MIN over the following rows gives
+    # each failure its next success (same provider/event, strictly later — same-instant
+    # successes sort first so they are not "following"). Successes after `end` count.
+    query = f"""
+        WITH ordered AS (
+            SELECT
+                ok,
+                created_at,
+                MIN(CASE WHEN ok = 1 THEN created_at END) OVER (
+                    PARTITION BY provider, event
+                    ORDER BY created_at, ok DESC
+                    ROWS BETWEEN 1 FOLLOWING AND UNBOUNDED FOLLOWING
+                ) AS next_success_at
+            FROM vendor_metrics
+            WHERE created_at >= :start
+        ),
+        gaps AS (
+            SELECT {_minutes_between("created_at", "next_success_at")} AS diff
+            FROM ordered
+            WHERE ok = 0 AND created_at < :end
+        )
+        SELECT
+            COUNT(*) AS failures,
+            AVG(CASE WHEN diff <= :max_gap THEN diff END) AS avg_minutes,
+            SUM(CASE WHEN diff <= :max_gap THEN 1 ELSE 0 END) AS recovered,
+            SUM(CASE WHEN diff > :max_gap THEN 1 ELSE 0 END) AS excluded
+        FROM gaps
+    """
     
     try:
-        # Get all failures in the time range
-        result = await conn.execute(
-            text("""
-            SELECT id, provider, event, created_at
-            FROM vendor_metrics
-            WHERE created_at BETWEEN :start AND :end
-              AND ok = 0
-            ORDER BY provider, event, created_at
-            """),
-            {"start": start, "end": end}
+        failures, avg_minutes, recovered, excluded_long_gaps = await _fetch_one(
+            conn,
+            text(query),
+            {"start": start, "end": end, "max_gap": MTTD_MAX_GAP_MINUTES},
         )
-        failures = result.fetchall()
+        failures = int(failures or 0)
+        recovered = int(recovered or 0)
+        excluded_long_gaps = int(excluded_long_gaps or 0)
         
         if not failures:
             log.info("_compute_mttd: no failures found in range")
@@ -591,77 +618,33 @@ async def _compute_mttd(conn, start: str, end: str) -> dict:
                 "max_gap_minutes": MTTD_MAX_GAP_MINUTES
             }
         
-        detection_times = []
-        excluded_long_gaps = 0
-        
-        for failure in failures:
-            failure_id, provider, event, failure_time = failure
-            
-            # Find next success for same provider/event after this failure
-            result = await conn.execute(
-                text("""
-                SELECT created_at
-                FROM vendor_metrics
-                WHERE provider = :provider
-                  AND event = :event
-                  AND created_at > :failure_time
-                  AND ok = 1
-                ORDER BY created_at ASC
-                LIMIT 1
-                """),
-                {"provider": provider, "event": event, "failure_time": failure_time}
-            )
-            success_row = result.fetchone()
-            
-            if success_row:
-                success_time = success_row[0]
-                
-                # Parse timestamps and compute difference in minutes
-                try:
-                    failure_dt = datetime.fromisoformat(failure_time.replace('Z', '+00:00'))
-                    success_dt = datetime.fromisoformat(success_time.replace('Z', '+00:00'))
-                    diff_minutes = (success_dt - failure_dt).total_seconds() / 60.0
-                    
-                    # Filter out gaps longer than max (likely system downtime)
-                    if diff_minutes <= MTTD_MAX_GAP_MINUTES:
-                        detection_times.append(diff_minutes)
-                        log.debug(f"_compute_mttd: {provider}/{event} recovered in {diff_minutes:.1f} min ✓")
-                    else:
-                        excluded_long_gaps += 1
-                        log.debug(f"_compute_mttd: {provider}/{event} gap {diff_minutes:.1f} min > {MTTD_MAX_GAP_MINUTES} min (excluded)")
-                        
-                except Exception as e:
-                    log.warning(f"_compute_mttd: failed to parse timestamps: {e}")
-                    continue
-        
-        if detection_times:
-            avg_minutes = sum(detection_times) / len(detection_times)
+        if recovered:
             log.info(
-                f"_compute_mttd: avg={avg_minutes:.1f} min from {len(detection_times)} recoveries "
-                f"(out of {len(failures)} failures, {excluded_long_gaps} excluded as > {MTTD_MAX_GAP_MINUTES} min)"
+                "_compute_mttd: avg=%.1f min from %d recoveries (out of %d failures, %d excluded as > %d min)",
+                avg_minutes, recovered, failures, excluded_long_gaps, MTTD_MAX_GAP_MINUTES,
             )
             return {
-                "avg_minutes": round(avg_minutes, 1),
-                "failures": len(failures),
-                "recovered": len(detection_times),
+                "avg_minutes": round(float(avg_minutes), 1),
+                "failures": failures,
+                "recovered": recovered,
                 "excluded": excluded_long_gaps,
                 "max_gap_minutes": MTTD_MAX_GAP_MINUTES
             }
         else:
             log.warning(
-                f"_compute_mttd: {len(failures)} failures but no recoveries within {MTTD_MAX_GAP_MINUTES} min window "
-                f"({excluded_long_gaps} excluded as too long)"
+                "_compute_mttd: %d failures but no recoveries within %d min window (%d excluded as too long)",
+                failures, MTTD_MAX_GAP_MINUTES, excluded_long_gaps,
             )
             return {
                 "avg_minutes": None,
-                "failures": len(failures),
+                "failures": failures,
                 "recovered": 0,
                 "excluded": excluded_long_gaps,
                 "max_gap_minutes": MTTD_MAX_GAP_MINUTES
             }
             
     except Exception as e:
-        log.error(f"_compute_mttd: error: {e}", exc_info=True)
+        log.error("_compute_mttd: error: %s", e, exc_info=True)
         return {
             "avg_minutes": None,
             "failures": 0,
@@ -675,77 +658,36 @@ async def _compute_mttr(conn, start: str, end: str) -> dict:
     """
     Compute MTTR: average resolved duration (minutes) plus counts of minor/major/unresolved.
     Considers incidents where created_at OR resolved_at falls inside [start, end].
+    Durations are computed in SQL; negative ones (bad data) are ignored.
     """
-    def _parse_iso(s: str) -> datetime | None:
-        if not s:
-            return None
-        try:
-            return datetime.fromisoformat(s.replace('Z', '+00:00'))
-        except Exception:
-            # Fallback common formats
-            for fmt in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%d %H:%M:%S"):
-                try:
-                    return datetime.strptime(s, fmt)
-                except Exception:
-                    continue
-        return None
-
     try:
-        # select rows where created_at or resolved_at is in window
-        q = """
-            SELECT id, created_at, resolved_at, provider, event, job_type
-            FROM run_errors
-            WHERE (created_at BETWEEN :start AND :end)
-               OR (resolved_at BETWEEN :start AND :end)
-            ORDER BY created_at DESC
+        q = f"""
+            WITH incidents AS (
+                SELECT
+                    NULLIF(resolved_at, '') AS resolved_at,
+                    {_minutes_between("created_at", "NULLIF(resolved_at, '')")} AS duration
+                FROM run_errors
+                WHERE (created_at >= :start AND created_at < :end)
+                   OR (resolved_at >= :start AND resolved_at < :end)
+            )
+            SELECT
+                COUNT(*) AS total_incidents,
+                AVG(CASE WHEN duration >= 0 THEN duration END) AS avg_minutes,
+                SUM(CASE WHEN duration >= 0 AND duration < 30 THEN 1 ELSE 0 END) AS minor,
+                SUM(CASE WHEN duration >= 30 THEN 1 ELSE 0 END) AS major,
+                SUM(CASE WHEN resolved_at IS NULL THEN 1 ELSE 0 END) AS unresolved
+            FROM incidents
         """
-        result = await conn.execute(text(q), {"start": start, "end": end})
-        rows = result.mappings().fetchall()
-
-        if not rows:
-            return {"avg_minutes": None, "minor": 0, "major": 0, "unresolved": 0, "total_incidents": 0}
-
-        total_incidents = len(rows)
-        resolved_durations = []
-        minor = 0
-        major = 0
-        unresolved = 0
-
-        for row in rows:
-            created_at = row["created_at"]
-            resolved_at = row["resolved_at"]
-
-            if not resolved_at:
-                unresolved += 1
-                continue
-
-            cdt = _parse_iso(created_at)
-            rdt = _parse_iso(resolved_at)
-            if not cdt or not rdt:
-                continue
-
-            duration_minutes = (rdt - cdt).total_seconds() / 60.0
-            if duration_minutes < 0:
-                # skip bad data
-                continue
-
-            resolved_durations.append(duration_minutes)
-            if duration_minutes < 30:
-                minor += 1
-            else:
-                major += 1
-
-        if resolved_durations:
-            avg_minutes = round(sum(resolved_durations) / len(resolved_durations), 1)
-        else:
-            avg_minutes = None
+        total_incidents, avg_minutes, minor, major, unresolved = await _fetch_one(
+            conn, text(q), {"start": start, "end": end}
+        )
 
         return {
-            "avg_minutes": avg_minutes,
-            "minor": minor,
-            "major": major,
-            "unresolved": unresolved,
-            "total_incidents": total_incidents
+            "avg_minutes": round(float(avg_minutes), 1) if avg_minutes is not None else None,
+            "minor": int(minor or 0),
+            "major": int(major or 0),
+            "unresolved": int(unresolved or 0),
+            "total_incidents": int(total_incidents or 0)
         }
 
     except Exception as e:
@@ -757,23 +699,10 @@ async def compute_vendor_metrics(start: str, end: str) -> list[dict]:
     """
     Compute vendor performance metrics.
     """
-    log.info(f"compute_vendor_metrics: querying from {start} to {end}")
+    log.info("compute_vendor_metrics: querying from %s to %s", start, end)
     
     try:
         async with engine.connect() as conn:
-            # Check what event names are actually in the database
-            result = await conn.execute(
-                text("""
-                    SELECT DISTINCT provider, event 
-                    FROM vendor_metrics 
-                    WHERE created_at >= :start AND created_at <= :end
-                    ORDER BY provider, event
-                """),
-                {"start": start, "end": end}
-            )
-            distinct_events = result.fetchall()
-            log.info(f"compute_vendor_metrics: found distinct provider/event pairs: {distinct_events}")
-            
             result = await conn.execute(
                 text("""
                     SELECT 
@@ -784,7 +713,7 @@ async def compute_vendor_metrics(start: str, end: str) -> list[dict]:
                         ROUND(CAST(SUM(CASE WHEN ok = 1 THEN 1 ELSE 0 END) AS FLOAT) * 100.0 / NULLIF(COUNT(*),0), 2) as success_pct,
                         ROUND(AVG(latency_ms)::numeric, 1) as avg_latency_ms
                     FROM vendor_metrics
-                    WHERE created_at >= :start AND created_at <= :end
+                    WHERE created_at >= :start AND created_at < :end
                     GROUP BY provider, event
                     ORDER BY provider, event
                 """),
@@ -792,20 +721,18 @@ async def compute_vendor_metrics(start: str, end: str) -> list[dict]:
             )
             
             rows = result.fetchall()
-            log.info(f"compute_vendor_metrics: returning {len(rows)} vendor metrics")
-            
-            results = []
-            for row in rows:
-                results.append({
-                    "provider": row[0],
-                    "event": row[1],
-                    "total": row[2],
-                    "success": row[3],
-                    "success_pct": row[4],
-                    "avg_latency_ms": row[5]
-                })
+            if log.isEnabledFor(logging.INFO):
+                # the GROUP BY keys are exactly the distinct provider/event pairs
+                log.info(
+                    "compute_vendor_metrics: found distinct provider/event pairs: %s",
+                    [(row[0], row[1]) for row in rows],
+                )
+                log.info("compute_vendor_metrics: returning %d vendor metrics", len(rows))
             
+            # SELECT aliases are the output keys; build each dict in one C-level call
+            keys = tuple(result.keys())
+            results = [dict(zip(keys, row)) for row in rows]
             return results
     except Exception as e:
-        log.error(f"compute_vendor_metrics: error: {e}", exc_info=True)
+        log.error("compute_vendor_metrics: error: %s", e, exc_info=True)
         return []
\ No newline at end of file
@@ -7,18 +7,48 @@ Time-series KPIs with day/week/month bucketing (IST).
 from __future__ import annotations
 from typing import Literal, Dict, Any, List
 import aiosqlite
+import asyncio
 import logging
+import sqlite3
+import time
+import weakref
 
 from app.core.cache import CACHE_DB_PATH
+from app.db.sqlite import apply_pragmas, get_read_pool
 
 log = logging.getLogger("ari.metrics.series")
 
+try:
+    from app.core.config import VENDOR_COSTS
+except ImportError:
+    log.warning("cost_per_item_ts: VENDOR_COSTS not found, using defaults")
+    VENDOR_COSTS = {
+        "scrapingdog": 0.001,
+        "diffbot": 0.002,
+        "sendgrid": 0.0001,
+        "gemini": 0.000085,
+        "openai": 0.0067,
+    }
+
+# VENDOR_COSTS as an inline (provider, cpc) relation so SQLite prices the calls
+if VENDOR_COSTS:
+    _COSTS_CTE = "costs(provider, cpc) AS (VALUES " + ", ".join(["(?, ?)"] * len(VENDOR_COSTS)) + ")"
+    _COSTS_PARAMS = tuple(x for p, c in VENDOR_COSTS.items() for x in (p, float(c or 0)))
+else:
+    _COSTS_CTE = "costs(provider, cpc) AS (SELECT NULL, 0 WHERE 0)"
+    _COSTS_PARAMS = ()
+
 Bucket = Literal["day", "week", "month"]
 
 # IST offset from UTC
 IST_SHIFT = "+5 hours 30 minutes"
 
 
+async def _fetchall(db: aiosqlite.Connection, sql: str, params=()) -> List[tuple]:
+    """Execute and fetch in a single hop through the aiosqlite worker thread."""
+    return list(await db.execute_fetchall(sql, params))
+
+
 def _bucket_expr(bucket: Bucket, col: str) -> str:
     """
     Generate SQL expression for bucketing timestamps into day/week/month.
@@ -46,27 +76,77 @@ def _bucket_expr(bucket: Bucket, col: str) -> str:
         raise ValueError(f"Invalid bucket type: {bucket}")
 
 
-async def rating_ts(
-    db: aiosqlite.Connection, 
-    start: str, 
-    end: str, 
-    bucket: Bucket
-) -> List[Dict[str, Any]]:
+def series_index_ddl() -> List[str]:
     """
-    Get average rating and count over time buckets.
+    Expression indexes matching _bucket_expr for every bucket, so the `{key} BETWEEN`
+    filters and GROUP BY k in this module become index range scans. Trailing columns
+    make them covering for each query's SELECT list.
     """
-    key = _bucket_expr(bucket, "created_at")
-    
-    # Check if email_feedback table exists
+    targets = [
+        ("elogs", "email_logs", "sent_at", "ok, items_count"),
+        ("vm", "vendor_metrics", "created_at", "provider"),
+        ("email_feedback", "email_feedback", "created_at", "rating"),
+        ("ee_feedback", "email_events", "created_at", "event_type, rating"),
+    ]
+    return [
+        f"CREATE INDEX IF NOT EXISTS idx_{name}_{bucket} ON {table}({_bucket_expr(bucket, col)}, {extra})"
+        for name, table, col, extra in targets
+        for bucket in ("day", "week", "month")
+    ]
+
+
+def _day_bucket_expr(bucket: Bucket, day_col: str) -> str:
+    """
+    Same buckets as _bucket_expr, from a stored 'YYYY-MM-DD' column (e.g.
+    vendor_metrics.created_day): day and month need no timestamp parsing at all.
+    """
+    if bucket == "day":
+        return day_col
+    elif bucket == "week":
+        return f"strftime('%Y-W%W', {day_col})"
+    elif bucket == "month":
+        return f"substr({day_col}, 1, 7)"
+    else:
+        raise ValueError(f"Invalid bucket type: {bucket}")
+
+
+# connections already seen with vendor_metrics.created_day (set up by app.core.metrics)
+_VM_DAY_CONNS: "weakref.WeakSet[aiosqlite.Connection]" = weakref.WeakSet()
+
+
+async def _has_vendor_day(db: aiosqlite.Connection) -> bool:
+    if db in _VM_DAY_CONNS:
+        return True
+    cols = await _fetchall(db, "PRAGMA table_info(vendor_metrics)")
+    if any(c[1] == "created_day" for c in cols):
+        _VM_DAY_CONNS.add(db)
+        return True
+    return False
+
+
+# connections already seen with an email_feedback table; only a positive answer is
+# remembered, so a table created later is still picked up
+_FEEDBACK_CONNS: "weakref.WeakSet[aiosqlite.Connection]" = weakref.WeakSet()
+
+
+async def _has_feedback_table(db: aiosqlite.Connection) -> bool:
+    if db in _FEEDBACK_CONNS:
+        return True
     try:
-        cursor = await db.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='email_feedback'")
-        has_feedback_table = await cursor.fetchone() is not None
-        await cursor.close()
+        found = bool(await _fetchall(
+            db, "SELECT name FROM sqlite_master WHERE type='table' AND name='email_feedback'"
+        ))
     except Exception:
-        has_feedback_table = False
-    
-    if has_feedback_table:
-        sql = f"""
+        return False
+    if found:
+        _FEEDBACK_CONNS.add(db)
+    return found
+
+
+def _rating_sql(bucket: Bucket, table: str) -> str:
+    key = _bucket_expr(bucket, "created_at")
+    if table == "email_feedback":
+        return f"""
         SELECT 
             {key} AS k, 
             AVG(CAST(rating AS REAL)) AS avg_rating, 
@@ -76,9 +156,7 @@ async def rating_ts(
         GROUP BY k 
         ORDER BY k
         """
-        params = (start, end)
-    else:
-        sql = f"""
+    return f"""
         SELECT 
             {key} AS k,
             AVG(CAST(rating AS REAL)) AS avg_rating,
@@ -90,12 +168,23 @@ async def rating_ts(
         GROUP BY k 
         ORDER BY k
         """
-        params = (start, end)
+
+
+async def rating_ts(
+    db: aiosqlite.Connection, 
+    start: str, 
+    end: str, 
+    bucket: Bucket
+) -> List[Dict[str, Any]]:
+    """
+    Get average rating and count over time buckets.
+    """
+    table = "email_feedback" if await _has_feedback_table(db) else "email_events"
+    sql = _SQL[("rating", bucket, table)]
+    params = (start, end)
     
     try:
-        cur = await db.execute(sql, params)
-        rows = await cur.fetchall()
-        await cur.close()
+        rows = await _fetchall(db, sql, params)
         
         result = [
             {
@@ -113,6 +202,44 @@ async def rating_ts(
         return []
 
 
+def _vendor_cost_sql(bucket: Bucket, vendor_day: bool) -> str:
+    if vendor_day:
+        k_metrics = _day_bucket_expr(bucket, "created_day")
+    else:
+        k_metrics = _bucket_expr(bucket, "created_at")
+    # the cost is priced in SQL against the VALUES relation, so one row per bucket comes back
+    return f"""
+            WITH {_COSTS_CTE}
+            SELECT v.k, SUM(v.c * COALESCE(costs.cpc, 0.0))
+            FROM (
+                SELECT 
+                    {k_metrics} AS k, 
+                    provider, 
+                    COUNT(*) AS c
+                FROM vendor_metrics
+                WHERE {k_metrics} BETWEEN ? AND ?
+                  AND {k_metrics} IS NOT NULL
+                GROUP BY k, provider
+            ) v
+            LEFT JOIN costs ON costs.provider = v.provider
+            GROUP BY v.k
+            """
+
+
+def _delivered_items_sql(bucket: Bucket) -> str:
+    k_emails = _bucket_expr(bucket, "sent_at")
+    return f"""
+            SELECT 
+                {k_emails} AS k, 
+                COALESCE(SUM(items_count), 0) AS delivered_items
+            FROM email_logs
+            WHERE ok=1 
+              AND {k_emails} BETWEEN ? AND ?
+              AND {k_emails} IS NOT NULL
+            GROUP BY k 
+            """
+
+
 async def cost_per_item_ts(
     db: aiosqlite.Connection, 
     start: str, 
@@ -120,82 +247,32 @@ async def cost_per_item_ts(
     bucket: Bucket
 ) -> List[Dict[str, Any]]:
     """Calculate cost per item over time buckets."""
-    k_metrics = _bucket_expr(bucket, "created_at")
-    k_emails = _bucket_expr(bucket, "sent_at")
+    cost_sql = _SQL[("vendor_cost", bucket, await _has_vendor_day(db))]
     
     log.debug(f"cost_per_item_ts: querying from {start} to {end}")
     
-    # Import VENDOR_COSTS
-    try:
-        from app.core.config import VENDOR_COSTS
-    except ImportError:
-        log.warning("cost_per_item_ts: VENDOR_COSTS not found, using defaults")
-        VENDOR_COSTS = {
-            "scrapingdog": 0.001,
-            "diffbot": 0.002,
-            "sendgrid": 0.0001,
-            "gemini": 0.000085,
-            "openai": 0.0067,
-        }
-    
-    # 1) Get vendor costs by bucket
-    try:
-        cur = await db.execute(
-            f"""
-            SELECT 
-                {k_metrics} AS k, 
-                provider, 
-                COUNT(*) AS c
-            FROM vendor_metrics
-            WHERE {k_metrics} BETWEEN ? AND ?
-              AND {k_metrics} IS NOT NULL
-            GROUP BY k, provider
-            ORDER BY k
-            """,
-            (start, end)
-        )
-        rows = await cur.fetchall()
-        await cur.close()
-        
-        cost_map: Dict[str, float] = {}
-        for k, provider, c in rows:
-            if k:  # Skip NULL buckets
-                per_call = VENDOR_COSTS.get(provider, 0.0)
-                cost_map[k] = cost_map.get(k, 0.0) + (per_call * c)
-        
+    # 1) Vendor cost and delivered items by bucket. Two independent reads, each with its
+    #    own fallback: a failure in one half still returns the other's buckets.
+    cost_rows, items_rows = await asyncio.gather(
+        _fetchall(db, cost_sql, _COSTS_PARAMS + (start, end)),
+        _fetchall(db, _SQL[("delivered_items", bucket)], (start, end)),
+        return_exceptions=True,
+    )
+    cost_map: Dict[str, float] = {}
+    if isinstance(cost_rows, BaseException):
+        log.error("cost_per_item_ts: failed to compute costs - %s", cost_rows, exc_info=cost_rows)
+    else:
+        cost_map = {k: c for k, c in cost_rows if k}  # Skip NULL buckets
         log.debug(f"cost_per_item_ts: cost_map = {cost_map}")
-        
-    except Exception as e:
-        log.error("cost_per_item_ts: failed to compute costs - %s", e, exc_info=True)
-        cost_map = {}
     
-    # 2) Get delivered items by bucket
-    try:
-        cur = await db.execute(
-            f"""
-            SELECT 
-                {k_emails} AS k, 
-                COALESCE(SUM(items_count), 0) AS delivered_items
-            FROM email_logs
-            WHERE ok=1 
-              AND {k_emails} BETWEEN ? AND ?
-              AND {k_emails} IS NOT NULL
-            GROUP BY k 
-            ORDER BY k
-            """,
-            (start, end)
-        )
-        items_rows = await cur.fetchall()
-        await cur.close()
-        
+    items_map: Dict[str, int] = {}
+    if isinstance(items_rows, BaseException):
+        log.error("cost_per_item_ts: failed to compute delivered items - %s", items_rows, exc_info=items_rows)
+    else:
         items_map = {k: di for k, di in items_rows if k}  # Skip NULL buckets
         log.debug(f"cost_per_item_ts: items_map = {items_map}")
-        
-    except Exception as e:
-        log.error("cost_per_item_ts: failed to compute delivered items - %s", e, exc_info=True)
-        items_map = {}
     
-    # 3) Join cost and items - show ALL dates with activity
+    # 2) Join cost and items - show ALL dates with activity
     all_buckets = sorted(set(list(cost_map.keys()) + list(items_map.keys())))
     out = []
     
@@ -221,6 +298,37 @@ async def cost_per_item_ts(
     return out
 
 
+def _send_success_sql(bucket: Bucket) -> str:
+    k = _bucket_expr(bucket, "sent_at")
+    return f"""
+            SELECT 
+                {k} AS k,
+                COUNT(*) AS total,
+                SUM(COALESCE(ok, 0)) AS success
+            FROM email_logs
+            WHERE {k} BETWEEN ? AND ?
+              AND {k} IS NOT NULL
+            GROUP BY k 
+            ORDER BY k
+            """
+
+
+def _send_success_rows(rows) -> List[Dict[str, Any]]:
+    # ok is a nullable 0/1 column (DEFAULT 1); the SQL counts NULL as a failure so
+    # success is never NULL. NULL buckets are already excluded by the WHERE clause
+    out = [
+        {
+            "bucket": k,
+            "total": total,
+            "success": success,
+            "success_rate": round((success / total) * 100.0, 2) if total > 0 else 0.0,
+        }
+        for k, total, success in rows
+    ]
+    log.info(f"send_success_ts: returning {len(out)} buckets: {[o['bucket'] for o in out]}")
+    return out
+
+
 async def send_success_ts(
     db: aiosqlite.Connection, 
     start: str, 
@@ -228,47 +336,71 @@ async def send_success_ts(
     bucket: Bucket
 ) -> List[Dict[str, Any]]:
     """Calculate email send success rate over time buckets."""
-    k = _bucket_expr(bucket, "sent_at")
-    
     log.debug(f"send_success_ts: querying from {start} to {end}")
     
     try:
-        cur = await db.execute(
-            f"""
-            SELECT 
-                {k} AS k,
-                COUNT(*) AS total,
-                SUM(CASE WHEN ok=1 THEN 1 ELSE 0 END) AS success
-            FROM email_logs
-            WHERE {k} BETWEEN ? AND ?
-              AND {k} IS NOT NULL
-            GROUP BY k 
-            ORDER BY k
-            """,
-            (start, end)
-        )
-        rows = await cur.fetchall()
-        await cur.close()
+        rows = await _fetchall(db, _SQL[("send_success", bucket)], (start, end))
+        return _send_success_rows(rows)
         
-        out = []
-        for k, total, success in rows:
-            if k:  # Skip NULL buckets
-                success_rate = round((success / total) * 100.0, 2) if total > 0 else 0.0
-                out.append({
-                    "bucket": k,
-                    "total": total,
-                    "success": success,
-                    "success_rate": success_rate
-                })
-        
-        log.info(f"send_success_ts: returning {len(out)} buckets: {[o['bucket'] for o in out]}")
-        return out
+    except Exception as e:
+        log.error("send_success_ts: failed to compute - %s", e, exc_info=True)
+        return []
+
+
+def send_success_ts_sync(
+    db_path: str, 
+    start: str, 
+    end: str, 
+    bucket: Bucket
+) -> List[Dict[str, Any]]:
+    """
+    Blocking sibling of send_success_ts on a plain sqlite3 connection. A single query
+    needs no aiosqlite worker thread; callers run it via asyncio.to_thread.
+    """
+    log.debug(f"send_success_ts: querying from {start} to {end}")
+    
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            apply_pragmas(conn, read=True)
+            rows = conn.execute(_SQL[("send_success", bucket)], (start, end)).fetchall()
+        finally:
+            conn.close()
+        return _send_success_rows(rows)
         
     except Exception as e:
         log.error("send_success_ts: failed to compute - %s", e, exc_info=True)
         return []
 
 
+# Every query text is built once at import, keyed by (metric, bucket[, variant]), so
+# per-call work is a dict lookup and the text is identical between calls (sqlite3's
+# per-connection statement cache reuses the prepared statement).
+_BUCKETS = ("day", "week", "month")
+_SQL: Dict[tuple, str] = {
+    **{("rating", b, t): _rating_sql(b, t) for b in _BUCKETS for t in ("email_feedback", "email_events")},
+    **{("vendor_cost", b, d): _vendor_cost_sql(b, d) for b in _BUCKETS for d in (True, False)},
+    **{("delivered_items", b): _delivered_items_sql(b) for b in _BUCKETS},
+    **{("send_success", b): _send_success_sql(b) for b in _BUCKETS},
+}
+
+
+# (metric, start, end, bucket, db_path, epoch) -> (computed_at monotonic, points).
+# Writers that change the underlying tables call bump_series_epoch() so warm entries
+# stop matching immediately instead of waiting out the TTL.
+_TS_CACHE: Dict[tuple, tuple] = {}
+_TS_TTL = 60.0
+_TS_CACHE_MAX = 256
+_CACHE_EPOCH = 0
+
+
+def bump_series_epoch() -> None:
+    """Invalidate every cached series (call after pipeline writes)."""
+    global _CACHE_EPOCH
+    _CACHE_EPOCH += 1
+    _TS_CACHE.clear()
+
+
 async def compute_series(
     metric: str, 
     start: str, 
@@ -292,13 +424,30 @@ async def compute_series(
     if not db_path:
         db_path = CACHE_DB_PATH
     
+    key = (metric, start, end, bucket, db_path, _CACHE_EPOCH)
+    hit = _TS_CACHE.get(key)
+    if hit and time.monotonic() - hit[0] < _TS_TTL:
+        return hit[1]
+    
+    result = await _compute_series(metric, start, end, bucket, db_path)
+    if len(_TS_CACHE) >= _TS_CACHE_MAX:
+        # drop the oldest entry; insertion order tracks computed_at
+        _TS_CACHE.pop(next(iter(_TS_CACHE)), None)
+    _TS_CACHE.pop(key, None)
+    _TS_CACHE[key] = (time.monotonic(), result)
+    return result
+
+
+async def _compute_series(metric: str, start: str, end: str, bucket: str, db_path: str) -> list[dict]:
     log.info(f"compute_series: metric={metric} from {start} to {end} (bucket={bucket})")
     
     try:
-        async with aiosqlite.connect(db_path) as db:
-            if metric == "send_success":
-                return await send_success_ts(db, start, end, bucket)
-            elif metric == "rating":
+        if metric == "send_success":
+            # hottest dashboard path: one query, so skip the aiosqlite thread + connection
+            return await asyncio.to_thread(send_success_ts_sync, db_path, start, end, bucket)
+        # long-lived pooled read connections (closed by close_shared_dbs on shutdown)
+        async with get_read_pool(db_path).acquire() as db:
+            if metric == "rating":
                 return await rating_ts(db, start, end, bucket)
             elif metric == "cost_per_item":
                 return await cost_per_item_ts(db, start, end, bucket)
@@ -308,4 +457,20 @@ async def compute_series(
     
     except Exception as e:
         log.error(f"compute_series: failed to compute {metric} - %s", e, exc_info=True)
-        return []
\ No newline at end of file
+        return []
+
+
+async def compute_series_batch(
+    metrics: List[str], 
+    start: str, 
+    end: str, 
+    bucket: str = "day",
+    db_path: str | None = None
+) -> Dict[str, list]:
+    """
+    Compute several metrics concurrently. Each runs on its own pooled read connection
+    (WAL readers do not block each other) and they hit different tables, so the
+    wall-clock is the slowest metric rather than the sum.
+    """
+    results = await asyncio.gather(*(compute_series(m, start, end, bucket, db_path) for m in metrics))
+    return dict(zip(metrics, results))
@@ -1,6 +1,7 @@
 import os
 import sqlite3
 import logging
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
@@ -9,6 +10,8 @@ log = logging.getLogger("ari.metrics")
 
 # module-level memo to avoid re-running index creation too often
 _last_index_run_date: Optional[datetime.date] = None
+# serializes the first run of the day; the memo check itself stays lock-free
+_index_lock = threading.Lock()
 _METRICS_JSON_SUFFIX = ".metrics.json"
 _FALLBACK_CACHE_DB = str(Path(__file__).resolve().parent.parent / "cache.db")
 
@@ -24,7 +27,9 @@ def _resolve_cache_db_path() -> str:
 
 def ensure_metrics_index() -> None:
     """
-    Ensure sqlite metrics table and composite index on (timestamp, event, provider).
+    Ensure sqlite metrics table and composite index on (timestamp, event, provider),
+    plus the bucket expression indexes used by the time-series queries.
+    Also switches the cache DB to WAL (persistent) with the shared pragmas.
     Does not perform any deletion/retention.
     """
     try:
@@ -33,6 +38,9 @@ def ensure_metrics_index() -> None:
             return
         conn = sqlite3.connect(cache_db, timeout=5)
         try:
+            # journal_mode=WAL persists in the file: dashboard readers stop blocking writers
+            from app.db.sqlite import apply_pragmas
+            apply_pragmas(conn)
             cur = conn.cursor()
             cur.execute(
                 """
@@ -50,6 +58,15 @@ def ensure_metrics_index() -> None:
             )
             conn.commit()
             log.info("metrics: ensured index idx_metrics_day")
+
+            # bucketed dashboard series (app.metrics.series); a missing table only skips its own index
+            from app.metrics.series import series_index_ddl
+            for ddl in series_index_ddl():
+                try:
+                    cur.execute(ddl)
+                except sqlite3.Error as e:
+                    log.debug("metrics: skipped series index (%s)", e)
+            conn.commit()
         finally:
             conn.close()
     except Exception:
@@ -58,14 +75,19 @@ def ensure_metrics_index() -> None:
 
 def ensure_metrics_index_once_per_day() -> None:
     """
-    Run ensure_metrics_index at most once per UTC day (best-effort memoization).
+    Run ensure_metrics_index at most once per UTC day. Concurrent first callers
+    (scheduler thread + request handlers) wait on a lock instead of each issuing the
+    DDL and contending for sqlite's write lock.
     """
     global _last_index_run_date
     today = datetime.now(tz=timezone.utc).date()
     if _last_index_run_date == today:
         return
-    ensure_metrics_index()
-    _last_index_run_date = today
+    with _index_lock:
+        if _last_index_run_date == today:
+            return
+        ensure_metrics_index()
+        _last_index_run_date = today
 
 
 def record_metric(event: str, provider: str, latency_ms: int, ok: bool) -> None:
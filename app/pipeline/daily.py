@@ -1,14 +1,21 @@
 from __future__ import annotations
 from typing import Dict, List, Any
+import asyncio
 import logging
+import os
 
 from app.core.cache import CACHE_DB_PATH
 from app.db.users import get_unique_active_tickers, get_user_tickers_map
 from app.email.brief import send_brief_email
+from app.metrics.series import bump_series_epoch
 from app.core.settings import settings
 
 log = logging.getLogger("ari.pipeline")
 
+# max tickers in fetch->extract->summarize at once / max concurrent brief emails
+FANOUT_CONCURRENCY = max(1, int(os.getenv("FANOUT_CONCURRENCY", "4")))
+FANOUT_EMAIL_CONCURRENCY = max(1, int(os.getenv("FANOUT_EMAIL_CONCURRENCY", "4")))
+
 
 async def run_daily_fanout(max_items_per_ticker: int = 5) -> Dict[str, Any]:
     """
@@ -24,46 +31,66 @@ async def run_daily_fanout(max_items_per_ticker: int = 5) -> Dict[str, Any]:
     tickers = get_unique_active_tickers(CACHE_DB_PATH)
     log.info("fanout: unique tickers=%s", tickers)
 
-    # 2) Per-ticker pipeline (deduped)
-    did = {"fetch": 0, "extract": 0, "summarize": 0, "emails": 0}
+    # 2) Per-ticker pipeline (deduped); tickers run concurrently, steps stay ordered per ticker
+    ticker_sem = asyncio.Semaphore(FANOUT_CONCURRENCY)
+
+    async def _per_ticker(t: str) -> Dict[str, int]:
+        done = {"fetch": 0, "extract": 0, "summarize": 0}
+        async with ticker_sem:
+            # Step 1: Fetch news articles from ScrapingDog
+            try:
+                await job_fetch(ticker=t, max_items=getattr(settings, "NEWS_TOPK", 10))
+                done["fetch"] = 1
+                log.info("fanout: fetch completed for ticker=%s", t)
+            except Exception as e:
+                log.exception("fanout: fetch failed ticker=%s error=%s", t, e)
+
+            # Step 2: Extract content using Diffbot
+            try:
+                await job_extract(ticker=t)
+                done["extract"] = 1
+                log.info("fanout: extract completed for ticker=%s", t)
+            except Exception as e:
+                log.exception("fanout: extract failed ticker=%s error=%s", t, e)
 
-    for t in tickers:
-        # Step 1: Fetch news articles from ScrapingDog
-        try:
-            await job_fetch(ticker=t, max_items=getattr(settings, "NEWS_TOPK", 10))
-            did["fetch"] += 1
-            log.info(f"fanout: fetch completed for ticker={t}")
-        except Exception as e:
-            log.exception("fanout: fetch failed ticker=%s error=%s", t, e)
-
-        # Step 2: Extract content using Diffbot ✅ THIS WAS MISSING!
-        try:
-            await job_extract(ticker=t)
-            did["extract"] += 1
-            log.info(f"fanout: extract completed for ticker={t}")
-        except Exception as e:
-            log.exception("fanout: extract failed ticker=%s error=%s", t, e)
-
-        # Step 3: Summarize with LLM
-        try:
-            await job_summarize(tickers=[t])
-            did["summarize"] += 1
-            log.info(f"fanout: summarize completed for ticker={t}")
-        except Exception as e:
-            log.exception("fanout: summarize failed ticker=%s error=%s", t, e)
+            # Step 3: Summarize with LLM
+            try:
+                await job_summarize(tickers=[t])
+                done["summarize"] = 1
+                log.info("fanout: summarize completed for ticker=%s", t)
+            except Exception as e:
+                log.exception("fanout: summarize failed ticker=%s error=%s", t, e)
+        return done
+
+    did = {"fetch": 0, "extract": 0, "summarize": 0, "emails": 0}
+    for res in await asyncio.gather(*[_per_ticker(t) for t in tickers], return_exceptions=True):
+        if isinstance(res, BaseException):
+            log.error("fanout: ticker pipeline crashed error=%s", res)
+            continue
+        for step, n in res.items():
+            did[step] += n
 
     # 3) Fan-out emails (read per user tickers and send one email each)
     user_map = get_user_tickers_map(CACHE_DB_PATH)
-    log.info(f"fanout: sending emails to {len(user_map)} users")
+    log.info("fanout: sending emails to %d users", len(user_map))
+    email_sem = asyncio.Semaphore(FANOUT_EMAIL_CONCURRENCY)
+
+    async def _per_user(email: str, user_tickers: List[str]) -> int:
+        async with email_sem:
+            try:
+                # send_brief_email already knows how to assemble summaries by ticker
+                ok = await send_brief_email(email=email, tickers=user_tickers)
+                log.info("fanout: email sent to %s ok=%s", email, ok)
+                return 1 if ok else 0
+            except Exception as e:
+                log.exception("fanout: email failed email=%s error=%s", email, e)
+                return 0
+
+    sent = await asyncio.gather(*[_per_user(e, ut) for e, ut in user_map.items()], return_exceptions=True)
+    did["emails"] = sum(n for n in sent if isinstance(n, int))
 
-    for email, user_tickers in user_map.items():
-        try:
-            # send_brief_email already knows how to assemble summaries by ticker
-            ok = await send_brief_email(email=email, tickers=user_tickers)
-            did["emails"] += 1 if ok else 0
-            log.info(f"fanout: email sent to {email} ok={ok}")
-        except Exception as e:
-            log.exception("fanout: email failed email=%s error=%s", email, e)
+    # new summaries/emails/vendor calls landed: drop cached dashboard series
+    bump_series_epoch()
 
     log.info("fanout: done %s", did)
-    return {"ok": True, "tickers": tickers, **did}
\ No newline at end of file
+    return {"ok": True, "tickers": tickers, **did}
@@ -1,6 +1,5 @@
 from __future__ import annotations
 import os
-import random
 import asyncio
 from typing import List, Dict, Any
 
@@ -14,8 +13,6 @@ except Exception:
     cache_upsert_items = None
     cache_get_by_ticker = None
 
-STAGGER_BASE_MS = int(os.getenv("STAGGER_BASE_MS", "250"))
-STAGGER_JITTER_MS = int(os.getenv("STAGGER_JITTER_MS", "250"))
 PREFETCH_CONCURRENCY = int(os.getenv("PREFETCH_CONCURRENCY", "2"))
 
 
@@ -44,32 +41,32 @@ async def prefetch_brief_and_cache(app: Any, ticker: str) -> Dict[str, Any]:
     """
     # local imports to avoid circulars
     from app.core.cache import cache_upsert_items
-    from app.ingest.news import fetch_news_for_ticker as _fetch_news_sync
+    from app.ingest.news import fetch_news_for_ticker as _fetch_news_async
     from app.core.services import get_filings_for as _get_filings_async
 
-    # fetch news (may be sync) in thread
-    try:
-        news = await asyncio.to_thread(_fetch_news_sync, ticker) or []
-    except Exception as e:
-        print(f"[prefetch] error fetching news for {ticker}: {e}")
+    # news and filings are independent I/O: fetch both at once
+    news, filings = await asyncio.gather(
+        _fetch_news_async(ticker), _get_filings_async(ticker), return_exceptions=True
+    )
+    if isinstance(news, BaseException):
+        print(f"[prefetch] error fetching news for {ticker}: {news}")
         news = []
-
-    # fetch filings (async)
-    try:
-        filings = await _get_filings_async(ticker)
-    except Exception as e:
-        print(f"[prefetch] error fetching filings for {ticker}: {e}")
+    if isinstance(filings, BaseException):
+        print(f"[prefetch] error fetching filings for {ticker}: {filings}")
         filings = []
+    news = news or []
+    filings = filings or []
 
-    # upsert into cache if available
+    # upsert into cache if available (each call opens its own connection)
     if cache_upsert_items:
-        try:
-            if news:
-                await cache_upsert_items(news, kind="news", ticker=ticker)
-            if filings:
-                await cache_upsert_items(filings, kind="filings", ticker=ticker)
-        except Exception as e:
-            print(f"[prefetch] cache upsert warn ({ticker}): {e}")
+        upserts = []
+        if news:
+            upserts.append(cache_upsert_items(news, kind="news", ticker=ticker))
+        if filings:
+            upserts.append(cache_upsert_items(filings, kind="filings", ticker=ticker))
+        for res in await asyncio.gather(*upserts, return_exceptions=True):
+            if isinstance(res, BaseException):
+                print(f"[prefetch] cache upsert warn ({ticker}): {res}")
 
     return {"ticker": ticker, "news": len(news), "filings": len(filings)}
 
@@ -77,33 +74,27 @@ async def prefetch_brief_and_cache(app: Any, ticker: str) -> Dict[str, Any]:
 async def run_daily_prefetch(tickers: List[str]) -> None:
     """
     Prefetch news + filings per ticker and optionally upsert into cache.
-    Runs under APScheduler. Uses a bounded concurrency semaphore and staggers starts.
+    Runs under APScheduler. The semaphore alone bounds concurrency; there is no start
+    stagger (vendor calls share the pooled HTTP client and its connection limits).
     """
     if not tickers:
         print("[scheduler] no tickers configured; skipping")
         return
 
     sem = asyncio.Semaphore(PREFETCH_CONCURRENCY)
-    tasks: List[asyncio.Task] = []
 
     async def worker(ticker: str) -> None:
-        await sem.acquire()
-        try:
-            delay_ms = STAGGER_BASE_MS + random.randint(0, STAGGER_JITTER_MS)
-            await asyncio.sleep(delay_ms / 1000.0)
+        async with sem:
             try:
                 res = await prefetch_brief_and_cache(None, ticker)
-                print(f"[prefetch] t={ticker} delay={delay_ms}ms news={res.get('news',0)} filings={res.get('filings',0)}")
+                print(f"[prefetch] t={ticker} news={res.get('news',0)} filings={res.get('filings',0)}")
             except Exception as e:
                 print(f"[prefetch] t={ticker} failed: {e}")
-        finally:
-            sem.release()
 
     print(f"[scheduler] prefetch start for {tickers} (concurrency={PREFETCH_CONCURRENCY})")
-    for t in tickers:
-        tasks.append(asyncio.create_task(worker(t)))
-    # wait for all workers
-    await asyncio.gather(*tasks)
+    async with asyncio.TaskGroup() as tg:
+        for t in tickers:
+            tg.create_task(worker(t))
     print("[scheduler] prefetch done")
 
 
@@ -136,7 +127,7 @@ async def run_prefetch(app: Any, tickers: List[str] | None = None) -> Dict[str,
                 results[t] = {"ticker": t, "news": news_n, "filings": filings_n, "cached": True}
             else:
                 # If cache layer not available, attempt a lightweight fetch to report counts
-                news = fetch_news_for_ticker(t) or []
+                news = await fetch_news_for_ticker(t) or []
                 filings = await get_filings_for(t)
                 results[t] = {"ticker": t, "news": len(news), "filings": len(filings), "cached": False}
         except Exception as e:
@@ -80,14 +80,22 @@ async def schedule_jobs(app: Any) -> None:
         await asyncio.sleep(delay)
         tk = tickers or default_tickers
         results: Dict[str, Any] = {"requested": tk, "ok": [], "failed": [], "counts": {}}
-        for t in tk:
+        # every ticker's batches share summarize_job's global LLM semaphore
+        # (LLM_GLOBAL_CONCURRENCY), so tickers themselves are not bounded here
+        async def _one(t: str) -> Any:
             try:
-                res = await summarize_cached_and_upsert(app, t)
-                results["ok"].append(t)
-                results["counts"][t] = int(res.get("summarized", 0))
+                return await summarize_cached_and_upsert(app, t)
             except Exception as e:
-                results["failed"].append({"symbol": t, "error": str(e)})
+                return e
+
+        # gather keeps ticker order, so the fold below matches the old serial output
+        for t, res in zip(tk, await asyncio.gather(*[_one(t) for t in tk])):
+            if isinstance(res, Exception):
+                results["failed"].append({"symbol": t, "error": str(res)})
                 results["counts"][t] = 0
+            else:
+                results["ok"].append(t)
+                results["counts"][t] = int(res.get("summarized", 0))
         return results
 
     # schedule jobs
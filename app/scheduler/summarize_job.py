@@ -1,41 +1,169 @@
 from __future__ import annotations
 import os
 import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
 
+import aiosqlite
+
 from app.summarize.llm import summarize_items
-from app.core.cache import cache_get_missing_items_for_summary, cache_upsert_summaries
+from app.core.cache import CACHE_DB_PATH, cache_get_missing_items_for_summary, cache_upsert_summaries
+
+log = logging.getLogger("ari.scheduler.summarize")
 
 SUMMARIZE_MAX_PER_TICKER = int(os.getenv("SUMMARIZE_MAX_PER_TICKER", "6"))
 SUMMARIZE_MIN_CHARS = int(os.getenv("SUMMARIZE_MIN_CHARS", "500"))
-OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+# one LLM call per ticker unless the article text is this large; then it is split in two
+SUMMARIZE_SINGLE_CALL_MAX_CHARS = int(os.getenv("SUMMARIZE_SINGLE_CALL_MAX_CHARS", "24000"))
+# LLM calls in flight across every ticker and batch: one chokepoint for the provider's
+# rate limit instead of nested per-ticker x per-batch semaphores
+LLM_GLOBAL_CONCURRENCY = max(1, int(os.getenv("LLM_GLOBAL_CONCURRENCY", "4")))
+
+_LLM_SEM: Optional[asyncio.Semaphore] = None
+_LLM_SEM_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _llm_semaphore() -> asyncio.Semaphore:
+    """Process-wide LLM semaphore, rebuilt when called from a new event loop (scripts)."""
+    global _LLM_SEM, _LLM_SEM_LOOP
+    loop = asyncio.get_running_loop()
+    if _LLM_SEM is None or _LLM_SEM_LOOP is not loop:
+        _LLM_SEM = asyncio.Semaphore(LLM_GLOBAL_CONCURRENCY)
+        _LLM_SEM_LOOP = loop
+    return _LLM_SEM
 
 
-async def summarize_cached_and_upsert(app, ticker: str) -> Dict[str, Any]:
+def _plan_batches(items: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    All items in a single prompt (shared system preamble, one round trip); the prompt
+    already asks for one url-tagged item per article. Oversized inputs fall back to two
+    halves, which run concurrently.
+    """
+    chars = sum(len(it.get("translated_text") or "") for it in items)
+    if len(items) < 2 or chars <= SUMMARIZE_SINGLE_CALL_MAX_CHARS:
+        return [items]
+    mid = (len(items) + 1) // 2
+    return [items[:mid], items[mid:]]
+
+
+def _map_results(
+    ticker: str,
+    results: List[Dict[str, Any]],
+    url_map: Dict[str, Dict[str, Any]],
+    title_pub_map: Dict[tuple, Dict[str, Any]],
+) -> tuple:
+    """
+    Map LLM outputs back to url_hash; returns (cache_upsert_summaries rows, skipped count).
+    The prompt returns `summary`; it is stored as why_it_matters.
+    """
+    created_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    parsed_upserts: List[Dict[str, Any]] = []
+    skipped = 0
+    for r in results:
+        # try match by url first
+        url = r.get("url", "") or ""
+        orig = url_map.get(url)
+        if not orig:
+            # fallback to title+published_at
+            key = (r.get("title", "") or "").strip(), r.get("published_at", "") or ""
+            orig = title_pub_map.get(key)
+        if not orig:
+            # unable to map; skip
+            log.warning("summarize_job: unable to map LLM result for %s (title=%r)", ticker, r.get("title"))
+            skipped += 1
+            continue
+
+        url_hash = orig.get("url_hash") or ""
+        if not url_hash:
+            log.warning("summarize_job: missing url_hash for %s, skipping upsert", orig.get("url"))
+            skipped += 1
+            continue
+
+        parsed_upserts.append({
+            "item_url_hash": url_hash,
+            "ticker": ticker.upper(),
+            "title": r.get("title") or orig.get("title", ""),
+            "why_it_matters": r.get("why_it_matters") or r.get("summary") or "",
+            "sentiment": r.get("sentiment", "") or "",
+            "relevance": r.get("relevance"),
+            "created_at": created_at,
+            "url": orig.get("url", ""),
+        })
+    return parsed_upserts, skipped
+
+
+_CANDIDATES_SQL = """
+    SELECT url, url_hash, title, published_at,
+           COALESCE(NULLIF(translated_text, ''), content, '') AS text
+    FROM articles
+    WHERE ticker = ?
+      AND created_at >= ?
+      AND url_hash IS NOT NULL AND url_hash <> ''
+      AND LENGTH(COALESCE(NULLIF(translated_text, ''), content, '')) >= ?
+    ORDER BY created_at DESC
+"""
+
+
+async def _load_missing_items(
+    ticker: str,
+    *,
+    max_age_hours: int,
+    max_items: int,
+    min_chars: int,
+    db_path: str,
+) -> List[Dict[str, Any]]:
+    """
+    Recent cached articles for `ticker` with enough text and no summary yet, newest
+    first, capped at `max_items`. The summaries lookup goes through
+    cache_get_missing_items_for_summary(conn, url_hashes) on the same connection.
     """
-    Read missing items for `ticker` from cache, call the LLM in batches,
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=max_age_hours)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    async with aiosqlite.connect(db_path) as db:
+        rows = await db.execute_fetchall(_CANDIDATES_SQL, (ticker.upper(), cutoff, min_chars))
+        candidates = {}
+        for url, h, title, published_at, text in rows:
+            candidates.setdefault(h, {
+                "url": url or "",
+                "url_hash": h,
+                "title": title or "",
+                "published_at": published_at or "",
+                "translated_text": text,
+            })
+        missing = await cache_get_missing_items_for_summary(db, list(candidates))
+    return [candidates[h] for h in missing[:max_items]]
+
+
+async def summarize_cached_and_upsert(app, ticker: str, db_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Read missing items for `ticker` from cache, call the LLM (one call unless oversized),
     and upsert returned summaries into the summaries table.
 
     Returns: {"ticker": ticker, "summarized": N, "skipped": M}
     """
-    max_items = SUMMARIZE_MAX_PER_TICKER
-    min_chars = SUMMARIZE_MIN_CHARS
-    model = OPENAI_MODEL
-
-    items = await cache_get_missing_items_for_summary(ticker, max_age_hours=24, max_items=max_items, min_chars=min_chars)
+    db_path = db_path or CACHE_DB_PATH
+    try:
+        items = await _load_missing_items(
+            ticker,
+            max_age_hours=24,
+            max_items=SUMMARIZE_MAX_PER_TICKER,
+            min_chars=SUMMARIZE_MIN_CHARS,
+            db_path=db_path,
+        )
+    except Exception:
+        log.exception("summarize_job: failed to load cached items for %s", ticker)
+        items = []
     if not items:
         return {"ticker": ticker, "summarized": 0, "skipped": 0}
 
-    # Prepare batches of up to 5
-    batch_size = 5
-    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    batches = _plan_batches(items)
 
     total_summarized = 0
     total_skipped = 0
-    parsed_upserts: List[Dict[str, Any]] = []
 
-    for idx, batch in enumerate(batches):
-        # Build payload for LLM: preserve title + url + text
+    # Build payload for LLM per batch: preserve title + url + text
+    prepared = []
+    for batch in batches:
         payload = []
         url_map = {}
         title_pub_map = {}
@@ -47,55 +175,39 @@ async def summarize_cached_and_upsert(app, ticker: str) -> Dict[str, Any]:
             url_map[url] = it  # original item
             key = (title.strip(), it.get("published_at") or "")
             title_pub_map[key] = it
+        prepared.append((payload, url_map, title_pub_map))
 
-        # Call summarizer
-        try:
-            resp = await summarize_items(payload, ticker=ticker, model=model)
-            results = resp.get("items", []) if isinstance(resp, dict) else []
-        except Exception as e:
-            print(f"[summarize_job] summarize_items failed for {ticker} batch {idx}: {e}")
-            results = []
-
-        # Map LLM outputs back to url_hash and prepare upsert payloads
-        for r in results:
-            # try match by url first
-            url = r.get("url", "") or ""
-            orig = url_map.get(url)
-            if not orig:
-                # fallback to title+published_at
-                key = (r.get("title", "") or "").strip(), r.get("published_at", "") or ""
-                orig = title_pub_map.get(key)
-            if not orig:
-                # unable to map; skip
-                print(f"[summarize_job] unable to map LLM result to original item for ticker={ticker}, title={r.get('title')}")
-                total_skipped += 1
-                continue
-
-            url_hash = orig.get("url_hash") or orig.get("url_hash") or ""
-            if not url_hash:
-                print(f"[summarize_job] missing url_hash for item {orig.get('url')}, skipping upsert")
-                total_skipped += 1
-                continue
-
-            parsed_upserts.append({
-                "url_hash": url_hash,
-                "title": r.get("title") or orig.get("title", ""),
-                "bullets": r.get("bullets", []) or [],
-                "why_it_matters": r.get("why_it_matters", "") or "",
-                "sentiment": r.get("sentiment", "") or "",
-            })
-            total_summarized += 1
+    sem = _llm_semaphore()
 
-        # small jitter between batches
-        await asyncio.sleep(0.15 * idx)
+    async def _run_batch(idx: int, payload: List[Dict[str, Any]]) -> tuple:
+        async with sem:
+            try:
+                resp = await summarize_items(payload, ticker=ticker)
+                return idx, resp.get("items", []) if isinstance(resp, dict) else []
+            except Exception:
+                log.exception("summarize_job: summarize_items failed for %s batch %d", ticker, idx)
+                return idx, []
 
-    # Upsert all parsed summaries
-    if parsed_upserts:
+    async def _upsert(rows: List[Dict[str, Any]]) -> None:
         try:
-            inserted = await cache_upsert_summaries(ticker, parsed_upserts)
-            print(f"[summarize_job] {ticker}: upserted {inserted} summaries")
-        except Exception as e:
-            print(f"[summarize_job] cache_upsert_summaries failed for {ticker}: {e}")
+            inserted = await cache_upsert_summaries(rows, db_path=db_path)
+            log.info("summarize_job: %s upserted %d summaries", ticker, inserted)
+        except Exception:
+            log.exception("summarize_job: cache_upsert_summaries failed for %s", ticker)
+
+    # Call summarizer for every batch at once and upsert each batch as soon as it lands,
+    # so DB writes overlap the LLM calls still in flight
+    tasks = [asyncio.create_task(_run_batch(idx, payload)) for idx, (payload, _, _) in enumerate(prepared)]
+    upserts = []
+    for fut in asyncio.as_completed(tasks):
+        idx, results = await fut
+        _, url_map, title_pub_map = prepared[idx]
+        rows, skipped = _map_results(ticker, results, url_map, title_pub_map)
+        total_summarized += len(rows)
+        total_skipped += skipped
+        if rows:
+            upserts.append(asyncio.create_task(_upsert(rows)))
+    await asyncio.gather(*upserts)
 
     return {"ticker": ticker, "summarized": total_summarized, "skipped": total_skipped}
 
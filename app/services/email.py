@@ -4,11 +4,13 @@ import json
 import os
 from email.message import EmailMessage
 from email.utils import formataddr
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
 import logging
-import httpx
 from typing import Dict, Any, Optional
 import re
 import asyncio
+import heapq
 import smtplib
 from datetime import datetime
 from zoneinfo import ZoneInfo
@@ -17,6 +19,7 @@ from app.core import settings
 import time
 from app.core.metrics import record_metric
 from app.core.retry_utils import rate_limited_retry
+from app.core.http import dumps_json, get_client
 
 
 
@@ -29,17 +32,30 @@ except Exception:
     aiosmtplib = None
     log.warning("aiosmtplib not installed; SMTP async helper unavailable, falling back to sync send")
 
-# Local tolerant formatter (kept here to avoid circular imports with app.api.admin.email)
-def _format_body(results: Dict[str, Any]) -> str:
-    def _to_int(x):
-        try:
-            return int(str(x).strip())
-        except Exception:
-            return 0
+def _to_int(x) -> int:
+    try:
+        return int(str(x).strip())
+    except Exception:
+        return 0
+
+
+_DEFAULT_FROM = "noreply@onthesubjectofmoney.com"
 
-    def _as_items(seq):
-        return [x for x in (seq or []) if isinstance(x, dict)]
 
+# Provider credentials, read once at import (restart the process to pick up changes)
+_SENDGRID_KEY = os.getenv("SENDGRID_API_KEY", "")
+_EMAIL_FROM = os.getenv("EMAIL_FROM", _DEFAULT_FROM)
+_SMTP_HOST = os.getenv("SMTP_HOST", "")
+try:
+    _SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+except ValueError:
+    _SMTP_PORT = 587
+_SMTP_USER = os.getenv("SMTP_USER", "")
+_SMTP_PASS = os.getenv("SMTP_PASS", "")
+
+
+# Local tolerant formatter (kept here to avoid circular imports with app.api.admin.email)
+def _format_body(results: Dict[str, Any]) -> str:
     lines: list[str] = []
     tickers = results.get("tickers") or {}
     for ticker, payload in tickers.items():
@@ -49,10 +65,13 @@ def _format_body(results: Dict[str, Any]) -> str:
             or payload.get("items")
             or []
         )
-        items = _as_items(raw_items)
-        items = [it for it in items if _to_int(it.get("relevance")) >= 2]
-        items.sort(key=lambda it: _to_int(it.get("relevance")), reverse=True)
-        top_items = items[:3]
+        # parse relevance once per item; nlargest keeps the stable-sort tie order
+        scored = [
+            (rel, it)
+            for it in raw_items or []
+            if isinstance(it, dict) and (rel := _to_int(it.get("relevance"))) >= 2
+        ]
+        top_items = [it for _, it in heapq.nlargest(3, scored, key=lambda p: p[0])]
         lines.append(f"{ticker}:")
         if not top_items:
             lines.append("(no sufficiently relevant summaries)")
@@ -90,10 +109,8 @@ async def send_via_sendgrid(
         Dict with keys: ok (bool), provider_message_id (str|None), error (str|None), 
         status_code (int|None), response_body (str|None)
     """
-    import os
-    
-    sendgrid_key = os.getenv("SENDGRID_API_KEY", "")
-    from_email = os.getenv("EMAIL_FROM", "noreply@onthesubjectofmoney.com")
+    sendgrid_key = _SENDGRID_KEY
+    from_email = _EMAIL_FROM
     
     if not sendgrid_key:
         error_msg = "SENDGRID_API_KEY not configured"
@@ -133,16 +150,17 @@ async def send_via_sendgrid(
     
     log.info("send_via_sendgrid: sending to %s via SendGrid", to_email)
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://api.sendgrid.com/v3/mail/send",
-            headers={
-                "Authorization": f"Bearer {sendgrid_key}",
-                "Content-Type": "application/json"
-            },
-            json=payload,
-            timeout=20
-        )
+    # shared keep-alive client: back-to-back sends reuse the TLS connection
+    client = await get_client()
+    response = await client.post(
+        "https://api.sendgrid.com/v3/mail/send",
+        headers={
+            "Authorization": f"Bearer {sendgrid_key}",
+            "Content-Type": "application/json"
+        },
+        content=dumps_json(payload),
+        timeout=20
+    )
     
     status_code = response.status_code
     response_body = response.text
@@ -186,6 +204,17 @@ async def send_via_sendgrid(
     }
 
 
+_AIOSMTP_ERRORS = (aiosmtplib.SMTPException,) if aiosmtplib is not None else ()
+
+
+def _smtp_send_sync(msg, host: str, port: int, user: str, password: str) -> None:
+    """Blocking smtplib send (fallback when aiosmtplib is absent); run via asyncio.to_thread."""
+    with smtplib.SMTP(host, port, timeout=20) as server:
+        server.starttls()
+        server.login(user, password)
+        server.send_message(msg)
+
+
 async def send_via_smtp(
     to_email: str,
     payload_results: Dict[str, Any],
@@ -198,16 +227,11 @@ async def send_via_smtp(
     Returns:
         Dict with keys: ok (bool), error (str|None)
     """
-    import os
-    import smtplib
-    from email.mime.text import MIMEText
-    from email.mime.multipart import MIMEMultipart
-    
-    smtp_host = os.getenv("SMTP_HOST", "")
-    smtp_port = int(os.getenv("SMTP_PORT", "587"))
-    smtp_user = os.getenv("SMTP_USER", "")
-    smtp_pass = os.getenv("SMTP_PASS", "")
-    from_email = os.getenv("EMAIL_FROM", "noreply@onthesubjectofmoney.com")
+    smtp_host = _SMTP_HOST
+    smtp_port = _SMTP_PORT
+    smtp_user = _SMTP_USER
+    smtp_pass = _SMTP_PASS
+    from_email = _EMAIL_FROM
     
     if not all([smtp_host, smtp_user, smtp_pass]):
         error_msg = "SMTP credentials not fully configured"
@@ -234,15 +258,24 @@ async def send_via_smtp(
         # Send via SMTP
         log.info("send_via_smtp: sending to %s via SMTP (%s:%d)", to_email, smtp_host, smtp_port)
         
-        with smtplib.SMTP(smtp_host, smtp_port, timeout=20) as server:
-            server.starttls()
-            server.login(smtp_user, smtp_pass)
-            server.send_message(msg)
+        # never block the event loop on the SMTP round trips
+        if aiosmtplib is not None:
+            await aiosmtplib.send(
+                msg,
+                hostname=smtp_host,
+                port=smtp_port,
+                username=smtp_user,
+                password=smtp_pass,
+                start_tls=True,
+                timeout=20,
+            )
+        else:
+            await asyncio.to_thread(_smtp_send_sync, msg, smtp_host, smtp_port, smtp_user, smtp_pass)
         
         log.info("send_via_smtp: successfully sent to %s", to_email)
         return {"ok": True, "error": None}
         
-    except smtplib.SMTPException as exc:
+    except (smtplib.SMTPException, *_AIOSMTP_ERRORS) as exc:
         error_msg = f"SMTPException: {exc}"
         log.exception("send_via_smtp: SMTP error sending to %s", to_email)
         return {"ok": False, "error": error_msg}
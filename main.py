@@ -11,6 +11,16 @@ logging.basicConfig(level=logging.INFO, stream=sys.stdout, force=True)
 logging.getLogger().handlers[0].flush = sys.stdout.flush
 log = logging.getLogger("ari")
 
+# libuv-backed event loop for the API, pipeline and scheduler (all share the loop
+# uvicorn creates). Optional: falls back to the stdlib loop when uvloop is absent.
+try:
+    import asyncio
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except Exception:  # pragma: no cover - depends on environment
+    pass
+
 from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
 
@@ -96,6 +106,13 @@ from contextlib import suppress
 from app.db.migrations.add_run_errors import migrate_add_run_errors
 from app.db.migrations.add_news_age_column import migrate_add_news_age_column
 from app.db.migrations.link_summaries_to_articles import migrate_link_summaries_to_articles
+from app.db.migrations.add_kpi_indexes import migrate_add_kpi_indexes
+from app.db.migrations.normalize_email_items_timestamps import migrate_normalize_email_items_timestamps
+from app.core import settings as news_settings
+from app.ingest.scheduler import start_tier_refresh, stop_tier_refresh
+from app.core.http import aclose_client
+from app.core.metrics import start_metrics_flusher, stop_metrics_flusher
+from app.db.sqlite import close_shared_dbs
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -113,8 +130,19 @@ async def lifespan(app: FastAPI):
             log.error(f"Migration failed: {e}")
     else:
         log.info("DATABASE_URL is set; skipping SQLite migrations (Neon/Postgres mode).")
+        await migrate_add_kpi_indexes(engine)
+        await migrate_normalize_email_items_timestamps(engine)
+
+    start_metrics_flusher()
+
+    if news_settings.NEWS_TIER_REFRESH:
+        start_tier_refresh()
 
     yield
+    await stop_tier_refresh()
+    await stop_metrics_flusher()
+    await aclose_client()
+    await close_shared_dbs()
     log.info("Application shutdown")
 
 # =====================================================================
@@ -0,0 +1,54 @@
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import pytest
+
+from app.core.cache import url_hash
+from app.ingest.news import _dequery_url, _make_row
+
+
+def _legacy_dequery(u):
+    """The pre-fast-path implementation: cached url_hash values were computed from this."""
+    try:
+        p = urlparse((u or "").strip())
+        if not p.scheme:
+            return u
+        q = parse_qsl(p.query, keep_blank_values=True)
+        filtered = [(k, v) for k, v in q if not k.lower().startswith("utm_") and k.lower() not in ("fbclid", "gclid", "icn")]
+        new_q = urlencode(filtered, doseq=True)
+        return urlunparse((p.scheme, p.netloc, p.path or "", p.params or "", new_q, p.fragment or ""))
+    except Exception:
+        return u
+
+
+URLS = [
+    "https://livemint.com/markets/tcs-q2-results-11697",
+    "https://livemint.com/markets/tcs-q2?utm_source=rss&utm_medium=feed",
+    "https://livemint.com/markets/tcs-q2?id=42&utm_source=rss&page=2",
+    "https://livemint.com/markets/tcs-q2?UTM_Campaign=x&FBCLID=abc&ref=home",
+    "https://livemint.com/a?q=tcs%20results&gclid=1",
+    "https://livemint.com/a?q=a+b&icn=top&flag",
+    "https://livemint.com/a?amp;id=1&utm_source=x",
+    "https://livemint.com/a?",
+    "https://livemint.com/a#section",
+    "https://livemint.com/a;jsessionid=1",
+    "HTTPS://LiveMint.com/a",
+    "livemint.com/a?utm_source=x",
+    "ftp://host/file",
+]
+
+
+@pytest.mark.parametrize("url", URLS)
+def test_dequery_matches_cached_hash_input(url):
+    assert _dequery_url(url) == _legacy_dequery(url)
+    row = _make_row("TCS", {"url": url, "title": "t"})
+    assert row["url_hash"] == url_hash(_legacy_dequery(url))
+
+
+def test_dequery_keeps_real_params_and_drops_tracking():
+    assert _dequery_url("https://ex.com/a?id=42&utm_source=rss&page=2&fbclid=z") == "https://ex.com/a?id=42&page=2"
+    assert _dequery_url("https://ex.com/a?utm_source=rss&gclid=1") == "https://ex.com/a"
+
+
+def test_dequery_none_url_returns_empty():
+    assert _dequery_url(None) == ""
+    assert _make_row("TCS", {"url": None, "title": "t"}) is None
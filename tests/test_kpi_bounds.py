@@ -0,0 +1,37 @@
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "postgresql://u:p@localhost/db")
+
+from app.metrics.kpi_aggregates import _utc_bound
+
+
+def test_utc_bound_converts_offsets_and_ceils_end():
+    ist = timezone(timedelta(hours=5, minutes=30))
+    assert _utc_bound(datetime(2025, 11, 1, 5, 30, tzinfo=ist)) == "2025-11-01T00:00:00"
+    assert _utc_bound(datetime(2025, 11, 1, 0, 0, 0, 500)) == "2025-11-01T00:00:00"
+    assert _utc_bound(datetime(2025, 11, 1, 0, 0, 0, 500), ceil=True) == "2025-11-01T00:00:01"
+
+
+def test_boundary_second_rows_match_for_every_stored_suffix():
+    lo = _utc_bound(datetime(2025, 11, 1, tzinfo=timezone.utc))
+    hi = _utc_bound(datetime(2025, 11, 2, tzinfo=timezone.utc), ceil=True)
+    # 'Z' (cache/email), '+00:00' (vendor_metrics) and fractional 'Z' (incidents)
+    rows = {
+        "2025-10-31T23:59:59Z": False,
+        "2025-10-31T23:59:59+00:00": False,
+        "2025-11-01T00:00:00Z": True,
+        "2025-11-01T00:00:00+00:00": True,
+        "2025-11-01T00:00:00.250000Z": True,
+        "2025-11-01T23:59:59+00:00": True,
+        "2025-11-02T00:00:00Z": False,
+        "2025-11-02T00:00:00+00:00": False,
+        "2025-11-02T00:00:00.250000Z": False,
+    }
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (created_at TEXT)")
+    conn.executemany("INSERT INTO t VALUES (?)", [(ts,) for ts in rows])
+    got = {r[0] for r in conn.execute("SELECT created_at FROM t WHERE created_at >= ? AND created_at < ?", (lo, hi))}
+    conn.close()
+    assert got == {ts for ts, inside in rows.items() if inside}
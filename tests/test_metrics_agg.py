@@ -0,0 +1,51 @@
+import sqlite3
+
+import pytest
+
+from app.core import metrics as core_metrics
+from app.db.sqlite import close_shared_dbs
+from app.metrics import aggregates
+
+
+@pytest.fixture
+def metrics_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(core_metrics, "_AGG_READY", set())
+    monkeypatch.setattr(aggregates, "_AGG_SEEN", set())
+    monkeypatch.setattr(aggregates, "_SUMMARY_CACHE", {})
+    path = str(tmp_path / "metrics.db")
+    conn = sqlite3.connect(path)
+    conn.execute(core_metrics._METRICS_DDL)
+    conn.executemany(
+        "INSERT INTO metrics(timestamp, event, provider, latency_ms, ok) VALUES (?, ?, ?, ?, ?)",
+        [
+            ("2025-11-01T00:00:00+00:00", "fetch", "scrapingdog", 100, 1),
+            ("2025-11-01T00:00:01+00:00", "fetch", "scrapingdog", 300, 0),
+            ("2025-11-01T00:00:02+00:00", "summarize", None, 50, 1),
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _by_key(rows):
+    return {(r["provider"], r["event"]): (r["total_calls"], r["successes"], r["avg_latency_ms"]) for r in rows}
+
+
+@pytest.mark.asyncio
+async def test_rollup_created_by_writer_keeps_history_and_null_provider(metrics_db):
+    try:
+        # before any write the reader scans metrics and creates nothing
+        before = _by_key(await aggregates.vendor_performance_summary(metrics_db))
+        assert before == {("scrapingdog", "fetch"): (2, 1, 200.0), (None, "summarize"): (1, 1, 50.0)}
+        conn = sqlite3.connect(metrics_db)
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name='metrics_agg'").fetchone() is None
+        conn.close()
+
+        core_metrics._write_sqlite(metrics_db, [("2025-11-01T00:00:03+00:00", "summarize", None, 150, 0)])
+
+        after = _by_key(await aggregates.vendor_performance_summary(metrics_db))
+        assert after == {("scrapingdog", "fetch"): (2, 1, 200.0), (None, "summarize"): (2, 1, 100.0)}
+        assert metrics_db in aggregates._AGG_SEEN
+    finally:
+        await close_shared_dbs()
@@ -0,0 +1,31 @@
+import asyncio
+import logging
+from collections import deque
+
+import pytest
+
+from app.core import metrics
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_counts_and_logs_dropped_rows(monkeypatch, caplog):
+    written = []
+    monkeypatch.setattr(metrics, "_BUFFER", deque(maxlen=3))
+    monkeypatch.setattr(metrics, "_DROPPED", 0)
+    monkeypatch.setattr(metrics, "_persist", lambda rows: written.extend(rows))
+    # a live (never finishing) flusher task switches record_metric to buffering
+    flusher = asyncio.create_task(asyncio.Event().wait())
+    monkeypatch.setattr(metrics, "_FLUSHER", flusher)
+    try:
+        for i in range(5):
+            metrics.record_metric("fetch", f"p{i}", i, True)
+        assert metrics._DROPPED == 2
+
+        with caplog.at_level(logging.WARNING, logger="ari.metrics"):
+            assert await metrics.flush_metrics() == 3
+    finally:
+        flusher.cancel()
+
+    assert [r[2] for r in written] == ["p2", "p3", "p4"]
+    assert metrics._DROPPED == 0
+    assert "dropped 2 oldest rows" in caplog.text
@@ -0,0 +1,59 @@
+import pytest
+
+from app.ingest import news
+
+
+def _items(prefix, n):
+    return [{"title": f"TCS {prefix} {i}", "url": f"https://livemint.com/{prefix}-{i}"} for i in range(n)]
+
+
+@pytest.fixture
+def vendors(monkeypatch):
+    calls = {"scrapingdog": 0, "newsapi": 0}
+    state = {"sd": []}
+
+    async def fake_sd(*a, **k):
+        calls["scrapingdog"] += 1
+        return state["sd"]
+
+    async def fake_na(*a, **k):
+        calls["newsapi"] += 1
+        return _items("na", 3)
+
+    monkeypatch.setattr(news, "search_google_news_scrapingdog", fake_sd)
+    monkeypatch.setattr(news, "fetch_newsapi_everything", fake_na)
+    monkeypatch.setattr(news, "record_metric", lambda *a, **k: None)
+    monkeypatch.setattr(news, "_NEWS_SOURCES", frozenset({"google_rss", "newsapi"}))
+    monkeypatch.setattr(news, "_NEWSAPI_SPECULATIVE", False)
+    monkeypatch.setenv("NEWS_API_KEY", "test-key")
+    return calls, state
+
+
+@pytest.mark.asyncio
+async def test_newsapi_not_called_when_scrapingdog_fills(vendors):
+    calls, state = vendors
+    state["sd"] = _items("sd", 3)
+    rows = await news.fetch_news_for_ticker("TCS", max_items=3)
+    assert len(rows) == 3
+    assert calls == {"scrapingdog": 1, "newsapi": 0}
+
+
+@pytest.mark.asyncio
+async def test_newsapi_tops_up_when_scrapingdog_falls_short(vendors):
+    calls, state = vendors
+    state["sd"] = _items("sd", 1)
+    rows = await news.fetch_news_for_ticker("TCS", max_items=3)
+    assert [r["url"] for r in rows] == [
+        "https://livemint.com/sd-0", "https://livemint.com/na-0", "https://livemint.com/na-1",
+    ]
+    assert calls == {"scrapingdog": 1, "newsapi": 1}
+
+
+@pytest.mark.asyncio
+async def test_speculative_newsapi_runs_alongside_scrapingdog(vendors, monkeypatch):
+    calls, state = vendors
+    monkeypatch.setattr(news, "_NEWSAPI_SPECULATIVE", True)
+    state["sd"] = _items("sd", 3)
+    rows = await news.fetch_news_for_ticker("TCS", max_items=3)
+    assert [r["url"] for r in rows] == [f"https://livemint.com/sd-{i}" for i in range(3)]
+    assert calls == {"scrapingdog": 1, "newsapi": 1}
@@ -0,0 +1,56 @@
+import sqlite3
+
+import aiosqlite
+import pytest
+
+from app.metrics import series
+
+
+def _email_logs_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE email_logs (id INTEGER PRIMARY KEY, to_email TEXT, subject TEXT, sent_at TEXT,"
+        " items_count INTEGER, provider TEXT, ok INTEGER DEFAULT 1, error TEXT)"
+    )
+    conn.executemany("INSERT INTO email_logs (sent_at, ok) VALUES (?, ?)", rows)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_send_success_counts_null_ok_as_failure(tmp_path):
+    db = _email_logs_db(
+        str(tmp_path / "series.db"),
+        [
+            ("2025-11-01T08:00:00Z", None),  # bucket with only NULL ok
+            ("2025-11-02T08:00:00Z", 1),
+            ("2025-11-02T09:00:00Z", None),
+            ("2025-11-02T10:00:00Z", 0),
+        ],
+    )
+
+    out = series.send_success_ts_sync(db, "2025-11-01", "2025-11-02", "day")
+
+    assert out == [
+        {"bucket": "2025-11-01", "total": 1, "success": 0, "success_rate": 0.0},
+        {"bucket": "2025-11-02", "total": 3, "success": 1, "success_rate": 33.33},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cost_per_item_keeps_delivered_items_when_cost_read_fails(tmp_path):
+    # no vendor_metrics table: the cost half fails, the delivered-items half must survive
+    db_path = str(tmp_path / "series.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE email_logs (sent_at TEXT, items_count INTEGER, ok INTEGER DEFAULT 1)")
+    conn.executemany(
+        "INSERT INTO email_logs VALUES (?, ?, ?)",
+        [("2025-11-01T08:00:00Z", 3, 1), ("2025-11-01T09:00:00Z", 2, 1), ("2025-11-02T08:00:00Z", 4, 0)],
+    )
+    conn.commit()
+    conn.close()
+
+    async with aiosqlite.connect(db_path) as db:
+        out = await series.cost_per_item_ts(db, "2025-11-01", "2025-11-02", "day")
+
+    assert out == [{"bucket": "2025-11-01", "total_cost": 0.0, "delivered_items": 5, "cost_per_item": 0.0}]
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from app.db import sqlite as shared
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "shared.db")
+    yield path
+    asyncio.run(shared.close_shared_dbs())
+
+
+async def _setup(path):
+    async with shared.shared_write(path) as db:
+        await db.execute("CREATE TABLE IF NOT EXISTS t (k TEXT PRIMARY KEY)")
+    return await shared.get_shared_db(path)
+
+
+def test_shared_db_reopened_per_event_loop(db_path):
+    first = asyncio.run(_setup(db_path))
+    second = asyncio.run(_setup(db_path))
+    assert first is not second
+
+    async def count():
+        db = await shared.get_shared_db(db_path)
+        assert db is await shared.get_shared_db(db_path)
+        return (await db.execute_fetchall("SELECT COUNT(*) FROM t"))[0][0]
+
+    assert asyncio.run(count()) == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_write_keeps_concurrent_transactions_apart(db_path):
+    await _setup(db_path)
+    failing_started = asyncio.Event()
+
+    async def good():
+        await failing_started.wait()
+        async with shared.shared_write(db_path) as db:
+            await db.execute("INSERT INTO t VALUES ('good')")
+
+    async def bad():
+        async with shared.shared_write(db_path) as db:
+            await db.execute("INSERT INTO t VALUES ('bad')")
+            failing_started.set()
+            await asyncio.sleep(0.01)  # the other writer is waiting, not committing this row
+            raise RuntimeError("boom")
+
+    results = await asyncio.gather(good(), bad(), return_exceptions=True)
+    assert isinstance(results[1], RuntimeError)
+
+    db = await shared.get_shared_db(db_path)
+    assert [r[0] for r in await db.execute_fetchall("SELECT k FROM t")] == ["good"]
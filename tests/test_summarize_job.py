@@ -0,0 +1,146 @@
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core import cache as core_cache
+from app.scheduler import summarize_job
+
+
+def _iso(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _make_db(path, rows, summarized=()):
+    """
+    rows: (url, ticker, text, created_at); summarized: urls that already have a summary.
+    The summaries table must already exist (core_cache.ensure_summaries_schema).
+    """
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE articles (
+            url TEXT, url_hash TEXT UNIQUE, ticker TEXT, title TEXT, published_at TEXT,
+            translated_text TEXT, content TEXT, created_at TEXT
+        )
+        """
+    )
+    for url, ticker, text, created_at in rows:
+        conn.execute(
+            "INSERT INTO articles VALUES (?, ?, ?, ?, ?, ?, NULL, ?)",
+            (url, core_cache.sha256_16(url), ticker, url.rsplit("/", 1)[1], created_at, text, created_at),
+        )
+    for url in summarized:
+        conn.execute(
+            "INSERT INTO summaries (item_url_hash, ticker, title, created_at) VALUES (?, 'TCS', 'done', ?)",
+            (core_cache.sha256_16(url), _iso(datetime.now(timezone.utc))),
+        )
+    conn.commit()
+    conn.close()
+    return path
+
+
+LONG_TEXT = "Quarterly revenue rose on new contract wins. " * 20
+
+
+def _fake_llm(sent):
+    async def fake_summarize_items(payload, *, ticker=None):
+        sent.append([p["url"] for p in payload])
+        return {
+            "ok": True,
+            "items": [
+                {"url": p["url"], "title": p["title"], "summary": "Revenue up.", "sentiment": "Positive", "relevance": 8}
+                for p in payload
+            ],
+        }
+    return fake_summarize_items
+
+
+@pytest.fixture
+def articles_db(tmp_path):
+    now = datetime.now(timezone.utc)
+    rows = [
+        ("https://ex.com/fresh", "TCS", LONG_TEXT, _iso(now - timedelta(hours=1))),
+        ("https://ex.com/short", "TCS", "too short", _iso(now - timedelta(hours=1))),
+        ("https://ex.com/stale", "TCS", LONG_TEXT, _iso(now - timedelta(hours=48))),
+        ("https://ex.com/done", "TCS", LONG_TEXT, _iso(now - timedelta(hours=2))),
+        ("https://ex.com/other", "INFY", LONG_TEXT, _iso(now - timedelta(hours=1))),
+    ]
+    path = str(tmp_path / "summarize_job.db")
+    asyncio.run(core_cache.ensure_summaries_schema(path))
+    return _make_db(path, rows, summarized=["https://ex.com/done"])
+
+
+@pytest.mark.asyncio
+async def test_summarize_cached_and_upsert_end_to_end(articles_db, monkeypatch):
+    sent = []
+    monkeypatch.setattr(summarize_job, "summarize_items", _fake_llm(sent))
+
+    res = await summarize_job.summarize_cached_and_upsert(None, "tcs", db_path=articles_db)
+
+    # only the fresh, long, not-yet-summarized article goes out, in a single LLM call
+    assert sent == [["https://ex.com/fresh"]]
+    assert res == {"ticker": "tcs", "summarized": 1, "skipped": 0}
+
+    conn = sqlite3.connect(articles_db)
+    row = conn.execute(
+        "SELECT ticker, why_it_matters, sentiment, relevance, url FROM summaries WHERE item_url_hash = ?",
+        (core_cache.sha256_16("https://ex.com/fresh"),),
+    ).fetchone()
+    conn.close()
+    assert row == ("TCS", "Revenue up.", "Positive", 8, "https://ex.com/fresh")
+
+
+@pytest.mark.asyncio
+async def test_summarize_cached_and_upsert_nothing_missing(articles_db, monkeypatch):
+    async def fail(*a, **k):
+        raise AssertionError("LLM must not be called")
+
+    monkeypatch.setattr(summarize_job, "summarize_items", fail)
+    res = await summarize_job.summarize_cached_and_upsert(None, "WIPRO", db_path=articles_db)
+    assert res == {"ticker": "WIPRO", "summarized": 0, "skipped": 0}
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_share_global_semaphore(tmp_path, monkeypatch):
+    now = _iso(datetime.now(timezone.utc) - timedelta(minutes=5))
+    tickers = [f"T{i}" for i in range(4)]
+    rows = [(f"https://ex.com/{t}-{n}", t, LONG_TEXT, now) for t in tickers for n in range(2)]
+    db = str(tmp_path / "sem.db")
+    await core_cache.ensure_summaries_schema(db)
+    _make_db(db, rows)
+
+    # force two batches per ticker and a global cap of 2 LLM calls in flight
+    monkeypatch.setattr(summarize_job, "SUMMARIZE_SINGLE_CALL_MAX_CHARS", 100)
+    monkeypatch.setattr(summarize_job, "LLM_GLOBAL_CONCURRENCY", 2)
+    monkeypatch.setattr(summarize_job, "_LLM_SEM", None)
+
+    in_flight = peak = 0
+    release = asyncio.Event()
+    sent = []
+    base = _fake_llm(sent)
+
+    async def slow_llm(payload, *, ticker=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        if peak >= 2:
+            release.set()
+        await release.wait()
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return await base(payload, ticker=ticker)
+
+    monkeypatch.setattr(summarize_job, "summarize_items", slow_llm)
+
+    results = await asyncio.gather(
+        *[summarize_job.summarize_cached_and_upsert(None, t, db_path=db) for t in tickers]
+    )
+
+    assert peak == 2
+    assert len(sent) == 8 and all(len(batch) == 1 for batch in sent)
+    assert [r["summarized"] for r in results] == [2, 2, 2, 2]
+    conn = sqlite3.connect(db)
+    assert conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0] == 8
+    conn.close()
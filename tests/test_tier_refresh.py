@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core import settings
+from app.ingest import fusion
+from app.ingest import scheduler as tier
+
+
+@pytest.fixture(autouse=True)
+def clean_tier_state(monkeypatch):
+    monkeypatch.setattr(tier, "per_adapter_cache", {})
+    monkeypatch.setattr(tier, "_tasks", {})
+    monkeypatch.setattr(
+        settings, "NEWS_TIER_INTERVALS", {"google_rss": 60, "newsapi": 300, "scrapingdog": 900}
+    )
+
+
+def _item(url="https://livemint.com/markets/tcs-q2-results", title="TCS Q2 results"):
+    return {"title": title, "url": url, "source": "livemint", "published_at": "2025-10-18T00:00:00Z", "lang": "en"}
+
+
+def test_get_cached_items_fresh_case_insensitive_copy():
+    tier.per_adapter_cache["google_rss"] = {"TCS": (time.monotonic(), [_item()])}
+
+    got = tier.get_cached_items("google_rss", "tcs")
+    assert got == [_item()]
+    # callers may tag items in place; the cached entry must not change
+    got[0]["source"] = "changed"
+    assert tier.get_cached_items("google_rss", " TCS ")[0]["source"] == "livemint"
+
+
+def test_get_cached_items_stale_after_two_intervals():
+    now = time.monotonic()
+    tier.per_adapter_cache["google_rss"] = {
+        "FRESH": (now - 119, [_item()]),  # interval 60s: still inside 2x
+        "STALE": (now - 121, [_item()]),
+    }
+    assert tier.get_cached_items("google_rss", "FRESH") is not None
+    assert tier.get_cached_items("google_rss", "STALE") is None
+    assert tier.get_cached_items("google_rss", "MISSING") is None
+    assert tier.get_cached_items("unknown", "FRESH") is None
+
+
+@pytest.mark.asyncio
+async def test_start_stop_idempotent(monkeypatch):
+    started = []
+
+    async def fake_loop(adapter, interval, tickers):
+        started.append((adapter, interval, tickers))
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(tier, "_refresh_loop", fake_loop)
+    monkeypatch.setattr(settings, "NEWS_SOURCES", ["google_rss", "scrapingdog", "nope"])
+
+    assert tier.start_tier_refresh(["tcs"]) == ["google_rss", "scrapingdog"]
+    tasks = dict(tier._tasks)
+    assert tier.start_tier_refresh(["tcs"]) == ["google_rss", "scrapingdog"]
+    assert tier._tasks == tasks
+    await asyncio.sleep(0)
+    assert started == [("google_rss", 60, ["TCS"]), ("scrapingdog", 900, ["TCS"])]
+
+    await tier.stop_tier_refresh()
+    assert tier._tasks == {}
+    assert all(t.cancelled() for t in tasks.values())
+    await tier.stop_tier_refresh()  # second stop is a no-op
+
+
+@pytest.mark.asyncio
+async def test_scrapingdog_tier_fills_cache(monkeypatch):
+    calls = []
+
+    async def fake_call_adapter(mod, ticker, days, topk, timeout_s):
+        calls.append((mod, ticker))
+        return [_item()]
+
+    monkeypatch.setattr(fusion, "_call_adapter", fake_call_adapter)
+
+    task = asyncio.create_task(tier._refresh_loop("scrapingdog", 900, ["TCS"]))
+    for _ in range(10):
+        await asyncio.sleep(0)
+        if calls:
+            break
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert calls == [(fusion.source_map["scrapingdog"], "TCS")]
+    assert tier.get_cached_items("scrapingdog", "tcs") == [_item()]
+
+
+@pytest.mark.asyncio
+async def test_fused_news_serves_from_tier_cache(monkeypatch):
+    async def no_live_call(*a, **k):
+        raise AssertionError("adapter must not be called on a cache hit")
+
+    monkeypatch.setattr(fusion, "_call_adapter", no_live_call)
+    monkeypatch.setattr(settings, "NEWS_TIER_REFRESH", True)
+    monkeypatch.setattr(settings, "NEWS_SOURCES", ["google_rss"])
+    tier.per_adapter_cache["google_rss"] = {"TCS": (time.monotonic(), [_item()])}
+
+    out = await fusion.fetch_fused_news("tcs")
+    assert [it["url"] for it in out] == [_item()["url"]]